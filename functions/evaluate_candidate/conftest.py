@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The function's modules import each other as top-level modules, as they do
+# when deployed. This conftest sits next to them rather than in tests/, whose
+# package name clashes with the other functions' tests packages.
+sys.path.insert(0, os.path.dirname(__file__))
+# Every function has a top-level ``handler``; drop one imported by another
+# function's tests so this function's own is imported.
+sys.modules.pop("handler", None)
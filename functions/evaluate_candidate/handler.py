@@ -3,23 +3,389 @@ Handler for evaluate_candidate function.
 
 Evaluates candidates using LLM-based analysis with prompts
 managed through Google Sheets.
+
+The evaluation runs on an asyncio event loop: once the tabs are loaded,
+Gemini requests for all candidates are in flight together (bounded by
+``gemini_max_concurrency``), and finished evaluations are appended to
+``candidates_evaluations`` in batches while the remaining requests are
+still running. The Google clients are synchronous, so blocking calls run
+on a dedicated thread pool driven by the loop.
 """
 
+import asyncio
+import json
+import threading
+from typing import Any, Optional
+
 from flask import Request
 
+from shared.config import get_config
+from shared.llm import CandidateEvaluator, PromptBuilder, get_gemini_client
+from shared.llm.evaluator import EvaluationOutcome
+from shared.logging import ContextThreadPoolExecutor, get_logger
+from shared.metrics import collect, incr, span
+from shared.schemas import CandidateEvaluation, CandidateRaw, JobPost, Prompt
+from shared.sheets import (
+    CandidateRepository,
+    EvaluationRepository,
+    SheetsClient,
+    SheetSnapshotCache,
+    TabSnapshot,
+    get_snapshot_cache,
+)
+from shared.sheets.rows import models_to_rows
+
+logger = get_logger(__name__)
+
+# Evaluations buffered before an append is sent while requests are running.
+WRITE_BATCH_SIZE = 50
+
+# Per-process candidate indexes keyed by spreadsheet ID, each with the
+# ``candidates_raw`` snapshot it was built from.
+_candidate_indexes: dict[str, tuple[TabSnapshot, CandidateRepository]] = {}
+_candidate_indexes_lock = threading.Lock()
+
+
+class RequestError(ValueError):
+    """The request cannot be served; carries the HTTP status to return."""
+
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def parse_request(
+    payload: dict[str, Any],
+) -> tuple[str, list[str], Optional[str]]:
+    """
+    Validate the request body.
+
+    Args:
+        payload: ``{"job_post_id": str, "candidate_ids": [str, ...],
+            "prompt_version": str (optional)}``.
+
+    Returns:
+        The job post ID, the candidate IDs without duplicates, and the
+        prompt version if one was requested.
+
+    Raises:
+        RequestError: If a required field is missing or malformed.
+    """
+    job_post_id = payload.get("job_post_id")
+    candidate_ids = payload.get("candidate_ids")
+    if isinstance(candidate_ids, str):
+        candidate_ids = [candidate_ids]
+    if not job_post_id or not isinstance(job_post_id, str):
+        raise RequestError("job_post_id is required")
+    if not candidate_ids or not all(isinstance(c, str) for c in candidate_ids):
+        raise RequestError("candidate_ids must be a non-empty list of strings")
+    prompt_version = payload.get("prompt_version")
+    return job_post_id, list(dict.fromkeys(candidate_ids)), prompt_version
+
+
+def resolve_prompt(
+    job_posts: list[JobPost],
+    prompts: list[Prompt],
+    job_post_id: str,
+    version: Optional[str],
+) -> tuple[JobPost, Prompt]:
+    """
+    Find the job post and the prompt to evaluate it with.
+
+    Raises:
+        RequestError: With status 404 if either does not exist.
+    """
+    job = next((j for j in job_posts if j.job_post_id == job_post_id), None)
+    if job is None:
+        raise RequestError(f"Unknown job post {job_post_id}", 404)
+    version = version or job.default_prompt_version
+    prompt = next(
+        (
+            p
+            for p in prompts
+            if p.job_post_id == job_post_id and p.prompt_version == version
+        ),
+        None,
+    )
+    if prompt is None:
+        raise RequestError(f"No prompt {version} for job post {job_post_id}", 404)
+    return job, prompt
+
+
+def summarize(
+    job: JobPost,
+    prompt: Prompt,
+    candidate_ids: list[str],
+    outcomes: dict[str, EvaluationOutcome],
+    write_errors: Optional[dict[str, str]] = None,
+) -> dict[str, Any]:
+    """
+    Build the response body from the outcome of every candidate.
+
+    Args:
+        job: The job post evaluated for.
+        prompt: The prompt used.
+        candidate_ids: Requested candidates, in request order.
+        outcomes: Evaluation or exception per candidate found.
+        write_errors: Candidate ID -> error, for evaluations that could not
+            be appended to ``candidates_evaluations``.
+
+    Returns:
+        The body: ``evaluations`` (each flagged ``written``), per-candidate
+        ``errors``, ``write_errors`` and ``missing_candidates``.
+    """
+    write_errors = write_errors or {}
+    evaluations = []
+    errors = {}
+    missing = []
+    for candidate_id in candidate_ids:
+        outcome = outcomes.get(candidate_id)
+        if outcome is None:
+            missing.append(candidate_id)
+        elif isinstance(outcome, Exception):
+            errors[candidate_id] = f"{type(outcome).__name__}: {outcome}"
+        else:
+            evaluations.append(
+                {
+                    "evaluation_id": outcome.evaluation_id,
+                    "candidate_id": outcome.candidate_id,
+                    "fit_label": outcome.fit_label.value,
+                    "fit_score": outcome.fit_score,
+                    "written": candidate_id not in write_errors,
+                }
+            )
+    return {
+        "job_post_id": job.job_post_id,
+        "prompt_version": prompt.prompt_version,
+        "evaluated": len(evaluations),
+        "evaluations": evaluations,
+        "errors": errors,
+        "write_errors": write_errors,
+        "missing_candidates": missing,
+    }
+
+
+def candidate_index(
+    client: SheetsClient, cache: SheetSnapshotCache, snapshot: TabSnapshot
+) -> CandidateRepository:
+    """
+    Return a candidate repository indexed over a ``candidates_raw`` snapshot.
+
+    Warm invocations reuse the repository, and so its ID index, for as long
+    as the snapshot cache serves the same snapshot; it switches to the
+    client of the latest caller, like the snapshot cache.
+
+    Args:
+        client: Client of the current request.
+        cache: Snapshot cache the repository loads from.
+        snapshot: The current ``candidates_raw`` snapshot.
+    """
+    with _candidate_indexes_lock:
+        entry = _candidate_indexes.get(client.spreadsheet_id)
+        if entry is None or entry[0] is not snapshot:
+            repository = CandidateRepository(client, cache=cache)
+            repository.get_all()
+            entry = (snapshot, repository)
+            _candidate_indexes[client.spreadsheet_id] = entry
+        repository = entry[1]
+        repository.client = client
+        return repository
+
+
+async def evaluate_async(
+    config: dict[str, Any],
+    job_post_id: str,
+    candidate_ids: list[str],
+    prompt_version: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Evaluate candidates for a job, overlapping LLM calls and write-back.
+
+    All tabs are fetched in one ``batchGet`` through the snapshot cache, and
+    candidates are looked up in a per-process ID index over it (see
+    ``candidate_index``). Candidates are then evaluated in units of
+    ``evaluation_batch_size`` with at most ``gemini_max_concurrency``
+    requests in flight, all on one thread pool; candidates a batched
+    response does not cover are retried as single-candidate units. A writer
+    task appends finished evaluations while the others are still running. A
+    failed append does not fail the request: the evaluations it carried are
+    reported in ``write_errors`` and the remaining batches are still
+    written, so the caller can retry exactly the unwritten candidates.
+
+    Args:
+        config: Configuration from ``get_config()``.
+        job_post_id: Job the candidates are evaluated for.
+        candidate_ids: Candidates to evaluate.
+        prompt_version: Prompt version; defaults to the job's default.
+
+    Returns:
+        The response body, see ``summarize``.
+
+    Raises:
+        RequestError: If the job post or prompt does not exist.
+    """
+    loop = asyncio.get_running_loop()
+    concurrency = max(1, config["gemini_max_concurrency"])
+    # One thread per in-flight unit plus one for the writer.
+    executor = ContextThreadPoolExecutor(max_workers=concurrency + 1)
+    try:
+        client = SheetsClient(config["spreadsheet_id"])
+        cache = get_snapshot_cache(client)
+        with span("load"):
+            snapshots = await loop.run_in_executor(
+                executor, cache.get_many, ["job_posts", "prompts", "candidates_raw"]
+            )
+        job, prompt = resolve_prompt(
+            snapshots["job_posts"].records,
+            snapshots["prompts"].records,
+            job_post_id,
+            prompt_version,
+        )
+        repository = candidate_index(client, cache, snapshots["candidates_raw"])
+        candidates: list[CandidateRaw] = [
+            candidate
+            for candidate in map(repository.get_by_id, candidate_ids)
+            if candidate is not None
+        ]
+
+        gemini = get_gemini_client(config)
+        builder = PromptBuilder.from_prompt(prompt, config["prompt_token_budget"])
+        evaluator = CandidateEvaluator(
+            gemini, builder, job.job_post_id, {"job_post_name": job.job_post_name}
+        )
+
+        queue: asyncio.Queue = asyncio.Queue()
+        write_errors: dict[str, str] = {}
+
+        async def write_back() -> None:
+            done = False
+            while not done:
+                batch: list[CandidateEvaluation] = []
+                item = await queue.get()
+                while True:
+                    if item is None:
+                        done = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= WRITE_BATCH_SIZE or queue.empty():
+                        break
+                    item = queue.get_nowait()
+                if not batch:
+                    continue
+                try:
+                    rows = models_to_rows(batch)
+                    with span("write_back"):
+                        await loop.run_in_executor(
+                            executor,
+                            client.append_rows,
+                            EvaluationRepository.sheet_name,
+                            rows,
+                        )
+                except Exception as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+                    for evaluation in batch:
+                        write_errors[evaluation.candidate_id] = error
+                    incr("evaluations.write_failed", len(batch))
+                    logger.error(
+                        "Write-back failed",
+                        extra={
+                            "candidate_ids": [e.candidate_id for e in batch],
+                            "error": error,
+                        },
+                    )
+                    continue
+                incr("evaluations.written", len(batch))
+
+        writer = asyncio.create_task(write_back())
+        slots = asyncio.Semaphore(concurrency)
+        batch_size = max(1, config["evaluation_batch_size"])
+        outcomes: dict[str, EvaluationOutcome] = {}
+
+        def record(candidate: CandidateRaw, outcome: EvaluationOutcome) -> None:
+            outcomes[candidate.candidate_id] = outcome
+            if isinstance(outcome, CandidateEvaluation):
+                logger.info(
+                    "Candidate evaluated",
+                    extra={
+                        "candidate_id": candidate.candidate_id,
+                        "fit_label": outcome.fit_label.value,
+                        "fit_score": outcome.fit_score,
+                    },
+                )
+                queue.put_nowait(outcome)
+            else:
+                logger.warning(
+                    "Candidate evaluation failed",
+                    extra={
+                        "candidate_id": candidate.candidate_id,
+                        "error": f"{type(outcome).__name__}: {outcome}",
+                    },
+                )
+
+        async def run_single(candidate: CandidateRaw) -> None:
+            async with slots:
+                try:
+                    outcome: EvaluationOutcome = await loop.run_in_executor(
+                        executor, evaluator.evaluate, candidate
+                    )
+                except Exception as exc:
+                    outcome = exc
+            record(candidate, outcome)
+
+        async def run_unit(unit: list[CandidateRaw]) -> None:
+            if len(unit) == 1:
+                await run_single(unit[0])
+                return
+            async with slots:
+                try:
+                    found = await loop.run_in_executor(
+                        executor, evaluator.evaluate_batch, unit
+                    )
+                except Exception:
+                    found = {}
+            for candidate in unit:
+                if candidate.candidate_id in found:
+                    record(candidate, found[candidate.candidate_id])
+            # Candidates the batch did not cover are retried one by one as
+            # units of their own, on the same pool and concurrency bound.
+            missing = [c for c in unit if c.candidate_id not in found]
+            incr("evaluations.batch_fallback", len(missing))
+            await asyncio.gather(*(run_single(c) for c in missing))
+
+        units = [
+            candidates[i : i + batch_size]
+            for i in range(0, len(candidates), batch_size)
+        ]
+        try:
+            with span("evaluate"):
+                await asyncio.gather(*(run_unit(unit) for unit in units))
+        finally:
+            queue.put_nowait(None)
+            with span("drain_write_back"):
+                await writer
+
+        cache.invalidate(EvaluationRepository.sheet_name)
+        return summarize(job, prompt, candidate_ids, outcomes, write_errors)
+    finally:
+        executor.shutdown(wait=False)
+
 
 def handle(request: Request) -> tuple[str, int]:
     """
     Handle the evaluation request.
 
-    This function should:
-    1. Parse candidate ID(s) from request
-    2. Load candidate data from Sheets
-    3. Load evaluation prompt for the job type
-    4. Build the complete prompt with candidate data
-    5. Call Gemini for evaluation
-    6. Parse and store the evaluation result
-    7. Return evaluation summary
+    Expects a JSON body ``{"job_post_id": ..., "candidate_ids": [...]}``
+    with an optional ``prompt_version`` (defaults to the job's
+    ``default_prompt_version``). Each candidate is evaluated with Gemini and
+    every successful evaluation is appended to ``candidates_evaluations``.
+
+    The response lists the evaluations, per-candidate errors and unknown
+    candidate IDs, plus a ``metrics`` summary of the invocation (see
+    ``shared.metrics``). Errors of single candidates do not fail the
+    request, and neither does a failed write-back: evaluations that were
+    not stored are flagged ``"written": false`` and listed in
+    ``write_errors``, so a retry can be limited to those candidates instead
+    of duplicating the rows already appended.
 
     Args:
         request: The incoming HTTP request.
@@ -27,4 +393,25 @@ def handle(request: Request) -> tuple[str, int]:
     Returns:
         Response tuple of (body, status_code).
     """
-    raise NotImplementedError
+    payload = request.get_json(silent=True) or {}
+    try:
+        job_post_id, candidate_ids, prompt_version = parse_request(payload)
+        with collect() as metrics:
+            body = asyncio.run(
+                evaluate_async(get_config(), job_post_id, candidate_ids, prompt_version)
+            )
+    except RequestError as exc:
+        return json.dumps({"error": str(exc)}), exc.status
+    body["metrics"] = metrics.summary()
+    logger.info(
+        "Evaluation finished",
+        extra={
+            "job_post_id": job_post_id,
+            "evaluated": body["evaluated"],
+            "failed": len(body["errors"]),
+            "unwritten": len(body["write_errors"]),
+            "missing": len(body["missing_candidates"]),
+            "metrics": body["metrics"],
+        },
+    )
+    return json.dumps(body), 200
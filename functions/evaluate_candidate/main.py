@@ -12,6 +12,8 @@ import functions_framework
 from flask import Request
 
 from handler import handle
+from shared.config import get_config
+from shared.logging import correlation_context, correlation_id_from_headers
 
 
 @functions_framework.http
@@ -19,10 +21,22 @@ def main(request: Request) -> tuple[str, int]:
     """
     HTTP Cloud Function entrypoint.
 
+    A request with ``X-Profile: cprofile|sample`` (or ``?profile=...``) is
+    run under a profiler when ``PROFILING_ENABLED`` is set; see
+    ``shared.profiling``.
+
     Args:
         request: The incoming HTTP request.
 
     Returns:
         Response tuple of (body, status_code).
     """
-    return handle(request)
+    with correlation_context(correlation_id_from_headers(request.headers)):
+        if not get_config()["profiling_enabled"]:
+            return handle(request)
+        from shared.profiling import requested_profile, run_profiled
+
+        mode = requested_profile(request)
+        if mode is None:
+            return handle(request)
+        return run_profiled("evaluate_candidate", handle, request, mode)
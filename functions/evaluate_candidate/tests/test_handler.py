@@ -0,0 +1,110 @@
+"""Tests for the evaluation handler."""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import handler
+from shared.config import get_config
+from shared.schemas import CandidateEvaluation, CandidateRaw, JobPost, Prompt, Source
+from shared.sheets.rows import header_for, model_to_row
+from shared.tests.fake_gemini import FakeGemini
+from shared.tests.fake_sheets import FakeSpreadsheet
+
+
+def candidate(number: int, **fields) -> CandidateRaw:
+    values = {
+        "candidate_id": f"cand-{number}",
+        "source": Source.GETONBOARD,
+        "source_candidate_id": str(number),
+        "created_at": datetime(2024, 5, 1, tzinfo=timezone.utc),
+        "full_name": f"Candidate {number}",
+        "email": f"candidate{number}@example.com",
+        "raw_profile_url": f"https://example.com/{number}",
+    }
+    values.update(fields)
+    return CandidateRaw(**values)
+
+
+def spreadsheet() -> FakeSpreadsheet:
+    job = JobPost(
+        job_post_id="job-1",
+        job_post_name="Backend Engineer",
+        getonboard_url="https://example.com/job-1",
+        default_prompt_version="v1",
+    )
+    prompt = Prompt(
+        job_post_id="job-1",
+        prompt_version="v1",
+        prompt_content="Job {{job_post_name}}.\nCandidate:\n{{candidate}}",
+    )
+    candidates = [candidate(n) for n in range(1, 5)]
+    # A later row repeating an ID loses to the first one.
+    candidates.append(candidate(9, candidate_id="cand-1", full_name="Duplicate"))
+    return FakeSpreadsheet(
+        {
+            "job_posts": [header_for(JobPost), model_to_row(job)],
+            "prompts": [header_for(Prompt), model_to_row(prompt)],
+            "candidates_raw": [header_for(CandidateRaw)]
+            + [model_to_row(c) for c in candidates],
+            "candidates_evaluations": [header_for(CandidateEvaluation)],
+        }
+    )
+
+
+@pytest.fixture
+def gemini(monkeypatch) -> FakeGemini:
+    gemini = FakeGemini(dropped={"cand-2"})
+    monkeypatch.setattr(handler, "get_gemini_client", lambda config: gemini)
+    return gemini
+
+
+def evaluate(spreadsheet_id: str, ids: list[str], batch_size: int) -> dict:
+    config = dict(
+        get_config(), spreadsheet_id=spreadsheet_id, evaluation_batch_size=batch_size
+    )
+    return asyncio.run(handler.evaluate_async(config, "job-1", ids))
+
+
+@pytest.fixture
+def sheet(monkeypatch) -> FakeSpreadsheet:
+    sheet = spreadsheet()
+    monkeypatch.setattr(handler, "SheetsClient", sheet.client)
+    return sheet
+
+
+def test_batched_units_fall_back_on_the_same_pool(sheet, gemini):
+    ids = ["cand-3", "cand-1", "cand-2", "cand-7"]
+
+    body = evaluate("evaluate-batched", ids, batch_size=3)
+
+    assert gemini.batches == [["cand-3", "cand-1", "cand-2"]]
+    assert gemini.singles == ["cand-2"]
+    # No nested pool: the batch API of the client is never used.
+    assert gemini.many_calls == 0
+    assert [e["candidate_id"] for e in body["evaluations"]] == ids[:3]
+    assert body["missing_candidates"] == ["cand-7"]
+    written = [row[1] for row in sheet.tabs["candidates_evaluations"][1:]]
+    assert sorted(written) == ["cand-1", "cand-2", "cand-3"]
+
+
+def test_candidate_index_is_reused_while_the_snapshot_is(sheet, gemini):
+    evaluate("evaluate-index", ["cand-1"], batch_size=1)
+    first = handler._candidate_indexes["evaluate-index"]
+    evaluate("evaluate-index", ["cand-4"], batch_size=1)
+
+    assert handler._candidate_indexes["evaluate-index"] is first
+    assert first[1].get_by_id("cand-1").full_name == "Candidate 1"
+    assert gemini.singles == ["cand-1", "cand-4"]
+
+
+def test_handle_rejects_malformed_requests():
+    request = SimpleNamespace(get_json=lambda silent=False: {"job_post_id": "job-1"})
+
+    body, status = handler.handle(request)
+
+    assert status == 400
+    assert "candidate_ids" in json.loads(body)["error"]
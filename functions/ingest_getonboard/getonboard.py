@@ -0,0 +1,225 @@
+"""
+GetOnBoard API client and record transformation.
+
+Lists the applications of a job post and maps them to ``CandidateRaw``.
+GetOnBoard lists applications newest first, which lets incremental runs
+stop paginating at the first page that reaches already ingested records.
+All requests share one keep-alive, connection-pooled session per process.
+"""
+
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from shared.metrics import incr, span
+from shared.schemas import CandidateRaw, Source, SyncState
+from shared.sync_state import is_after
+
+GETONBOARD_API_URL = "https://www.getonbrd.com/api/v0"
+APPLICATION_EXPAND = '["professional"]'
+
+# Namespace for deterministic candidate IDs derived from the source ID.
+CANDIDATE_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://www.getonbrd.com")
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Return the process-wide pooled HTTP session.
+
+    Reused across warm invocations so TLS connections stay open; transient
+    errors and 429s are retried with backoff by the adapter.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+                respect_retry_after_header=True,
+            )
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_maxsize=4, max_retries=retry))
+            _session = session
+        return _session
+
+
+class GetOnBoardClient:
+    """Thin client for the GetOnBoard v0 REST API."""
+
+    def __init__(
+        self,
+        api_key: str,
+        session: Optional[requests.Session] = None,
+        per_page: int = 50,
+        timeout: float = 30.0,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            api_key: GetOnBoard API key.
+            session: HTTP session; defaults to the shared pooled session.
+            per_page: Applications requested per page.
+            timeout: Per-request timeout in seconds.
+        """
+        self.api_key = api_key
+        self.session = session or get_http_session()
+        self.per_page = per_page
+        self.timeout = timeout
+
+    def _get(self, path: str, **params: Any) -> dict[str, Any]:
+        params["api_key"] = self.api_key
+        incr("getonboard.calls")
+        with span("getonboard.request"):
+            response = self.session.get(
+                f"{GETONBOARD_API_URL}{path}", params=params, timeout=self.timeout
+            )
+        # Retries happen inside the adapter; urllib3 records them.
+        retry = getattr(getattr(response, "raw", None), "retries", None)
+        retries = getattr(retry, "history", ())
+        incr("getonboard.retries", len(retries))
+        incr("getonboard.bytes_received", len(response.content))
+        response.raise_for_status()
+        return response.json()
+
+    def get_process_id(self, job_post_id: str) -> str:
+        """Return the hiring process ID of a job post."""
+        processes = self._get(f"/jobs/{job_post_id}/processes")["data"]
+        if not processes:
+            raise LookupError(f"Job post {job_post_id} has no hiring process")
+        return str(processes[0]["id"])
+
+    def iter_application_pages(self, process_id: str) -> Iterator[list[dict[str, Any]]]:
+        """
+        Yield the applications of a process one page at a time, newest first.
+
+        Pages are requested lazily, so a consumer that stops iterating
+        stops the pagination too.
+        """
+        page = 1
+        while True:
+            body = self._get(
+                "/applications",
+                process_id=process_id,
+                per_page=self.per_page,
+                page=page,
+                expand=APPLICATION_EXPAND,
+            )
+            applications = body.get("data") or []
+            if not applications:
+                return
+            yield applications
+            total_pages = (body.get("meta") or {}).get("total_pages")
+            if total_pages is not None and page >= total_pages:
+                return
+            page += 1
+
+
+def application_created_at(application: dict[str, Any]) -> datetime:
+    """
+    Creation time of an application as an aware datetime.
+
+    Raises:
+        ValueError: If the application has no ``created_at``, or one without
+            a UTC offset, which could not be ordered against the cursor.
+    """
+    value = application.get("attributes", {}).get("created_at")
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    if isinstance(value, str) and value:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            raise ValueError(
+                f"Application {application.get('id')} has a created_at without "
+                f"a UTC offset: {value!r}"
+            )
+        return parsed
+    raise ValueError(f"Application {application.get('id')} has no created_at")
+
+
+def iter_new_pages(
+    pages: Iterator[list[dict[str, Any]]],
+    state: Optional[SyncState],
+    on_invalid: Optional[Callable[[dict[str, Any], ValueError], None]] = None,
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Yield the not yet ingested part of each page, stopping at known records.
+
+    Args:
+        pages: Application pages, newest first.
+        state: The job's cursor; None yields every application.
+        on_invalid: Called with each application whose ``created_at`` cannot
+            be ordered against the cursor, which is then left out. When
+            omitted, such an application raises.
+
+    Yields:
+        Per page, the applications newer than the cursor.
+
+    Raises:
+        ValueError: For an application without a usable ``created_at``,
+            unless ``on_invalid`` is given.
+    """
+    for page in pages:
+        new = []
+        known = 0
+        for application in page:
+            try:
+                created_at = application_created_at(application)
+            except ValueError as exc:
+                if on_invalid is None:
+                    raise
+                on_invalid(application, exc)
+                continue
+            if is_after(state, created_at, str(application["id"])):
+                new.append(application)
+            else:
+                known += 1
+        if new:
+            yield new
+        if known:
+            return
+
+
+def application_to_candidate(application: dict[str, Any]) -> CandidateRaw:
+    """
+    Map a GetOnBoard application (with ``professional`` expanded) to a row.
+
+    The candidate ID is derived from the professional's GetOnBoard ID, so
+    re-ingesting the same person yields the same ``candidate_id``.
+    """
+    attributes = application.get("attributes", {})
+    professional = attributes.get("professional", {}).get("data", {})
+    profile = professional.get("attributes", {})
+    source_candidate_id = str(professional.get("id") or application["id"])
+    cv = profile.get("uploaded_cv") or {}
+
+    candidate_id = uuid.uuid5(
+        CANDIDATE_ID_NAMESPACE, f"{Source.GETONBOARD.value}:{source_candidate_id}"
+    )
+
+    return CandidateRaw(
+        candidate_id=str(candidate_id),
+        source=Source.GETONBOARD,
+        source_candidate_id=source_candidate_id,
+        created_at=application_created_at(application),
+        full_name=profile.get("name") or "",
+        email=profile.get("email") or "",
+        phone=profile.get("phone") or None,
+        linkedin_url=profile.get("linkedin_url") or None,
+        cv_url=cv.get("url") or None,
+        raw_profile_url=(
+            profile.get("public_url")
+            or f"{GETONBOARD_API_URL}/applications/{application['id']}"
+        ),
+    )
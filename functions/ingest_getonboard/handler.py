@@ -5,19 +5,173 @@ Fetches candidate data from GetOnBoard job platform and stores it
 in Google Sheets for downstream processing by the evaluation function.
 """
 
+import json
+from datetime import datetime, timezone
+from typing import Any, Optional
+
 from flask import Request
 
+from getonboard import GetOnBoardClient, application_to_candidate, iter_new_pages
+from shared.config import get_config
+from shared.logging import get_logger
+from shared.metrics import collect, incr, span
+from shared.pipeline import BackgroundWriter, prefetch
+from shared.schemas import JobPost, Source, SyncState
+from shared.sheets import (
+    CandidateDedupIndex,
+    CandidateRepository,
+    SheetsClient,
+    SyncStateRepository,
+    get_snapshot_cache,
+)
+from shared.sheets.rows import models_to_rows
+from shared.sync_state import FileSyncStateStore, SyncStateStore, cursor_key
+
+logger = get_logger(__name__)
+
+
+def _sync_state_store(config: dict, client: SheetsClient) -> SyncStateStore:
+    if config["sync_state_backend"] == "file":
+        return FileSyncStateStore(config["sync_state_path"])
+    return SyncStateRepository(client)
+
+
+def ingest_job(
+    job_post_id: str,
+    getonboard: GetOnBoardClient,
+    client: SheetsClient,
+    dedup: CandidateDedupIndex,
+    store: SyncStateStore,
+) -> dict[str, Any]:
+    """
+    Ingest the applications of one job post received since its cursor.
+
+    Runs as a three-stage pipeline: the next page is fetched in the
+    background while the current one is transformed and deduplicated, and
+    the previous one is appended to ``candidates_raw`` on a writer thread.
+    Only one page per stage is held in memory.
+
+    Duplicates are detected against a key-only index of ``candidates_raw``
+    rather than parsed rows. Applications that cannot be mapped to a
+    candidate (e.g. without a usable ``created_at``) are logged and
+    skipped rather than failing the job. The cursor only advances after
+    every page has been written, so a failed run is retried from the same
+    point; rows it already appended are then caught by dedup.
+
+    Args:
+        job_post_id: GetOnBoard job ID.
+        getonboard: API client.
+        client: Sheets client the candidates are appended with.
+        dedup: Keys of stored candidates; new candidates are added to it.
+        store: Cursor store.
+
+    Returns:
+        Counts of fetched, stored, duplicate and invalid records.
+    """
+    state = store.get(job_post_id)
+    process_id = getonboard.get_process_id(job_post_id)
+    pages = prefetch(getonboard.iter_application_pages(process_id))
+
+    newest = None
+    fetched = 0
+    stored = 0
+    duplicates = 0
+    invalid = 0
+
+    def skip(application: dict[str, Any], exc: ValueError) -> None:
+        nonlocal invalid
+        invalid += 1
+        incr("candidates.invalid")
+        logger.warning(
+            "Skipping invalid application",
+            extra={
+                "job_post_id": job_post_id,
+                "application_id": application.get("id"),
+                "error": f"{type(exc).__name__}: {exc}",
+            },
+        )
+
+    def append(rows: list[list[Any]]) -> None:
+        with span("write"):
+            client.append_rows(CandidateRepository.sheet_name, rows)
+
+    with BackgroundWriter(append) as writer:
+        for page in iter_new_pages(pages, state, on_invalid=skip):
+            fetched += len(page)
+            with span("transform"):
+                candidates = []
+                for application in page:
+                    try:
+                        candidate = application_to_candidate(application)
+                    except ValueError as exc:
+                        skip(application, exc)
+                        continue
+                    candidates.append(candidate)
+                    key = (candidate.created_at, str(application["id"]))
+                    if newest is None or cursor_key(*key) > cursor_key(*newest):
+                        newest = key
+                new, skipped = dedup.split_new(candidates)
+            incr("candidates.fetched", len(page))
+            incr("candidates.duplicates", skipped)
+            duplicates += skipped
+            if new:
+                writer.submit(models_to_rows(new))
+                stored += len(new)
+
+    if newest is not None:
+        store.set(
+            SyncState(
+                job_post_id=job_post_id,
+                source=Source.GETONBOARD,
+                cursor_created_at=newest[0],
+                cursor_id=newest[1],
+                updated_at=datetime.now(timezone.utc),
+            )
+        )
+
+    return {
+        "fetched": fetched,
+        "stored": stored,
+        "duplicates": duplicates,
+        "invalid": invalid,
+    }
+
+
+def parse_job_post_ids(payload: dict[str, Any]) -> Optional[list[str]]:
+    """
+    Validate the optional ``job_post_ids`` of the request body.
+
+    Returns:
+        The requested job post IDs, or None to ingest every active job.
+
+    Raises:
+        ValueError: If ``job_post_ids`` is not a list of strings.
+    """
+    job_post_ids = payload.get("job_post_ids")
+    if job_post_ids is None:
+        return None
+    if not isinstance(job_post_ids, list) or not all(
+        isinstance(job_post_id, str) and job_post_id for job_post_id in job_post_ids
+    ):
+        raise ValueError("job_post_ids must be a list of strings")
+    return list(dict.fromkeys(job_post_ids)) or None
+
 
 def handle(request: Request) -> tuple[str, int]:
     """
     Handle the ingestion request.
 
-    This function should:
-    1. Authenticate with GetOnBoard API
-    2. Fetch new/updated candidates since last sync
-    3. Transform data to internal schema
-    4. Write candidates to the Sheets repository
-    5. Return summary of ingested records
+    Ingests the job posts listed in the JSON body (``{"job_post_ids": [...]}``)
+    or, by default, every active job post. Only applications newer than each
+    job's stored cursor are fetched.
+
+    A job that fails is logged and reported with an ``error`` in its entry,
+    and the remaining jobs are still ingested; its cursor is not advanced,
+    so the next run retries it. A malformed ``job_post_ids`` is rejected
+    with 400.
+
+    The response carries per-job counts and a ``metrics`` summary of the
+    invocation (see ``shared.metrics``), which is logged as well.
 
     Args:
         request: The incoming HTTP request.
@@ -25,4 +179,44 @@ def handle(request: Request) -> tuple[str, int]:
     Returns:
         Response tuple of (body, status_code).
     """
-    raise NotImplementedError
+    config = get_config()
+    payload = request.get_json(silent=True) or {}
+    try:
+        job_post_ids = parse_job_post_ids(payload)
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)}), 400
+
+    with collect() as metrics:
+        client = SheetsClient(config["spreadsheet_id"])
+        if job_post_ids is None:
+            cache = get_snapshot_cache(client)
+            job_posts: list[JobPost] = cache.get_records("job_posts")
+            job_post_ids = [job.job_post_id for job in job_posts if job.active]
+
+        getonboard = GetOnBoardClient(config["getonboard_api_key"])
+        with span("load_dedup_index"):
+            dedup = CandidateDedupIndex.load(client)
+        store = _sync_state_store(config, client)
+
+        summary: dict[str, dict[str, Any]] = {}
+        for job_post_id in job_post_ids:
+            try:
+                with span("ingest_job"):
+                    summary[job_post_id] = ingest_job(
+                        job_post_id, getonboard, client, dedup, store
+                    )
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                summary[job_post_id] = {"error": error}
+                incr("jobs.failed")
+                logger.exception(
+                    "Ingestion of job failed", extra={"job_post_id": job_post_id}
+                )
+                # Keys of rows that never reached the tab may be in the
+                # index now; rebuild it so later jobs do not skip them.
+                with span("load_dedup_index"):
+                    dedup = CandidateDedupIndex.load(client)
+
+    report = metrics.summary()
+    logger.info("Ingestion finished", extra={"jobs": summary, "metrics": report})
+    return json.dumps({"jobs": summary, "metrics": report}), 200
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The function's modules import each other as top-level modules, as they do
+# when deployed.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+# Every function has a top-level ``handler``; drop one imported by another
+# function's tests so this function's own is imported.
+sys.modules.pop("handler", None)
@@ -0,0 +1,120 @@
+"""Tests for GetOnBoard application parsing and cursor filtering."""
+
+from datetime import datetime, timezone
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from getonboard import (
+    GetOnBoardClient,
+    application_created_at,
+    get_http_session,
+    iter_new_pages,
+)
+from shared.schemas import Source, SyncState
+
+
+def application(app_id: int, created_at: object) -> dict:
+    return {"id": app_id, "attributes": {"created_at": created_at}}
+
+
+def cursor(created_at: datetime, cursor_id: str) -> SyncState:
+    return SyncState(
+        job_post_id="job-1",
+        source=Source.GETONBOARD,
+        cursor_created_at=created_at,
+        cursor_id=cursor_id,
+        updated_at=created_at,
+    )
+
+
+def test_application_created_at_accepts_epoch_and_offsets():
+    expected = datetime(2024, 5, 1, 10, 0, tzinfo=timezone.utc)
+
+    assert application_created_at(application(1, expected.timestamp())) == expected
+    assert application_created_at(application(1, "2024-05-01T10:00:00Z")) == expected
+    assert (
+        application_created_at(application(1, "2024-05-01T07:00:00-03:00"))
+        == expected
+    )
+
+
+@pytest.mark.parametrize("created_at", ["2024-05-01T10:00:00", "", None])
+def test_application_created_at_rejects_unorderable_values(created_at):
+    with pytest.raises(ValueError):
+        application_created_at(application(1, created_at))
+
+
+def test_iter_new_pages_stops_at_the_cursor():
+    at = "2024-05-01T10:00:00Z"
+    pages = iter(
+        [
+            [application(12, "2024-05-02T10:00:00Z"), application(10, at)],
+            [application(9, at), application(8, "2024-04-30T10:00:00Z")],
+            [application(7, "2024-04-29T10:00:00Z")],
+        ]
+    )
+    state = cursor(datetime(2024, 5, 1, 10, 0, tzinfo=timezone.utc), "9")
+
+    new = list(iter_new_pages(pages, state))
+
+    assert [[app["id"] for app in page] for page in new] == [[12, 10]]
+    # The page holding the cursor ends the pagination.
+    assert [app["id"] for app in next(pages)] == [7]
+
+
+def test_iter_new_pages_without_cursor_yields_everything():
+    pages = [[application(2, 2.0)], [application(1, 1.0)]]
+
+    assert list(iter_new_pages(iter(pages), None)) == pages
+
+
+def test_iter_new_pages_reports_unorderable_applications():
+    pages = [[application(3, 3.0), application(2, "2024-05-01T10:00:00")]]
+    invalid = []
+
+    new = list(iter_new_pages(iter(pages), None, lambda app, exc: invalid.append(app)))
+
+    assert [[app["id"] for app in page] for page in new] == [[3]]
+    assert [app["id"] for app in invalid] == [2]
+    with pytest.raises(ValueError):
+        list(iter_new_pages(iter(pages), None))
+
+
+class FakeSession:
+    """Serves ``total_pages`` pages of two applications each."""
+
+    def __init__(self, total_pages: int) -> None:
+        self.total_pages = total_pages
+        self.pages: list[int] = []
+
+    def get(self, url: str, params: dict, timeout: float) -> SimpleNamespace:
+        page = params["page"]
+        self.pages.append(page)
+        data = [] if page > self.total_pages else [{"id": page * 10}, {"id": page}]
+        body = {"data": data, "meta": {"total_pages": self.total_pages}}
+        return SimpleNamespace(
+            content=json.dumps(body).encode(),
+            json=lambda: body,
+            raise_for_status=lambda: None,
+        )
+
+
+def test_application_pages_are_requested_lazily():
+    session = FakeSession(total_pages=5)
+    pages = GetOnBoardClient("key", session=session).iter_application_pages("p1")
+
+    assert next(pages) == [{"id": 10}, {"id": 1}]
+    assert next(pages) == [{"id": 20}, {"id": 2}]
+    assert session.pages == [1, 2]
+    assert len(list(pages)) == 3
+    assert session.pages == [1, 2, 3, 4, 5]
+
+
+def test_http_session_is_shared_and_pooled():
+    session = get_http_session()
+
+    assert get_http_session() is session
+    assert session.get_adapter("https://www.getonbrd.com").max_retries.total == 3
@@ -0,0 +1,97 @@
+"""Tests for the ingestion handler."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import handler
+from shared.schemas import CandidateRaw, SyncState
+from shared.sheets.rows import header_for
+from shared.tests.fake_sheets import FakeSpreadsheet
+
+
+def application(app_id: int, created_at: object, email: str = "") -> dict:
+    professional = {"id": f"p{app_id}", "attributes": {"name": "Ada", "email": email}}
+    return {
+        "id": app_id,
+        "attributes": {
+            "created_at": created_at,
+            "professional": {"data": professional},
+        },
+    }
+
+
+class FakeGetOnBoard:
+    """Serves fixed application pages per job; unknown jobs fail."""
+
+    def __init__(self, pages: dict[str, list[list[dict]]]) -> None:
+        self.pages = pages
+
+    def get_process_id(self, job_post_id: str) -> str:
+        if job_post_id not in self.pages:
+            raise LookupError(f"Job post {job_post_id} has no hiring process")
+        return job_post_id
+
+    def iter_application_pages(self, process_id: str):
+        yield from self.pages[process_id]
+
+
+@pytest.fixture
+def sheet(monkeypatch) -> FakeSpreadsheet:
+    sheet = FakeSpreadsheet(
+        {
+            "candidates_raw": [header_for(CandidateRaw)],
+            "sync_state": [header_for(SyncState)],
+        }
+    )
+    monkeypatch.setattr(handler, "SheetsClient", sheet.client)
+    monkeypatch.setattr(
+        handler,
+        "GetOnBoardClient",
+        lambda api_key: FakeGetOnBoard(
+            {
+                "job-1": [
+                    [
+                        application(3, "2024-05-03T10:00:00Z", "c@example.com"),
+                        application(2, "2024-05-02T10:00:00", "b@example.com"),
+                        application(1, "2024-05-01T10:00:00Z", "a@example.com"),
+                    ]
+                ],
+                "job-3": [[application(7, "2024-05-04T10:00:00Z")]],
+            }
+        ),
+    )
+    return sheet
+
+
+def request(payload: object) -> SimpleNamespace:
+    return SimpleNamespace(get_json=lambda silent=False: payload)
+
+
+def test_failed_job_is_reported_and_later_jobs_still_run(sheet):
+    payload = {"job_post_ids": ["job-1", "job-2", "job-3"]}
+
+    body, status = handler.handle(request(payload))
+    jobs = json.loads(body)["jobs"]
+
+    assert status == 200
+    assert jobs["job-1"] == {"fetched": 2, "stored": 2, "duplicates": 0, "invalid": 1}
+    assert jobs["job-2"] == {
+        "error": "LookupError: Job post job-2 has no hiring process"
+    }
+    assert jobs["job-3"]["stored"] == 1
+    stored = [row[2] for row in sheet.tabs["candidates_raw"][1:]]
+    assert stored == ["p3", "p1", "p7"]
+    cursors = {row[0]: row[2] for row in sheet.tabs["sync_state"][1:]}
+    assert sorted(cursors) == ["job-1", "job-3"]
+    assert cursors["job-1"].startswith("2024-05-03T10:00:00")
+
+
+@pytest.mark.parametrize("job_post_ids", ["job-1", [1, 2], [""], {"job-1": True}])
+def test_malformed_job_post_ids_are_rejected(sheet, job_post_ids):
+    body, status = handler.handle(request({"job_post_ids": job_post_ids}))
+
+    assert status == 400
+    assert "job_post_ids" in json.loads(body)["error"]
+    assert sheet.calls == []
@@ -4,20 +4,36 @@ Handler for push_teamtailor function.
 Syncs evaluated candidates to TeamTailor applicant tracking system.
 """
 
+import json
+from collections import Counter
+
 from flask import Request
 
+from shared.config import get_config
+from shared.logging import get_logger
+from shared.metrics import collect, span
+from shared.schemas import TeamtailorStatus
+from shared.sheets import CandidateRepository, SheetsClient, get_pending_push_view
+from teamtailor import TeamTailorClient, get_http_session, push_candidates
+
+logger = get_logger(__name__)
+
 
 def handle(request: Request) -> tuple[str, int]:
     """
     Handle the push request.
 
-    This function should:
-    1. Load evaluated candidates from Sheets
-    2. Filter candidates meeting score threshold
-    3. Transform data to TeamTailor format
-    4. Create/update candidates in TeamTailor via API
-    5. Mark synced candidates in Sheets
-    6. Return sync summary
+    Pushes every evaluation a recruiter marked ``push`` that has not reached
+    TeamTailor yet (``not_sent`` or ``failed``), taken from the incrementally
+    refreshed pending push view rather than a scan of every evaluation, and
+    only the candidates those evaluations refer to are read.
+    Candidates are created on a bounded pool of concurrent requests, and all
+    ``teamtailor_status`` updates are written back in one batched Sheets
+    write at the end. Pushes are idempotent, so a retried or re-run request
+    does not create duplicates.
+
+    The response includes a ``metrics`` summary of the invocation (see
+    ``shared.metrics``), which is logged as well.
 
     Args:
         request: The incoming HTTP request.
@@ -25,4 +41,57 @@ def handle(request: Request) -> tuple[str, int]:
     Returns:
         Response tuple of (body, status_code).
     """
-    raise NotImplementedError
+    config = get_config()
+    with collect() as metrics:
+        client = SheetsClient(config["spreadsheet_id"])
+        view = get_pending_push_view(client)
+        with span("refresh_pending"):
+            pending = view.refresh()
+
+        with span("load_candidates"):
+            candidates = CandidateRepository(client).fetch_by(
+                "candidate_id", (item.evaluation.candidate_id for item in pending)
+            )
+        items = []
+        missing = 0
+        for item in pending:
+            candidate = candidates.get(item.evaluation.candidate_id)
+            if candidate is None:
+                missing += 1
+                continue
+            items.append((item.evaluation, candidate))
+
+        max_workers = config["teamtailor_max_concurrency"]
+        teamtailor = TeamTailorClient(
+            config["teamtailor_api_key"], session=get_http_session(max_workers)
+        )
+        with span("push"):
+            results = push_candidates(teamtailor, items, max_workers=max_workers)
+
+        with span("write_statuses"):
+            view.set_statuses(
+                {
+                    result.evaluation_id: result.status
+                    for (evaluation, _), result in zip(items, results)
+                    if evaluation.teamtailor_status != result.status
+                }
+            )
+
+    statuses = Counter(result.status.value for result in results)
+    summary = {
+        "pushed": statuses[TeamtailorStatus.SENT.value],
+        "failed": statuses[TeamtailorStatus.FAILED.value],
+        "missing_candidates": missing,
+        "errors": {
+            result.evaluation_id: result.error for result in results if result.error
+        },
+        "metrics": metrics.summary(),
+    }
+    for result in results:
+        if result.error:
+            logger.warning(
+                "Push failed",
+                extra={"evaluation_id": result.evaluation_id, "error": result.error},
+            )
+    logger.info("Push finished", extra={"summary": summary})
+    return json.dumps(summary), 200
@@ -0,0 +1,256 @@
+"""
+TeamTailor API client and bulk push engine.
+
+Creates candidates in TeamTailor from approved evaluations. Requests run
+on a bounded thread pool sharing one keep-alive, connection-pooled session.
+Every create carries an idempotency key derived from the ``evaluation_id``
+and asks TeamTailor to merge with an existing candidate of the same email,
+so retries and re-runs after a crash never create duplicates. Candidates
+without an email cannot be merged and are not pushed.
+"""
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from shared.logging import ContextThreadPoolExecutor
+from shared.metrics import incr, span
+from shared.schemas import CandidateEvaluation, CandidateRaw, TeamtailorStatus
+
+TEAMTAILOR_API_URL = "https://api.teamtailor.com/v1"
+TEAMTAILOR_API_VERSION = "20240404"
+
+# Namespace for idempotency keys derived from evaluation IDs.
+IDEMPOTENCY_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://api.teamtailor.com")
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Upper bound for a single Retry-After wait, in seconds.
+MAX_RETRY_AFTER = 60.0
+
+
+class TeamTailorError(RuntimeError):
+    """A TeamTailor request failed after all retries."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session(pool_size: int = 8) -> requests.Session:
+    """
+    Return the process-wide pooled HTTP session.
+
+    Reused across warm invocations so TLS connections stay open. Retries
+    are handled by ``TeamTailorClient`` so that ``Retry-After`` is honoured
+    for POSTs too.
+
+    Args:
+        pool_size: Connections kept per host; only used on first call.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+            _session = session
+        return _session
+
+
+def idempotency_key(evaluation_id: str) -> str:
+    """Stable idempotency key of the push of one evaluation."""
+    return str(uuid.uuid5(IDEMPOTENCY_NAMESPACE, evaluation_id))
+
+
+def _retry_after(response: requests.Response, attempt: int) -> float:
+    """Seconds to wait before retrying, from ``Retry-After`` or backoff."""
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            return min(max(float(header), 0.0), MAX_RETRY_AFTER)
+        except ValueError:
+            pass
+    return min(0.5 * 2**attempt, MAX_RETRY_AFTER)
+
+
+class TeamTailorClient:
+    """Thin client for the TeamTailor JSON:API."""
+
+    def __init__(
+        self,
+        api_key: str,
+        session: Optional[requests.Session] = None,
+        max_retries: int = 4,
+        timeout: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            api_key: TeamTailor API key with write access.
+            session: HTTP session; defaults to the shared pooled session.
+            max_retries: Retries of a request on 429 and 5xx responses.
+            timeout: Per-request timeout in seconds.
+            sleep: Waits between retries; injectable for tests.
+        """
+        self.api_key = api_key
+        self.session = session or get_http_session()
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._sleep = sleep
+
+    def _headers(self, key: Optional[str] = None) -> dict[str, str]:
+        headers = {
+            "Authorization": f"Token token={self.api_key}",
+            "X-Api-Version": TEAMTAILOR_API_VERSION,
+            "Content-Type": "application/vnd.api+json",
+        }
+        if key:
+            headers["Idempotency-Key"] = key
+        return headers
+
+    def _post(self, path: str, body: dict[str, Any], key: str) -> dict[str, Any]:
+        url = f"{TEAMTAILOR_API_URL}{path}"
+        attempt = 0
+        while True:
+            incr("teamtailor.calls")
+            try:
+                with span("teamtailor.request"):
+                    response = self.session.post(
+                        url, json=body, headers=self._headers(key), timeout=self.timeout
+                    )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                # The request may have gone through; the idempotency key
+                # and email merge make resending it safe.
+                if attempt >= self.max_retries:
+                    raise TeamTailorError(str(exc)) from exc
+                incr("teamtailor.retries")
+                self._sleep(min(0.5 * 2**attempt, MAX_RETRY_AFTER))
+                attempt += 1
+                continue
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                incr("teamtailor.retries")
+                self._sleep(_retry_after(response, attempt))
+                attempt += 1
+                continue
+            if response.status_code >= 400:
+                raise TeamTailorError(
+                    f"POST {path} returned {response.status_code}: "
+                    f"{response.text[:200]}",
+                    status_code=response.status_code,
+                )
+            return response.json()
+
+    def create_candidate(
+        self, attributes: dict[str, Any], key: str
+    ) -> dict[str, Any]:
+        """
+        Create a candidate, merging with an existing one of the same email.
+
+        Args:
+            attributes: JSON:API candidate attributes.
+            key: Idempotency key of the push.
+
+        Returns:
+            The created or merged candidate resource.
+        """
+        body = {"data": {"type": "candidates", "attributes": attributes}}
+        return self._post("/candidates", body, key)["data"]
+
+
+def candidate_attributes(
+    candidate: CandidateRaw, evaluation: CandidateEvaluation
+) -> dict[str, Any]:
+    """
+    Map a candidate and its approved evaluation to TeamTailor attributes.
+
+    Raises:
+        ValueError: If the candidate has no email; without one TeamTailor
+            cannot merge the create, so a retried push would duplicate it.
+    """
+    email = candidate.email.strip()
+    if not email:
+        raise ValueError(f"Candidate {candidate.candidate_id} has no email")
+    first_name, _, last_name = candidate.full_name.strip().partition(" ")
+    attributes = {
+        "first-name": first_name,
+        "last-name": last_name or first_name,
+        "email": email,
+        "phone": candidate.phone,
+        "linkedin-url": candidate.linkedin_url,
+        "resume": candidate.cv_url,
+        "pitch": evaluation.reasons,
+        "sourced": True,
+        "merge": True,
+        "tags": [
+            f"job:{evaluation.job_post_id}",
+            f"fit:{evaluation.fit_label.value}",
+            f"score:{evaluation.fit_score}",
+        ],
+    }
+    return {name: value for name, value in attributes.items() if value is not None}
+
+
+@dataclass
+class PushResult:
+    """Outcome of pushing one evaluation."""
+
+    evaluation_id: str
+    status: TeamtailorStatus
+    teamtailor_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+def push_candidates(
+    client: TeamTailorClient,
+    items: Iterable[tuple[CandidateEvaluation, CandidateRaw]],
+    max_workers: int = 8,
+) -> list[PushResult]:
+    """
+    Push candidates to TeamTailor on a bounded thread pool.
+
+    A failure only marks its own item as failed; the others carry on.
+    Candidates without an email are marked failed without a request.
+
+    Args:
+        client: TeamTailor client; its session is shared by all workers.
+        items: Approved evaluations with their candidates.
+        max_workers: Concurrent requests.
+
+    Returns:
+        One result per item, in input order.
+    """
+
+    def push(item: tuple[CandidateEvaluation, CandidateRaw]) -> PushResult:
+        evaluation, candidate = item
+        try:
+            created = client.create_candidate(
+                candidate_attributes(candidate, evaluation),
+                idempotency_key(evaluation.evaluation_id),
+            )
+        except Exception as exc:
+            return PushResult(
+                evaluation.evaluation_id, TeamtailorStatus.FAILED, error=str(exc)
+            )
+        return PushResult(
+            evaluation.evaluation_id,
+            TeamtailorStatus.SENT,
+            teamtailor_id=str(created.get("id")),
+        )
+
+    items = list(items)
+    if not items:
+        return []
+    workers = min(max_workers, len(items))
+    with ContextThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(push, items))
@@ -0,0 +1,140 @@
+"""Tests for the TeamTailor client and push engine."""
+
+import threading
+from datetime import datetime, timezone
+
+from shared.schemas import (
+    CandidateEvaluation,
+    CandidateRaw,
+    Decision,
+    FitLabel,
+    Source,
+    TeamtailorStatus,
+)
+from teamtailor import (
+    TeamTailorClient,
+    candidate_attributes,
+    idempotency_key,
+    push_candidates,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, body=None, headers=None) -> None:
+        self.status_code = status_code
+        self._body = body or {}
+        self.headers = headers or {}
+        self.text = str(self._body)
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    """Records posts; ``statuses`` lists the status codes to answer in turn."""
+
+    def __init__(self, statuses=()) -> None:
+        self.statuses = list(statuses)
+        self.posts = []
+        self._lock = threading.Lock()
+
+    def post(self, url, json, headers, timeout):
+        with self._lock:
+            self.posts.append((json["data"]["attributes"], headers))
+            status = self.statuses.pop(0) if self.statuses else 201
+            number = len(self.posts)
+        return FakeResponse(status, {"data": {"id": number}})
+
+
+def candidate(number: int, **fields) -> CandidateRaw:
+    values = {
+        "candidate_id": f"cand-{number}",
+        "source": Source.GETONBOARD,
+        "source_candidate_id": str(number),
+        "created_at": datetime(2024, 5, 1, tzinfo=timezone.utc),
+        "full_name": f"Ada Lovelace {number}",
+        "email": f"candidate{number}@example.com",
+        "raw_profile_url": f"https://example.com/{number}",
+    }
+    values.update(fields)
+    return CandidateRaw(**values)
+
+
+def evaluation(number: int) -> CandidateEvaluation:
+    return CandidateEvaluation(
+        evaluation_id=f"eval-{number}",
+        candidate_id=f"cand-{number}",
+        job_post_id="job-1",
+        prompt_version="v1",
+        evaluated_at=datetime(2024, 5, 2, tzinfo=timezone.utc),
+        fit_label=FitLabel.YES,
+        fit_score=5,
+        reasons="Strong match",
+        decision=Decision.PUSH,
+    )
+
+
+def client(session: FakeSession) -> TeamTailorClient:
+    return TeamTailorClient("key", session=session, sleep=lambda seconds: None)
+
+
+def test_idempotency_keys_are_stable_per_evaluation():
+    assert idempotency_key("eval-1") == idempotency_key("eval-1")
+    assert idempotency_key("eval-1") != idempotency_key("eval-2")
+
+
+def test_attributes_merge_by_email():
+    attributes = candidate_attributes(
+        candidate(1, email=" candidate1@example.com "), evaluation(1)
+    )
+
+    assert attributes["merge"] is True
+    assert attributes["email"] == "candidate1@example.com"
+    assert attributes["first-name"] == "Ada"
+    assert attributes["last-name"] == "Lovelace 1"
+    assert "phone" not in attributes
+    assert attributes["tags"] == ["job:job-1", "fit:yes", "score:5"]
+
+
+def test_retries_resend_the_same_idempotency_key():
+    session = FakeSession([429, 503])
+
+    results = push_candidates(client(session), [(evaluation(1), candidate(1))])
+
+    assert results[0].status == TeamtailorStatus.SENT
+    assert results[0].teamtailor_id == "3"
+    keys = {headers["Idempotency-Key"] for _, headers in session.posts}
+    assert keys == {idempotency_key("eval-1")}
+    assert len(session.posts) == 3
+
+
+def test_candidates_without_email_are_flagged_and_not_sent():
+    session = FakeSession()
+    items = [
+        (evaluation(1), candidate(1)),
+        (evaluation(2), candidate(2, email="  ")),
+        (evaluation(3), candidate(3)),
+    ]
+
+    results = push_candidates(client(session), items, max_workers=2)
+
+    assert [result.status for result in results] == [
+        TeamtailorStatus.SENT,
+        TeamtailorStatus.FAILED,
+        TeamtailorStatus.SENT,
+    ]
+    assert results[1].error == "Candidate cand-2 has no email"
+    emails = sorted(attributes["email"] for attributes, _ in session.posts)
+    assert emails == ["candidate1@example.com", "candidate3@example.com"]
+
+
+def test_a_failed_push_does_not_stop_the_others():
+    session = FakeSession([400])
+
+    items = [(evaluation(1), candidate(1)), (evaluation(2), candidate(2))]
+
+    results = push_candidates(client(session), items, max_workers=1)
+
+    assert results[0].status == TeamtailorStatus.FAILED
+    assert "returned 400" in results[0].error
+    assert results[1].status == TeamtailorStatus.SENT
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Report the import cost of each Cloud Function entry point.
+
+Imports ``functions/<name>/main.py`` in a fresh interpreter with
+``python -X importtime`` (the way a cold instance loads it) and prints the
+total import time together with the slowest modules by cumulative time.
+Run it before and after touching imports to see the effect on cold start.
+
+Usage:
+    python scripts/import_report.py
+    python scripts/import_report.py evaluate_candidate --top 30
+    python scripts/import_report.py --json > import_report.json
+
+Requires:
+    - The function's dependencies installed in the current environment
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+FUNCTIONS_DIR = os.path.join(ROOT, "functions")
+
+# "import time:       123 |       4567 |   package.module"
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+@dataclass
+class ModuleTiming:
+    """Import time of one module, in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportReport:
+    """Import timings of one entry point."""
+
+    function: str
+    total_us: int = 0
+    modules: list[ModuleTiming] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def slowest(self, top: int) -> list[ModuleTiming]:
+        """Modules with the highest cumulative import time."""
+        ranked = sorted(self.modules, key=lambda m: m.cumulative_us, reverse=True)
+        return ranked[:top]
+
+
+def parse_importtime(function: str, output: str) -> ImportReport:
+    """
+    Parse the stderr of ``python -X importtime``.
+
+    The total is the sum of the cumulative times of top-level imports, which
+    together cover every module loaded.
+    """
+    report = ImportReport(function)
+    for line in output.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        depth = (len(indent) - 1) // 2
+        timing = ModuleTiming(module, int(self_us), int(cumulative_us), depth)
+        report.modules.append(timing)
+        if depth == 0:
+            report.total_us += timing.cumulative_us
+    return report
+
+
+def measure(function: str) -> ImportReport:
+    """Import a function's ``main`` module in a fresh interpreter and time it."""
+    directory = os.path.join(FUNCTIONS_DIR, function)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [directory, ROOT] + [p for p in [env.get("PYTHONPATH")] if p]
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=directory,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    report = parse_importtime(function, result.stderr)
+    if result.returncode != 0:
+        report.error = result.stderr.strip().splitlines()[-1]
+    return report
+
+
+def print_report(report: ImportReport, top: int) -> None:
+    """Print one report as a table."""
+    print(f"{report.function}: {report.total_us / 1000:.1f} ms")
+    if report.error:
+        print(f"  import failed: {report.error}")
+    for timing in report.slowest(top):
+        print(
+            f"  {timing.cumulative_us / 1000:8.1f} ms "
+            f"{timing.self_us / 1000:8.1f} ms  {timing.module}"
+        )
+    print()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Measure and print import times."""
+    functions = sorted(
+        name
+        for name in os.listdir(FUNCTIONS_DIR)
+        if os.path.isfile(os.path.join(FUNCTIONS_DIR, name, "main.py"))
+    )
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "functions", nargs="*", help=f"Functions to measure: {', '.join(functions)}"
+    )
+    parser.add_argument("--top", type=int, default=15, help="Modules to list")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead")
+    args = parser.parse_args(argv)
+    unknown = set(args.functions) - set(functions)
+    if unknown:
+        parser.error(f"unknown functions: {', '.join(sorted(unknown))}")
+
+    reports = [measure(name) for name in args.functions or functions]
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print("cumulative     self  module\n")
+    for report in reports:
+        print_report(report, args.top)
+
+
+if __name__ == "__main__":
+    main()
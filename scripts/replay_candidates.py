@@ -6,19 +6,507 @@ Re-processes candidates from Sheets, useful for:
 - Re-evaluating with updated prompts
 - Fixing failed evaluations
 - Batch re-processing after changes
+
+Existing evaluations are selected with filters, and their candidates are
+evaluated again with each job's current prompt version (or ``--target-version``).
+Unless ``--force`` is given, candidates whose latest evaluation already used
+the current prompt version and content are skipped.
+Gemini requests run concurrently and chunks are written to
+``candidates_evaluations`` on a background thread while the next chunk is
+evaluated. Every written chunk is checkpointed to a local journal, so a
+rerun after a crash resumes where it stopped.
+
+Usage:
+    python scripts/replay_candidates.py --job 123 --fit-label maybe \\
+        --since 2024-01-01 --workers 16
+
+Requires:
+    - Application default credentials with access to the spreadsheet
+    - Vertex AI access for the configured Gemini model
 """
 
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Optional
+
+# Add parent directory to path to import shared modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shared.columnar import ColumnarTable, Mask
+from shared.config import get_config
+from shared.llm import (
+    CandidateEvaluator,
+    GeminiClient,
+    PromptBuilder,
+    prompt_content_hash,
+)
+from shared.llm.response_cache import response_cache_from_config
+from shared.pipeline import BackgroundWriter
+from shared.reevaluation import as_utc, plan_reevaluation
+from shared.schemas import (
+    CandidateEvaluation,
+    CandidateRaw,
+    FitLabel,
+    JobPost,
+    Prompt,
+)
+from shared.sheets import (
+    CandidateRepository,
+    EvaluationRepository,
+    SheetSnapshotCache,
+    SheetsClient,
+)
+from shared.sheets.rows import models_to_rows
+
+DEFAULT_JOURNAL = "replay_journal.jsonl"
+
+# (candidate_id, job_post_id, prompt_version, prompt_hash) of a replayed
+# evaluation; the hash keeps a resumed run from skipping after a prompt edit.
+ReplayKey = tuple[str, str, str, str]
+
+JOURNAL_FIELDS = ("candidate_id", "job_post_id", "prompt_version", "prompt_hash")
+
+
+@dataclass(frozen=True)
+class ReplayFilters:
+    """Which existing evaluations to replay; unset fields match everything."""
+
+    job_post_ids: Optional[frozenset[str]] = None
+    prompt_version: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    fit_labels: Optional[frozenset[FitLabel]] = None
+
+    def matches(self, evaluation: CandidateEvaluation) -> bool:
+        """Whether an evaluation passes every filter."""
+        if self.job_post_ids and evaluation.job_post_id not in self.job_post_ids:
+            return False
+        if self.prompt_version and evaluation.prompt_version != self.prompt_version:
+            return False
+        evaluated_at = as_utc(evaluation.evaluated_at)
+        if self.since and evaluated_at < self.since:
+            return False
+        if self.until and evaluated_at >= self.until:
+            return False
+        if self.fit_labels and evaluation.fit_label not in self.fit_labels:
+            return False
+        return True
+
+    def mask(self, table: ColumnarTable[CandidateEvaluation]) -> Mask:
+        """Rows of an evaluation table that pass every filter, like ``matches``."""
+        mask = Mask(b"\x01" * len(table))
+        if self.job_post_ids:
+            mask &= table["job_post_id"].isin(self.job_post_ids)
+        if self.prompt_version:
+            mask &= table["prompt_version"] == self.prompt_version
+        if self.since:
+            mask &= table["evaluated_at"] >= self.since
+        if self.until:
+            mask &= table["evaluated_at"] < self.until
+        if self.fit_labels:
+            mask &= table["fit_label"].isin(self.fit_labels)
+        return mask
+
+
+@dataclass(frozen=True)
+class ReplayTask:
+    """One candidate to evaluate for one job with one prompt."""
+
+    candidate: CandidateRaw
+    prompt: Prompt
+
+    @property
+    def job_post_id(self) -> str:
+        return self.prompt.job_post_id
+
+    @property
+    def prompt_version(self) -> str:
+        return self.prompt.prompt_version
+
+    @property
+    def key(self) -> ReplayKey:
+        return (
+            self.candidate.candidate_id,
+            self.job_post_id,
+            self.prompt_version,
+            prompt_content_hash(self.prompt.prompt_content),
+        )
+
+
+class ReplayJournal:
+    """
+    Append-only JSONL checkpoint of replayed evaluations.
+
+    A line is written only after the evaluations it lists are stored in
+    Sheets, so every key in the journal is safe to skip on a rerun.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open the journal, loading the keys already completed.
+
+        Args:
+            path: Journal file; created on first write.
+        """
+        self.path = path
+        self.completed: set[ReplayKey] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from a crash mid-write.
+                        continue
+                    # Lines written before prompt_hash was recorded lack
+                    # it; their keys match no task, so those candidates are
+                    # evaluated again rather than skipped.
+                    self.completed.add(
+                        (
+                            entry["candidate_id"],
+                            entry["job_post_id"],
+                            entry["prompt_version"],
+                            entry.get("prompt_hash"),
+                        )
+                    )
+
+    def record(self, keys: Iterable[ReplayKey]) -> None:
+        """Append completed keys and flush them to disk."""
+        keys = list(keys)
+        lines = [json.dumps(dict(zip(JOURNAL_FIELDS, key))) + "\n" for key in keys]
+        with open(self.path, "a", encoding="utf-8") as journal:
+            journal.writelines(lines)
+            journal.flush()
+            os.fsync(journal.fileno())
+        self.completed.update(keys)
+
+
+class Progress:
+    """Prints completed count, throughput and ETA to stderr."""
+
+    def __init__(
+        self, total: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self._clock = clock
+        self._started = clock()
+
+    def update(self, done: int, failed: int = 0) -> None:
+        """Count finished tasks and print a status line."""
+        self.done += done
+        self.failed += failed
+        elapsed = max(self._clock() - self._started, 1e-9)
+        finished = self.done + self.failed
+        rate = finished / elapsed
+        remaining = self.total - finished
+        eta = remaining / rate if rate else float("inf")
+        print(
+            f"\r{finished}/{self.total} ({self.failed} failed) "
+            f"{rate:.1f}/s ETA {_format_duration(eta)}",
+            end="",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds == float("inf"):
+        return "--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+def _parse_date(value: str) -> datetime:
+    return as_utc(datetime.fromisoformat(value))
 
-def main() -> None:
+
+def select_evaluations(
+    table: ColumnarTable[CandidateEvaluation], filters: ReplayFilters
+) -> list[CandidateEvaluation]:
+    """
+    Build the evaluations a replay needs from a columnar table.
+
+    Filters run on the columns, and models are built only for the matching
+    rows plus the other evaluations of the same candidates and jobs, which
+    deciding the latest evaluation of each pair still needs.
+
+    Args:
+        table: Every row of ``candidates_evaluations``.
+        filters: Which evaluations to replay.
+
+    Returns:
+        The selected evaluations, in sheet order.
+    """
+    matching = table.filter(filters.mask(table))
+    related = table["job_post_id"].isin(set(matching["job_post_id"])) & table[
+        "candidate_id"
+    ].isin(set(matching["candidate_id"]))
+    return table.materialize(related)
+
+
+def load_candidates(
+    table: ColumnarTable[CandidateRaw], candidate_ids: Iterable[str]
+) -> dict[str, CandidateRaw]:
+    """
+    Build the candidates with the given IDs from a columnar table.
+
+    Like ``CandidateRepository``, the first row wins when an ID repeats.
     """
-    Replay candidate processing.
+    selected = table.materialize(table["candidate_id"].isin(candidate_ids))
+    candidates: dict[str, CandidateRaw] = {}
+    for candidate in selected:
+        candidates.setdefault(candidate.candidate_id, candidate)
+    return candidates
+
+
+def plan_tasks(
+    evaluations: Iterable[CandidateEvaluation],
+    candidates: dict[str, CandidateRaw],
+    targets: dict[str, Prompt],
+    filters: ReplayFilters,
+    completed: set[ReplayKey],
+    outdated: Optional[set[tuple[str, str]]] = None,
+) -> list[ReplayTask]:
+    """
+    Turn matching evaluations into replay tasks, one per candidate and job.
+
+    Args:
+        evaluations: Existing evaluations.
+        candidates: Candidates by ID.
+        targets: Prompt to evaluate with, per job post.
+        filters: Which evaluations to replay.
+        completed: Keys already replayed according to the journal.
+        outdated: If given, only these ``(candidate_id, job_post_id)``
+            pairs are replayed, see ``shared.reevaluation``.
 
-    TODO: Parse command line arguments for filtering
-    TODO: Load candidates from Sheets
-    TODO: Re-run evaluation pipeline
-    TODO: Report results
+    Returns:
+        Tasks ordered by job post, so each job's prompt is built once.
     """
-    raise NotImplementedError
+    tasks: dict[ReplayKey, ReplayTask] = {}
+    for evaluation in evaluations:
+        if not filters.matches(evaluation):
+            continue
+        pair = (evaluation.candidate_id, evaluation.job_post_id)
+        if outdated is not None and pair not in outdated:
+            continue
+        prompt = targets.get(evaluation.job_post_id)
+        candidate = candidates.get(evaluation.candidate_id)
+        if prompt is None or candidate is None:
+            continue
+        task = ReplayTask(candidate, prompt)
+        if task.key not in completed:
+            tasks.setdefault(task.key, task)
+    return sorted(tasks.values(), key=lambda task: task.job_post_id)
+
+
+def _chunks(tasks: list[ReplayTask], size: int) -> Iterator[list[ReplayTask]]:
+    """Split tasks into chunks that share a job post and prompt version."""
+    chunk: list[ReplayTask] = []
+    for task in tasks:
+        if chunk and (
+            len(chunk) >= size
+            or (task.job_post_id, task.prompt_version)
+            != (chunk[0].job_post_id, chunk[0].prompt_version)
+        ):
+            yield chunk
+            chunk = []
+        chunk.append(task)
+    if chunk:
+        yield chunk
+
+
+def run_replay(
+    tasks: list[ReplayTask],
+    evaluators: dict[tuple[str, str], CandidateEvaluator],
+    client: SheetsClient,
+    journal: ReplayJournal,
+    chunk_size: int = 100,
+    batch_size: int = 1,
+) -> Progress:
+    """
+    Evaluate tasks chunk by chunk, writing and checkpointing each chunk.
+
+    The requests of a chunk run concurrently on the Gemini client's pool,
+    and the previous chunk is appended and journaled on a writer thread
+    meanwhile. Failed tasks are not journaled, so a rerun retries them.
+
+    Args:
+        tasks: Work to do.
+        evaluators: Evaluator per ``(job_post_id, prompt_version)``.
+        client: Sheets client the evaluations are appended with.
+        journal: Checkpoint of completed tasks.
+        chunk_size: Tasks evaluated per chunk.
+        batch_size: Candidates packed into one Gemini request.
+
+    Returns:
+        The final progress counters.
+    """
+    progress = Progress(len(tasks))
+
+    def store(done: list[tuple[ReplayKey, CandidateEvaluation]]) -> None:
+        client.append_rows(
+            EvaluationRepository.sheet_name,
+            models_to_rows([evaluation for _, evaluation in done]),
+        )
+        journal.record(key for key, _ in done)
+
+    with BackgroundWriter(store) as writer:
+        for chunk in _chunks(tasks, chunk_size):
+            evaluator = evaluators[(chunk[0].job_post_id, chunk[0].prompt_version)]
+            outcomes = evaluator.evaluate_batched(
+                [task.candidate for task in chunk], batch_size
+            )
+            done = [
+                (task.key, outcome)
+                for task, outcome in zip(chunk, outcomes)
+                if isinstance(outcome, CandidateEvaluation)
+            ]
+            if done:
+                writer.submit(done)
+            progress.update(len(done), len(chunk) - len(done))
+    print(file=sys.stderr)
+    return progress
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--job", action="append", help="Job post ID (repeatable)")
+    parser.add_argument("--prompt-version", help="Replay evaluations of this version")
+    parser.add_argument("--since", type=_parse_date, help="Evaluated at or after")
+    parser.add_argument("--until", type=_parse_date, help="Evaluated before")
+    parser.add_argument(
+        "--fit-label",
+        action="append",
+        choices=[label.value for label in FitLabel],
+        help="Fit label (repeatable)",
+    )
+    parser.add_argument(
+        "--target-version",
+        help="Prompt version to evaluate with (default: each job's default)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Replay even candidates already evaluated with the current prompt",
+    )
+    parser.add_argument(
+        "--include-unhashed",
+        action="store_true",
+        help="Treat evaluations without a prompt hash as outdated",
+    )
+    parser.add_argument("--workers", type=int, help="Concurrent Gemini requests")
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only print how many would run"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Replay candidate processing."""
+    args = parse_args(argv)
+    config = get_config()
+    filters = ReplayFilters(
+        job_post_ids=frozenset(args.job) if args.job else None,
+        prompt_version=args.prompt_version,
+        since=args.since,
+        until=args.until,
+        fit_labels=(
+            frozenset(FitLabel(label) for label in args.fit_label)
+            if args.fit_label
+            else None
+        ),
+    )
+
+    client = SheetsClient(config["spreadsheet_id"])
+    snapshots = SheetSnapshotCache(client).get_many(["job_posts", "prompts"])
+    job_posts: dict[str, JobPost] = {
+        job.job_post_id: job for job in snapshots["job_posts"].records
+    }
+    prompts: dict[tuple[str, str], Prompt] = {
+        (p.job_post_id, p.prompt_version): p for p in snapshots["prompts"].records
+    }
+    targets = {}
+    for job_post_id, job in job_posts.items():
+        version = args.target_version or job.default_prompt_version
+        prompt = prompts.get((job_post_id, version))
+        if prompt is None:
+            print(f"No prompt {version!r} for job {job_post_id}", file=sys.stderr)
+        else:
+            targets[job_post_id] = prompt
+    # The two large tabs are read column by column; models are only built
+    # for the evaluations and candidates the filters select.
+    evaluations = select_evaluations(
+        EvaluationRepository(client).read_columnar(), filters
+    )
+    candidates = load_candidates(
+        CandidateRepository(client).read_columnar(),
+        {evaluation.candidate_id for evaluation in evaluations},
+    )
+
+    # Skip candidates whose latest evaluation already used the current prompt.
+    outdated = None
+    if not args.force and not args.target_version:
+        plan = plan_reevaluation(
+            job_posts.values(),
+            prompts.values(),
+            evaluations,
+            include_unhashed=args.include_unhashed,
+        )
+        outdated = {(item.candidate_id, item.job_post_id) for item in plan.items}
+        print(
+            f"{len(plan)} outdated {plan.counts()}, {plan.up_to_date} up to date",
+            file=sys.stderr,
+        )
+
+    journal = ReplayJournal(args.journal)
+    tasks = plan_tasks(
+        evaluations, candidates, targets, filters, journal.completed, outdated
+    )
+
+    print(
+        f"{len(tasks)} evaluations to run, {len(journal.completed)} already done",
+        file=sys.stderr,
+    )
+    if args.dry_run or not tasks:
+        return
+
+    gemini = GeminiClient(
+        config["gemini_model"],
+        max_concurrency=args.workers,
+        cache=response_cache_from_config(config),
+    )
+    evaluators = {}
+    for job_post_id, version in {(t.job_post_id, t.prompt_version) for t in tasks}:
+        job = job_posts[job_post_id]
+        builder = PromptBuilder.from_prompt(
+            targets[job_post_id], config["prompt_token_budget"]
+        )
+        evaluators[(job_post_id, version)] = CandidateEvaluator(
+            gemini, builder, job_post_id, {"job_post_name": job.job_post_name}
+        )
+
+    progress = run_replay(
+        tasks,
+        evaluators,
+        client,
+        journal,
+        chunk_size=args.chunk_size,
+        batch_size=config["evaluation_batch_size"],
+    )
+    print(f"Replayed {progress.done}, failed {progress.failed}", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -19,19 +19,20 @@ import os
 import sys
 from typing import Any
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 # Add parent directory to path to import shared modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from shared.auth import get_credential_provider
 from shared.config import MAIN_SPREADSHEET_ID
+from shared.google_api import get_service
 from shared.schemas import (
     CandidateRaw,
     CandidateEvaluation,
     JobPost,
     Prompt,
+    SyncState,
     Source,
     FitLabel,
     Decision,
@@ -53,24 +54,18 @@ class SpreadsheetSetup:
         """
         self.spreadsheet_id = spreadsheet_id
 
-        if credentials_path:
-            creds = service_account.Credentials.from_service_account_file(
-                credentials_path,
-                scopes=[
-                    "https://www.googleapis.com/auth/spreadsheets",
-                    "https://www.googleapis.com/auth/drive",
-                ],
-            )
-        else:
-            creds = service_account.Credentials.from_service_account_file(
-                os.environ["GOOGLE_APPLICATION_CREDENTIALS"],
-                scopes=[
-                    "https://www.googleapis.com/auth/spreadsheets",
-                    "https://www.googleapis.com/auth/drive",
-                ],
-            )
+        # The key is loaded once per process and its token is shared.
+        provider = get_credential_provider(
+            credentials_path or os.environ["GOOGLE_APPLICATION_CREDENTIALS"]
+        )
+        creds = provider.credentials(
+            [
+                "https://www.googleapis.com/auth/spreadsheets",
+                "https://www.googleapis.com/auth/drive",
+            ]
+        )
 
-        self.sheets_service = build("sheets", "v4", credentials=creds)
+        self.sheets_service = get_service("sheets", "v4", credentials=creds)
 
     def setup_all_sheets(self) -> None:
         """Set up all required sheets in the spreadsheet."""
@@ -101,6 +96,11 @@ class SpreadsheetSetup:
         else:
             print("  ⚠ Sheet 'prompts' already exists, skipping...")
 
+        if "sync_state" not in existing_sheets:
+            self._setup_sheet_sync_state()
+        else:
+            print("  ⚠ Sheet 'sync_state' already exists, skipping...")
+
         print("\n✓ Spreadsheet setup complete!")
 
     def _get_existing_sheets(self) -> list[str]:
@@ -347,6 +347,37 @@ class SpreadsheetSetup:
 
         print(f"  ✓ Created sheet: {sheet_name}")
 
+    def _setup_sheet_sync_state(self) -> None:
+        """Set up sync_state sheet with headers."""
+        sheet_name = "sync_state"
+        fields = list(SyncState.model_fields.keys())
+
+        requests = [
+            {
+                "addSheet": {
+                    "properties": {
+                        "title": sheet_name,
+                        "gridProperties": {"frozenRowCount": 1},
+                    }
+                }
+            }
+        ]
+
+        self.sheets_service.spreadsheets().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={"requests": requests},
+        ).execute()
+
+        # Write headers
+        self.sheets_service.spreadsheets().values().update(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{sheet_name}!A1",
+            valueInputOption="RAW",
+            body={"values": [fields]},
+        ).execute()
+
+        print(f"  ✓ Created sheet: {sheet_name}")
+
     def _get_sheet_id(self, sheet_name: str) -> int:
         """Get the sheet ID for a given sheet name."""
         sheet_metadata = (
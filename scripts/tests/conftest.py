@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Scripts are run directly and are not part of a package.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
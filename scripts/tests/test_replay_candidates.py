@@ -0,0 +1,157 @@
+"""Tests for the replay engine and its journal."""
+
+import json
+from datetime import datetime, timezone
+
+from replay_candidates import (
+    ReplayFilters,
+    ReplayJournal,
+    ReplayTask,
+    plan_tasks,
+    run_replay,
+)
+from shared.schemas import (
+    CandidateEvaluation,
+    CandidateRaw,
+    FitLabel,
+    Prompt,
+    Source,
+)
+from shared.sheets.rows import header_for
+from shared.tests.fake_sheets import FakeSpreadsheet
+
+TAB = "candidates_evaluations"
+
+
+def candidate(number: int) -> CandidateRaw:
+    return CandidateRaw(
+        candidate_id=f"cand-{number}",
+        source=Source.GETONBOARD,
+        source_candidate_id=str(number),
+        created_at=datetime(2024, 5, 1, tzinfo=timezone.utc),
+        full_name=f"Candidate {number}",
+        email=f"candidate{number}@example.com",
+        raw_profile_url=f"https://example.com/{number}",
+    )
+
+
+def evaluation(candidate_id: str, job_post_id: str, **fields) -> CandidateEvaluation:
+    values = {
+        "evaluation_id": f"eval-{candidate_id}-{job_post_id}",
+        "candidate_id": candidate_id,
+        "job_post_id": job_post_id,
+        "prompt_version": "v1",
+        "evaluated_at": datetime(2024, 5, 2, tzinfo=timezone.utc),
+        "fit_label": FitLabel.MAYBE,
+        "fit_score": 3,
+        "reasons": "Some experience",
+    }
+    values.update(fields)
+    return CandidateEvaluation(**values)
+
+
+def prompt(job_post_id: str, version: str = "v2") -> Prompt:
+    return Prompt(
+        job_post_id=job_post_id,
+        prompt_version=version,
+        prompt_content=f"Evaluate for {job_post_id}",
+    )
+
+
+class FakeEvaluator:
+    """Evaluates every candidate except those listed in ``failing``."""
+
+    def __init__(self, job_post_id: str, failing=()) -> None:
+        self.job_post_id = job_post_id
+        self.failing = set(failing)
+        self.calls = []
+
+    def evaluate_batched(self, candidates, batch_size):
+        self.calls.append([c.candidate_id for c in candidates])
+        return [
+            RuntimeError("Gemini failed")
+            if c.candidate_id in self.failing
+            else evaluation(c.candidate_id, self.job_post_id, prompt_version="v2")
+            for c in candidates
+        ]
+
+
+def test_journal_round_trip(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    keys = [("cand-1", "job-1", "v2", "abc"), ("cand-2", "job-1", "v2", "abc")]
+
+    journal = ReplayJournal(path)
+    assert journal.completed == set()
+    journal.record(keys[:1])
+    journal.record(keys[1:])
+
+    assert journal.completed == set(keys)
+    assert ReplayJournal(path).completed == set(keys)
+
+
+def test_journal_loads_old_lines_and_skips_torn_ones(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    old = {"candidate_id": "cand-1", "job_post_id": "job-1", "prompt_version": "v1"}
+    path.write_text(json.dumps(old) + "\n" + '{"candidate_id": "ca', encoding="utf-8")
+
+    journal = ReplayJournal(str(path))
+
+    # Without a prompt_hash the key matches no task, so it is replayed.
+    assert journal.completed == {("cand-1", "job-1", "v1", None)}
+
+
+def test_plan_tasks_applies_filters_and_skips_completed():
+    candidates = {f"cand-{n}": candidate(n) for n in range(1, 5)}
+    evaluations = [
+        evaluation("cand-1", "job-2"),
+        evaluation("cand-1", "job-2", evaluation_id="again"),
+        evaluation("cand-2", "job-1"),
+        evaluation("cand-3", "job-1", fit_label=FitLabel.NO),
+        evaluation("cand-4", "job-1"),
+        evaluation("cand-9", "job-1"),
+    ]
+    targets = {"job-1": prompt("job-1"), "job-2": prompt("job-2")}
+    filters = ReplayFilters(fit_labels=frozenset({FitLabel.MAYBE}))
+    completed = {ReplayTask(candidates["cand-4"], targets["job-1"]).key}
+
+    tasks = plan_tasks(evaluations, candidates, targets, filters, completed)
+
+    # One task per pair, grouped by job; unknown candidates are skipped.
+    assert [(t.candidate.candidate_id, t.job_post_id) for t in tasks] == [
+        ("cand-2", "job-1"),
+        ("cand-1", "job-2"),
+    ]
+    outdated = {("cand-1", "job-2")}
+    tasks = plan_tasks(evaluations, candidates, targets, filters, completed, outdated)
+    assert [t.candidate.candidate_id for t in tasks] == ["cand-1"]
+
+
+def test_run_replay_writes_and_journals_chunks_and_resumes(tmp_path):
+    sheet = FakeSpreadsheet({TAB: [header_for(CandidateEvaluation)]})
+    path = str(tmp_path / "journal.jsonl")
+    targets = {"job-1": prompt("job-1"), "job-2": prompt("job-2")}
+    tasks = [ReplayTask(candidate(n), targets["job-1"]) for n in range(1, 6)]
+    tasks.append(ReplayTask(candidate(6), targets["job-2"]))
+    evaluators = {
+        ("job-1", "v2"): FakeEvaluator("job-1", failing={"cand-3"}),
+        ("job-2", "v2"): FakeEvaluator("job-2"),
+    }
+
+    progress = run_replay(
+        tasks, evaluators, sheet.client(), ReplayJournal(path), chunk_size=2
+    )
+
+    assert (progress.done, progress.failed) == (5, 1)
+    # Chunks never mix jobs.
+    assert evaluators[("job-1", "v2")].calls == [
+        ["cand-1", "cand-2"],
+        ["cand-3", "cand-4"],
+        ["cand-5"],
+    ]
+    written = [row[1] for row in sheet.tabs[TAB][1:]]
+    assert sorted(written) == ["cand-1", "cand-2", "cand-4", "cand-5", "cand-6"]
+
+    # A rerun only has the failed task left.
+    journal = ReplayJournal(path)
+    remaining = [task for task in tasks if task.key not in journal.completed]
+    assert [task.candidate.candidate_id for task in remaining] == ["cand-3"]
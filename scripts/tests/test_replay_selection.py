@@ -0,0 +1,139 @@
+"""Tests for selecting replayed evaluations from columnar tables."""
+
+from datetime import datetime, timezone
+
+from replay_candidates import (
+    ReplayFilters,
+    load_candidates,
+    plan_tasks,
+    select_evaluations,
+)
+from shared.schemas import (
+    CandidateEvaluation,
+    CandidateRaw,
+    FitLabel,
+    Prompt,
+    Source,
+)
+from shared.sheets import CandidateRepository, EvaluationRepository
+from shared.sheets.rows import header_for, model_to_row
+from shared.tests.fake_sheets import FakeSpreadsheet
+
+
+def evaluation(number: int, candidate_id: str, **fields) -> CandidateEvaluation:
+    values = {
+        "evaluation_id": f"eval-{number}",
+        "candidate_id": candidate_id,
+        "job_post_id": "job-1",
+        "prompt_version": "v1",
+        "evaluated_at": datetime(2024, 5, number, tzinfo=timezone.utc),
+        "fit_label": FitLabel.MAYBE,
+        "fit_score": 3,
+        "reasons": "Some experience",
+    }
+    values.update(fields)
+    return CandidateEvaluation(**values)
+
+
+def candidate(number: int, **fields) -> CandidateRaw:
+    values = {
+        "candidate_id": f"cand-{number}",
+        "source": Source.GETONBOARD,
+        "source_candidate_id": str(number),
+        "created_at": datetime(2024, 5, 1, tzinfo=timezone.utc),
+        "full_name": f"Candidate {number}",
+        "email": f"candidate{number}@example.com",
+        "raw_profile_url": f"https://example.com/{number}",
+    }
+    values.update(fields)
+    return CandidateRaw(**values)
+
+
+EVALUATIONS = [
+    evaluation(1, "cand-1"),
+    evaluation(2, "cand-1", fit_label=FitLabel.YES),
+    evaluation(3, "cand-2", job_post_id="job-2"),
+    evaluation(4, "cand-3", prompt_version="v2"),
+    evaluation(5, "cand-4", fit_label=FitLabel.NO),
+]
+
+
+def spreadsheet() -> FakeSpreadsheet:
+    candidates = [candidate(n) for n in range(1, 5)]
+    candidates.append(candidate(9, candidate_id="cand-1", full_name="Duplicate"))
+    return FakeSpreadsheet(
+        {
+            "candidates_evaluations": [header_for(CandidateEvaluation)]
+            + [model_to_row(e) for e in EVALUATIONS],
+            "candidates_raw": [header_for(CandidateRaw)]
+            + [model_to_row(c) for c in candidates],
+        }
+    )
+
+
+def test_mask_agrees_with_matches():
+    table = EvaluationRepository(spreadsheet().client()).read_columnar()
+    filters_list = [
+        ReplayFilters(),
+        ReplayFilters(job_post_ids=frozenset({"job-2"})),
+        ReplayFilters(prompt_version="v2"),
+        ReplayFilters(since=datetime(2024, 5, 2, tzinfo=timezone.utc)),
+        ReplayFilters(until=datetime(2024, 5, 3, tzinfo=timezone.utc)),
+        ReplayFilters(
+            fit_labels=frozenset({FitLabel.MAYBE}),
+            since=datetime(2024, 5, 2, tzinfo=timezone.utc),
+        ),
+    ]
+
+    for filters in filters_list:
+        expected = [i for i, e in enumerate(EVALUATIONS) if filters.matches(e)]
+        assert filters.mask(table).indices() == expected
+
+
+def test_select_keeps_the_history_of_matching_pairs_only():
+    table = EvaluationRepository(spreadsheet().client()).read_columnar()
+    filters = ReplayFilters(fit_labels=frozenset({FitLabel.MAYBE}), prompt_version="v1")
+
+    selected = select_evaluations(table, filters)
+
+    # cand-1's later "yes" evaluation is kept to find its latest evaluation;
+    # cand-3 (v2) and cand-4 (no) are never built.
+    assert [e.evaluation_id for e in selected] == ["eval-1", "eval-2", "eval-3"]
+
+
+def test_load_candidates_builds_only_the_requested_ones():
+    table = CandidateRepository(spreadsheet().client()).read_columnar()
+
+    candidates = load_candidates(table, {"cand-1", "cand-2"})
+
+    assert sorted(candidates) == ["cand-1", "cand-2"]
+    # First row wins, like the repository index.
+    assert candidates["cand-1"].full_name == "Candidate 1"
+
+
+def test_selected_models_plan_the_same_tasks():
+    client = spreadsheet().client()
+    filters = ReplayFilters(fit_labels=frozenset({FitLabel.MAYBE}))
+    evaluations = select_evaluations(
+        EvaluationRepository(client).read_columnar(), filters
+    )
+    candidates = load_candidates(
+        CandidateRepository(client).read_columnar(),
+        {e.candidate_id for e in evaluations},
+    )
+    targets = {
+        job: Prompt(
+            job_post_id=job,
+            prompt_version="v3",
+            prompt_content="Evaluate {{candidate_name}}",
+        )
+        for job in ("job-1", "job-2")
+    }
+
+    tasks = plan_tasks(evaluations, candidates, targets, filters, set())
+
+    assert [(t.candidate.candidate_id, t.job_post_id) for t in tasks] == [
+        ("cand-1", "job-1"),
+        ("cand-3", "job-1"),
+        ("cand-2", "job-2"),
+    ]
@@ -2,4 +2,31 @@
 Shared package for AI Hiring MVP.
 
 Contains common utilities, clients, and schemas used across Cloud Functions.
+
+Submodules are loaded on first access (``shared.sheets``, ``shared.llm``,
+...), so importing the package itself costs nothing at cold start.
 """
+
+from shared.lazy import lazy_exports
+
+_SUBMODULES = (
+    "auth",
+    "columnar",
+    "config",
+    "google_api",
+    "llm",
+    "logging",
+    "metrics",
+    "pipeline",
+    "profiling",
+    "reevaluation",
+    "schemas",
+    "sheets",
+    "sync_state",
+)
+
+__getattr__, __dir__ = lazy_exports(
+    __name__, {name: f"{__name__}.{name}" for name in _SUBMODULES}
+)
+
+__all__ = list(_SUBMODULES)
@@ -0,0 +1,222 @@
+"""
+Process-wide Google credentials and access-token cache.
+
+Minting an OAuth access token costs a round trip of 100-300 ms. Every Google
+client in the project (Sheets and Drive services, Vertex AI, the setup
+script) takes its credentials from one ``CredentialProvider``, which:
+
+- loads the service-account key (or application default credentials) once;
+- keeps one credentials object per set of scopes, so its access token is
+  reused until shortly before it expires;
+- renews tokens ``refresh_margin_seconds`` before expiry, ahead of
+  google-auth's own refresh threshold.
+
+Renewal happens in two places. A background thread wakes up when a token
+enters the margin; on Cloud Functions, however, CPU is throttled outside of
+requests, so that thread may only get to run once the next request arrives.
+As a backstop, ``credentials()`` itself renews a token that is within the
+margin before returning it, so a caller never receives a token about to
+expire; in the worst case a request pays for that one refresh.
+
+``google.auth`` is imported on first use.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from shared.logging import get_logger
+
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+
+# Refresh this long before a token expires. google-auth itself refreshes
+# inside the last 3m45s, so tokens are renewed before it would block.
+DEFAULT_REFRESH_MARGIN_SECONDS = 300
+
+# Retry delay after a failed background refresh.
+RETRY_SECONDS = 30
+
+logger = get_logger(__name__)
+
+
+def _utcnow() -> datetime:
+    """Naive UTC now, comparable with google-auth ``expiry`` values."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class CredentialProvider:
+    """
+    Shared credentials with cached, proactively refreshed access tokens.
+
+    Example:
+        provider = get_credential_provider()
+        creds = provider.credentials(SHEETS_SCOPES)
+        service = build("sheets", "v4", credentials=creds)
+    """
+
+    def __init__(
+        self,
+        credentials_path: Optional[str] = None,
+        refresh_margin_seconds: int = DEFAULT_REFRESH_MARGIN_SECONDS,
+        background_refresh: bool = True,
+    ) -> None:
+        """
+        Initialize the provider; nothing is loaded until first use.
+
+        Args:
+            credentials_path: Service-account JSON key. Application default
+                credentials are used when omitted.
+            refresh_margin_seconds: How long before expiry a token is
+                renewed.
+            background_refresh: Renew tokens on a daemon thread. When off,
+                tokens are renewed by the caller of ``credentials``/``token``.
+        """
+        self.credentials_path = credentials_path
+        self.refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self.background_refresh = background_refresh
+        self.project_id: Optional[str] = None
+        self._base: Optional[Any] = None
+        self._scoped: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        # Keyed by credentials object: unscoped credentials (e.g. on Cloud
+        # Functions) are shared by every scope set and refreshed once.
+        self._refresh_locks: dict[int, threading.Lock] = {}
+        self._wakeup = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._request: Optional[Any] = None
+
+    def _load_base(self) -> Any:
+        """Load the key or the default credentials once (caller holds the lock)."""
+        if self._base is None:
+            import google.auth
+            from google.auth.transport.requests import Request
+
+            if self.credentials_path:
+                from google.oauth2 import service_account
+
+                self._base = service_account.Credentials.from_service_account_file(
+                    self.credentials_path
+                )
+                self.project_id = self._base.project_id
+            else:
+                self._base, self.project_id = google.auth.default()
+            self._request = Request()
+        return self._base
+
+    def credentials(self, scopes: Any) -> Any:
+        """
+        Return the shared credentials for ``scopes`` with a valid token.
+
+        The first call per scope set mints a token; later calls return the
+        same object. If its token is within ``refresh_margin_seconds`` of
+        expiry (the background thread may not have run, see the module
+        docstring), it is renewed here before returning.
+
+        Args:
+            scopes: OAuth scopes.
+
+        Returns:
+            ``google.auth`` credentials usable by any Google client.
+        """
+        key = tuple(sorted(scopes))
+        with self._lock:
+            creds = self._scoped.get(key)
+            if creds is None:
+                from google.auth.credentials import with_scopes_if_required
+
+                creds = with_scopes_if_required(self._load_base(), list(key))
+                self._scoped[key] = creds
+                self._refresh_locks.setdefault(id(creds), threading.Lock())
+        if self._needs_refresh(creds, _utcnow()):
+            self._refresh(key)
+        if self.background_refresh:
+            self._start_background()
+        return creds
+
+    def token(self, scopes: Any) -> str:
+        """Return a valid access token for ``scopes``."""
+        return self.credentials(scopes).token
+
+    def _needs_refresh(self, creds: Any, now: datetime) -> bool:
+        if not creds.token:
+            return True
+        # Tokens without an expiry (e.g. some test credentials) never expire.
+        return creds.expiry is not None and creds.expiry - self.refresh_margin <= now
+
+    def _refresh(self, key: tuple[str, ...]) -> None:
+        """Renew one token; concurrent callers wait for a single refresh."""
+        creds = self._scoped[key]
+        with self._refresh_locks[id(creds)]:
+            if self._needs_refresh(creds, _utcnow()):
+                creds.refresh(self._request)
+        with self._lock:
+            self._wakeup.notify()
+
+    def _start_background(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._refresh_loop, name="credential-refresh", daemon=True
+                )
+                self._thread.start()
+
+    def _next_refresh(self) -> Optional[datetime]:
+        """Earliest time a token is due (caller holds the lock)."""
+        due = [
+            creds.expiry - self.refresh_margin
+            for creds in self._scoped.values()
+            if creds.expiry is not None
+        ]
+        return min(due) if due else None
+
+    def _refresh_loop(self) -> None:
+        """Renew tokens as they enter the margin, whenever the thread runs."""
+        while True:
+            with self._lock:
+                while True:
+                    due = self._next_refresh()
+                    now = _utcnow()
+                    if due is not None and due <= now:
+                        break
+                    timeout = (due - now).total_seconds() if due else None
+                    self._wakeup.wait(timeout)
+                keys = [
+                    key
+                    for key, creds in self._scoped.items()
+                    if self._needs_refresh(creds, now)
+                ]
+            for key in keys:
+                try:
+                    self._refresh(key)
+                except Exception:
+                    # The token is still valid for refresh_margin; retry soon,
+                    # and google-auth refreshes on use if it does run out.
+                    logger.warning("Background token refresh failed", exc_info=True)
+                    with self._lock:
+                        self._wakeup.wait(RETRY_SECONDS)
+
+
+# Per-process providers keyed by key file (None: default credentials).
+_providers: dict[Optional[str], CredentialProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_credential_provider(
+    credentials_path: Optional[str] = None,
+) -> CredentialProvider:
+    """
+    Return the process-wide provider for a key file.
+
+    Args:
+        credentials_path: Service-account JSON key; application default
+            credentials when omitted.
+
+    Returns:
+        The shared provider, created on first use.
+    """
+    with _providers_lock:
+        provider = _providers.get(credentials_path)
+        if provider is None:
+            provider = CredentialProvider(credentials_path)
+            _providers[credentials_path] = provider
+        return provider
@@ -0,0 +1,471 @@
+"""
+Columnar in-memory tables of sheet records.
+
+A ``ColumnarTable`` keeps each field of a tab in one column instead of one
+Pydantic object per row: enums are stored as small-int codes, datetimes as
+epoch microseconds and booleans and integers in typed ``array`` columns,
+while repeated strings share a single object. Filters compare columns
+directly and combine as masks, and models are only built for the rows a
+caller asks for.
+
+Example:
+    table = ColumnarTable.from_sheet_rows(CandidateEvaluation, rows)
+    mask = (
+        (table["fit_score"] >= 4)
+        & (table["decision"] == Decision.PUSH)
+        & table["teamtailor_status"].isin([TeamtailorStatus.NOT_SENT])
+    )
+    evaluations = table.materialize(mask)
+"""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from shared.schemas import get_row_codec, unwrap_optional
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Stored in place of None in typed columns.
+NULL_CODE = -1
+NULL_INT = -(2**63)
+
+
+def to_epoch_us(value: datetime) -> int:
+    """Microseconds since the epoch; naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(value: int, naive: bool = False) -> datetime:
+    """
+    Datetime from microseconds since the epoch.
+
+    Args:
+        value: Microseconds since the epoch.
+        naive: Return a naive datetime (in UTC) instead of an aware one.
+    """
+    result = EPOCH + timedelta(microseconds=value)
+    return result.replace(tzinfo=None) if naive else result
+
+
+class Mask:
+    """
+    Row selection of a table, one byte per row.
+
+    Combine masks with ``&``, ``|`` and ``~``.
+    """
+
+    __slots__ = ("flags",)
+
+    def __init__(self, flags: Union[bytes, bytearray]) -> None:
+        self.flags = bytes(flags)
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    def _combine(self, other: "Mask", op: str) -> "Mask":
+        if len(other) != len(self):
+            raise ValueError("Masks of different lengths")
+        size = len(self.flags)
+        left = int.from_bytes(self.flags, "little")
+        right = int.from_bytes(other.flags, "little")
+        value = left & right if op == "&" else left | right
+        return Mask(value.to_bytes(size, "little"))
+
+    def __and__(self, other: "Mask") -> "Mask":
+        return self._combine(other, "&")
+
+    def __or__(self, other: "Mask") -> "Mask":
+        return self._combine(other, "|")
+
+    def __invert__(self) -> "Mask":
+        return Mask(self.flags.translate(bytes([1, 0]) + bytes(254)))
+
+    def count(self) -> int:
+        """Number of selected rows."""
+        return self.flags.count(1)
+
+    def indices(self) -> list[int]:
+        """Positions of the selected rows."""
+        flags = self.flags
+        positions = []
+        start = flags.find(1)
+        while start != -1:
+            positions.append(start)
+            start = flags.find(1, start + 1)
+        return positions
+
+
+class Column:
+    """
+    One field of a table, compared against plain Python values.
+
+    Comparisons translate the right-hand side into the stored encoding once
+    (enum -> code, datetime -> epoch microseconds) and scan the raw column.
+    Null cells never match an ordering comparison.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        data: Any,
+        encode: Callable[[Any], Any],
+        decode: Callable[[Any], list[Any]],
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.data = data
+        self._encode = encode
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.values())
+
+    def values(self) -> list[Any]:
+        """Decoded values of the column."""
+        return self._decode(self.data)
+
+    def _null(self) -> Any:
+        if self.kind in ("enum", "bool"):
+            return NULL_CODE
+        if self.kind in ("int", "datetime"):
+            return NULL_INT
+        return None
+
+    def _mask(self, test: Any) -> Mask:
+        return Mask(bytes(map(test, self.data)))
+
+    def __eq__(self, value: Any) -> Mask:  # type: ignore[override]
+        encoded = self._encode(value)
+        return self._mask(lambda v: v == encoded)
+
+    def __ne__(self, value: Any) -> Mask:  # type: ignore[override]
+        encoded = self._encode(value)
+        return self._mask(lambda v: v != encoded)
+
+    def _ordered(self, value: Any, test: Any) -> Mask:
+        if self.kind == "enum":
+            raise TypeError(f"Column {self.name} is not ordered")
+        encoded = self._encode(value)
+        null = self._null()
+        return self._mask(lambda v: v != null and test(v, encoded))
+
+    def __ge__(self, value: Any) -> Mask:
+        return self._ordered(value, lambda v, e: v >= e)
+
+    def __gt__(self, value: Any) -> Mask:
+        return self._ordered(value, lambda v, e: v > e)
+
+    def __le__(self, value: Any) -> Mask:
+        return self._ordered(value, lambda v, e: v <= e)
+
+    def __lt__(self, value: Any) -> Mask:
+        return self._ordered(value, lambda v, e: v < e)
+
+    def isin(self, values: Iterable[Any]) -> Mask:
+        """Rows whose value is one of ``values``."""
+        encoded = {self._encode(value) for value in values}
+        return self._mask(lambda v: v in encoded)
+
+    def isnull(self) -> Mask:
+        """Rows with an empty cell."""
+        null = self._null()
+        return self._mask(lambda v: v == null)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class ColumnarTable(Generic[ModelT]):
+    """
+    Records of one tab stored column by column.
+
+    Build it with ``from_sheet_rows`` (straight from cell values, without
+    intermediate models) or ``from_models``. Tables are read-only; ``take``
+    and ``filter`` return new tables.
+
+    Datetimes come back as the same instant in UTC; naive ones, flagged per
+    row, come back naive.
+    """
+
+    def __init__(
+        self,
+        model: type[ModelT],
+        columns: dict[str, Any],
+        row_numbers: Optional[array] = None,
+        naive: Optional[dict[str, array]] = None,
+    ) -> None:
+        """
+        Wrap encoded columns; use the ``from_*`` constructors instead.
+
+        Args:
+            model: The schema model of the tab.
+            columns: Field name -> encoded column, every field present.
+            row_numbers: 1-based sheet row of each record, if known.
+            naive: Datetime field -> one flag per row, set where the value
+                was naive; only for fields holding naive values.
+        """
+        self.model = model
+        self._codec = get_row_codec(model)
+        self._kinds = {name: _kind_of(model, name) for name in model.model_fields}
+        self._enums = {
+            name: list(unwrap_optional(field.annotation))
+            for name, field in model.model_fields.items()
+            if self._kinds[name] == "enum"
+        }
+        self._columns = columns
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Columns of different lengths")
+        self._length = lengths.pop() if lengths else 0
+        self.row_numbers = row_numbers
+        self._naive = naive or {}
+
+    @classmethod
+    def from_sheet_rows(
+        cls,
+        model: type[ModelT],
+        rows: list[list[Any]],
+        first_row: int = 1,
+    ) -> "ColumnarTable[ModelT]":
+        """
+        Encode the rows of a whole tab, header row included.
+
+        Args:
+            model: The schema model of the tab.
+            rows: All rows of the tab; the first one is the header.
+            first_row: Sheet row of ``rows[0]``.
+
+        Returns:
+            A table of the non-empty data rows, with their row numbers.
+        """
+        codec = get_row_codec(model)
+        header = rows[0] if rows else []
+        positions = {name: i for i, name in enumerate(header)}
+        data = []
+        row_numbers = array("l")
+        for offset, row in enumerate(rows[1:], start=first_row + 1):
+            if any(row):
+                data.append(row)
+                row_numbers.append(offset)
+
+        columns = {}
+        naive = {}
+        for name in model.model_fields:
+            builder = _ColumnBuilder(model, name)
+            index = positions.get(name)
+            for row in data:
+                cell = row[index] if index is not None and index < len(row) else ""
+                builder.append(codec.parse_cell(name, cell))
+            columns[name] = builder.data
+            if builder.has_naive:
+                naive[name] = builder.naive
+        return cls(model, columns, row_numbers, naive)
+
+    @classmethod
+    def from_models(cls, records: Iterable[ModelT]) -> "ColumnarTable[ModelT]":
+        """Encode existing models, e.g. to compact a loaded repository."""
+        records = list(records)
+        if not records:
+            raise ValueError("Cannot infer the model of an empty record list")
+        model = type(records[0])
+        columns = {}
+        naive = {}
+        for name in model.model_fields:
+            builder = _ColumnBuilder(model, name)
+            for record in records:
+                builder.append(getattr(record, name))
+            columns[name] = builder.data
+            if builder.has_naive:
+                naive[name] = builder.naive
+        return cls(model, columns, naive=naive)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, name: str) -> Column:
+        if name not in self._columns:
+            raise KeyError(f"Unknown field for {self.model.__name__}: {name}")
+        return Column(
+            name,
+            self._kinds[name],
+            self._columns[name],
+            self._encoder(name),
+            self._decoder(name, self._naive.get(name)),
+        )
+
+    def _encoder(self, name: str) -> Callable[[Any], Any]:
+        kind = self._kinds[name]
+        if kind == "enum":
+            members = self._enums[name]
+            lookup = {member: i for i, member in enumerate(members)}
+            lookup.update({member.value: i for i, member in enumerate(members)})
+
+            def encode_enum(value: Any) -> int:
+                if value is None:
+                    return NULL_CODE
+                if value not in lookup:
+                    raise ValueError(f"Invalid value for {name}: {value!r}")
+                return lookup[value]
+
+            return encode_enum
+        if kind == "datetime":
+            return lambda value: NULL_INT if value is None else to_epoch_us(value)
+        if kind == "bool":
+            return lambda value: NULL_CODE if value is None else int(bool(value))
+        if kind == "int":
+            return lambda value: NULL_INT if value is None else int(value)
+        return lambda value: value
+
+    def _decoder(
+        self, name: str, naive: Optional[Sequence[int]] = None
+    ) -> Callable[[Any], list[Any]]:
+        """Decoder of a column; ``naive`` holds the flags of the rows it gets."""
+        kind = self._kinds[name]
+        if kind == "enum":
+            members = self._enums[name]
+            return lambda data: [None if v == NULL_CODE else members[v] for v in data]
+        if kind == "datetime":
+            if naive is None:
+                return lambda data: [
+                    None if v == NULL_INT else from_epoch_us(v) for v in data
+                ]
+            return lambda data: [
+                None if v == NULL_INT else from_epoch_us(v, bool(flag))
+                for v, flag in zip(data, naive)
+            ]
+        if kind == "bool":
+            return lambda data: [None if v == NULL_CODE else bool(v) for v in data]
+        if kind == "int":
+            return lambda data: [None if v == NULL_INT else v for v in data]
+        return list
+
+    def take(self, positions: Iterable[int]) -> "ColumnarTable[ModelT]":
+        """New table with the rows at ``positions``, in that order."""
+        positions = list(positions)
+        columns = {}
+        for name, data in self._columns.items():
+            taken = [data[p] for p in positions]
+            if isinstance(data, array):
+                taken = array(data.typecode, taken)
+            columns[name] = taken
+        row_numbers = None
+        if self.row_numbers is not None:
+            row_numbers = array("l", [self.row_numbers[p] for p in positions])
+        naive = {
+            name: array("b", [flags[p] for p in positions])
+            for name, flags in self._naive.items()
+        }
+        return ColumnarTable(self.model, columns, row_numbers, naive)
+
+    def filter(self, mask: Mask) -> "ColumnarTable[ModelT]":
+        """New table with the rows selected by ``mask``."""
+        return self.take(self._check(mask).indices())
+
+    def _check(self, mask: Mask) -> Mask:
+        if len(mask) != self._length:
+            raise ValueError("Mask does not match the table length")
+        return mask
+
+    def materialize(
+        self, selection: Union[Mask, Iterable[int], None] = None
+    ) -> list[ModelT]:
+        """
+        Build models for some or all rows.
+
+        Args:
+            selection: A mask or row positions; defaults to every row.
+
+        Returns:
+            One model per selected row.
+        """
+        if selection is None:
+            positions = range(self._length)
+        elif isinstance(selection, Mask):
+            positions = self._check(selection).indices()
+        else:
+            positions = list(selection)
+        columns = {}
+        for name, data in self._columns.items():
+            flags = self._naive.get(name)
+            if flags is not None:
+                flags = [flags[p] for p in positions]
+            decode = self._decoder(name, flags)
+            columns[name] = decode([data[p] for p in positions])
+        return self._codec.construct_columns(columns, len(positions))
+
+    def row(self, position: int) -> ModelT:
+        """Build the model of a single row."""
+        return self.materialize([position])[0]
+
+
+def _kind_of(model: type[BaseModel], name: str) -> str:
+    annotation = unwrap_optional(model.model_fields[name].annotation)
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return "enum"
+    if annotation is datetime:
+        return "datetime"
+    if annotation is bool:
+        return "bool"
+    if annotation is int:
+        return "int"
+    return "object"
+
+
+class _ColumnBuilder:
+    """Accumulates parsed values of one field into its encoded column."""
+
+    def __init__(self, model: type[BaseModel], name: str) -> None:
+        self.kind = _kind_of(model, name)
+        # Datetime columns flag the rows whose value was naive.
+        self.naive = array("b")
+        self.has_naive = False
+        if self.kind == "enum":
+            members = list(unwrap_optional(model.model_fields[name].annotation))
+            self._codes = {member: i for i, member in enumerate(members)}
+            self.data: Any = array("b")
+        elif self.kind == "bool":
+            self.data = array("b")
+        elif self.kind in ("int", "datetime"):
+            self.data = array("q")
+        else:
+            # Repeated values (job IDs, prompt versions) share one object.
+            self._interned: dict[Any, Any] = {}
+            self.data = []
+
+    def append(self, value: Any) -> None:
+        kind = self.kind
+        if kind == "enum":
+            self.data.append(NULL_CODE if value is None else self._codes[value])
+        elif kind == "bool":
+            self.data.append(NULL_CODE if value is None else int(value))
+        elif kind == "int":
+            self.data.append(NULL_INT if value is None else value)
+        elif kind == "datetime":
+            self.data.append(NULL_INT if value is None else to_epoch_us(value))
+            is_naive = value is not None and value.tzinfo is None
+            self.naive.append(is_naive)
+            self.has_naive = self.has_naive or is_naive
+        else:
+            self.data.append(self._interned.setdefault(value, value))
@@ -21,9 +21,66 @@ def get_config() -> dict:
             - spreadsheet_id: Main Google Spreadsheet ID
             - project_id: GCP project ID (from env or default)
             - region: GCP region (from env or default)
+            - sheets_cache_ttl_seconds: Lifetime of in-process tab snapshots
+            - gemini_model: Gemini model name
+            - gemini_max_concurrency: Parallel Gemini requests per instance
+            - gemini_requests_per_minute: Gemini quota to stay under
+            - llm_cache_path: SQLite file for cached LLM responses (empty
+              keeps the cache in memory only)
+            - llm_cache_max_memory_bytes: Size of the in-memory LLM cache tier
+            - llm_cache_max_bytes: Size of the values kept in the SQLite file;
+              the oldest entries are evicted beyond it
+            - llm_cache_ttl_seconds: Age after which a cached LLM response in
+              the SQLite file expires (0 keeps entries until evicted)
+            - prompt_token_budget: Default estimated input-token limit of a
+              built evaluation prompt
+            - evaluation_batch_size: Candidates packed into one Gemini request
+              (1 disables batch prompting)
+            - getonboard_api_key: GetOnBoard API key
+            - sync_state_backend: Where ingestion cursors live, "sheet" (the
+              sync_state tab) or "file"
+            - sync_state_path: JSON file used by the "file" backend
+            - teamtailor_api_key: TeamTailor API key
+            - teamtailor_max_concurrency: Parallel TeamTailor requests per push
+            - log_level: Minimum level of loggers from ``shared.logging``
+            - profiling_enabled: Whether requests may ask for a profile of
+              their invocation (see ``shared.profiling``); off by default
+            - profile_dir: Directory profiles are written to (empty uses the
+              system temp directory)
     """
     return {
         "spreadsheet_id": os.getenv("SPREADSHEET_ID", MAIN_SPREADSHEET_ID),
         "project_id": os.getenv("GCP_PROJECT_ID", ""),
         "region": os.getenv("GCP_REGION", "us-central1"),
+        "sheets_cache_ttl_seconds": float(
+            os.getenv("SHEETS_CACHE_TTL_SECONDS", "300")
+        ),
+        "gemini_model": os.getenv("GEMINI_MODEL", "gemini-pro"),
+        "gemini_max_concurrency": int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+        "gemini_requests_per_minute": float(
+            os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60")
+        ),
+        "llm_cache_path": os.getenv("LLM_CACHE_PATH", ""),
+        "llm_cache_max_memory_bytes": int(
+            os.getenv("LLM_CACHE_MAX_MEMORY_BYTES", str(32 * 1024 * 1024))
+        ),
+        "llm_cache_max_bytes": int(
+            os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        ),
+        "llm_cache_ttl_seconds": float(
+            os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))
+        ),
+        "prompt_token_budget": int(os.getenv("PROMPT_TOKEN_BUDGET", "8000")),
+        "evaluation_batch_size": int(os.getenv("EVALUATION_BATCH_SIZE", "1")),
+        "getonboard_api_key": os.getenv("GETONBOARD_API_KEY", ""),
+        "sync_state_backend": os.getenv("SYNC_STATE_BACKEND", "sheet"),
+        "sync_state_path": os.getenv("SYNC_STATE_PATH", "sync_state.json"),
+        "teamtailor_api_key": os.getenv("TEAMTAILOR_API_KEY", ""),
+        "teamtailor_max_concurrency": int(
+            os.getenv("TEAMTAILOR_MAX_CONCURRENCY", "8")
+        ),
+        "log_level": os.getenv("LOG_LEVEL", "INFO").upper(),
+        "profiling_enabled": os.getenv("PROFILING_ENABLED", "false").lower()
+        in ("1", "true", "yes"),
+        "profile_dir": os.getenv("PROFILE_DIR", ""),
     }
@@ -0,0 +1,209 @@
+"""
+Process-wide Google API credentials and service resources.
+
+Building a discovery-based client means resolving credentials, loading the
+API's discovery document and turning it into a resource tree; repeated per
+request, that dominates the latency of rarely-triggered functions. Here each
+piece is created once per process and reused across warm invocations:
+
+- credentials come from the shared ``CredentialProvider`` (``shared.auth``),
+  which caches access tokens and refreshes them ahead of expiry; a cached
+  service checks them on every ``get_service`` call, so a token the
+  background thread did not get to renew is renewed before it is used;
+- discovery documents come from the copies bundled with
+  ``google-api-python-client`` (static discovery, no network round trip) and
+  are kept in memory;
+- service resources are built once per process and shared by all threads.
+  The ``httplib2`` transport underneath them is not thread-safe, so each
+  service sends through a ``_ThreadLocalHttp`` that gives every thread its
+  own authorized connection; a thread pool started per request therefore
+  costs a connection per thread, not a rebuilt resource tree.
+
+Requests made through these services are counted and timed in
+``shared.metrics`` (calls, bytes sent and received, latency per API).
+
+``googleapiclient`` and ``google.auth`` are imported on first use, so merely
+importing this module stays cheap.
+"""
+
+import threading
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from shared.auth import get_credential_provider
+from shared.metrics import incr, span
+
+# Scopes covering everything the Cloud Functions do through Google APIs.
+DEFAULT_SCOPES = (
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive.metadata.readonly",
+)
+
+_lock = threading.Lock()
+_documents: dict[tuple[str, str], str] = {}
+_services: dict[tuple[Any, ...], Any] = {}
+_request_class: Optional[type] = None
+
+
+def get_credentials(scopes: tuple[str, ...] = DEFAULT_SCOPES) -> Any:
+    """
+    Return application default credentials for ``scopes``.
+
+    Args:
+        scopes: OAuth scopes the credentials are requested for.
+
+    Returns:
+        The shared credentials of ``shared.auth``, whose token is cached
+        and refreshed in the background.
+    """
+    return get_credential_provider().credentials(scopes)
+
+
+def get_discovery_document(api: str, version: str) -> Optional[str]:
+    """
+    Return the discovery document of an API, loaded once per process.
+
+    Returns:
+        The document bundled with ``google-api-python-client``, or None if
+        the installed version does not ship one.
+    """
+    key = (api, version)
+    with _lock:
+        if key not in _documents:
+            from googleapiclient import discovery_cache
+
+            _documents[key] = discovery_cache.get_static_doc(api, version)
+        return _documents[key]
+
+
+def get_service(
+    api: str,
+    version: str,
+    scopes: tuple[str, ...] = DEFAULT_SCOPES,
+    credentials: Optional[Any] = None,
+) -> Any:
+    """
+    Return the process-wide service resource for ``api``.
+
+    Safe to share between threads: requests go through a transport holding
+    one connection per thread (see ``_ThreadLocalHttp``).
+
+    Args:
+        api: API name, e.g. ``"sheets"``.
+        version: API version, e.g. ``"v4"``.
+        scopes: Scopes of the default credentials used when ``credentials``
+            is omitted.
+        credentials: Explicit credentials; services built with them are
+            cached separately from those using the defaults.
+
+    Returns:
+        A ``googleapiclient`` resource.
+    """
+    key = (api, version, id(credentials) if credentials else tuple(sorted(scopes)))
+    with _lock:
+        service = _services.get(key)
+    if service is not None:
+        if credentials is None:
+            # The service holds the shared credentials object; this renews
+            # its token here if it is within the refresh margin.
+            get_credentials(scopes)
+        return service
+
+    from googleapiclient.discovery import build, build_from_document
+
+    if credentials is None:
+        credentials = get_credentials(scopes)
+    document = get_discovery_document(api, version)
+    http = _ThreadLocalHttp(credentials)
+    request_class = _instrumented_request_class()
+    if document is not None:
+        service = build_from_document(
+            document, http=http, requestBuilder=request_class
+        )
+    else:
+        service = build(
+            api,
+            version,
+            http=http,
+            cache_discovery=False,
+            requestBuilder=request_class,
+        )
+    with _lock:
+        # Another thread may have built it meanwhile; keep the first.
+        return _services.setdefault(key, service)
+
+
+class _ThreadLocalHttp:
+    """
+    ``httplib2``-style transport with one ``AuthorizedHttp`` per thread.
+
+    The resource tree of a service only describes requests; sending them is
+    left to this object, which hands each thread its own connection.
+    Attributes other than ``request`` (``timeout``, ``redirect_codes``...)
+    are those of the calling thread's connection.
+    """
+
+    def __init__(self, credentials: Any) -> None:
+        self.credentials = credentials
+        self._local = threading.local()
+
+    def _http(self) -> Any:
+        http = getattr(self._local, "http", None)
+        if http is None:
+            from google_auth_httplib2 import AuthorizedHttp
+            from googleapiclient.http import build_http
+
+            http = self._local.http = AuthorizedHttp(
+                self.credentials, http=build_http()
+            )
+        return http
+
+    def request(self, *args: Any, **kwargs: Any) -> Any:
+        return self._http().request(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._http(), name)
+
+
+def _api_name(uri: str) -> str:
+    """``sheets`` for sheets.googleapis.com, ``drive`` for .../drive/v3/..."""
+    parts = urlsplit(uri)
+    host = parts.netloc.split(".", 1)[0]
+    if host != "www":
+        return host
+    return parts.path.strip("/").split("/", 1)[0] or host
+
+
+def _instrumented_request_class() -> type:
+    """
+    ``HttpRequest`` subclass feeding ``shared.metrics``.
+
+    Every executed request counts as one ``<api>.calls`` and one
+    ``<api>.request`` span, with its body and response sizes added to
+    ``<api>.bytes_sent`` and ``<api>.bytes_received``.
+    """
+    global _request_class
+    if _request_class is None:
+        from googleapiclient.http import HttpRequest
+
+        class InstrumentedHttpRequest(HttpRequest):
+            def __init__(self, http: Any, postproc: Any, uri: str, *args, **kwargs):
+                api = _api_name(uri)
+
+                def measured(response: Any, content: bytes) -> Any:
+                    incr(f"{api}.bytes_received", len(content or b""))
+                    return postproc(response, content)
+
+                super().__init__(http, measured, uri, *args, **kwargs)
+                self.api_name = api
+
+            def execute(self, *args: Any, **kwargs: Any) -> Any:
+                incr(f"{self.api_name}.calls")
+                incr(f"{self.api_name}.bytes_sent", len(self.body or b""))
+                with span(f"{self.api_name}.request"):
+                    return super().execute(*args, **kwargs)
+
+        _request_class = InstrumentedHttpRequest
+    return _request_class
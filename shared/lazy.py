@@ -0,0 +1,54 @@
+"""
+Lazy attribute loading for package ``__init__`` modules.
+
+Cloud Functions pay for every module imported at cold start. Packages in
+``shared`` therefore declare their public names with the module defining
+each one and import that module only when the name is first used
+(PEP 562 module ``__getattr__``), so ``from shared.sheets import
+SheetsClient`` does not also load the repositories, the pending view and
+their dependencies.
+"""
+
+import importlib
+from typing import Any, Callable
+
+
+def lazy_exports(
+    package: str, exports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build ``__getattr__`` and ``__dir__`` for a package.
+
+    Args:
+        package: The package's ``__name__``.
+        exports: Public name -> module it is defined in. A name mapped to
+            its own module path (e.g. ``"shared.sheets"`` for ``"sheets"``
+            under ``"shared"``) resolves to that submodule.
+
+    Returns:
+        ``(__getattr__, __dir__)`` to assign at module level.
+
+    Example:
+        __getattr__, __dir__ = lazy_exports(__name__, {
+            "SheetsClient": "shared.sheets.client",
+        })
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = importlib.import_module(module_name)
+        if module_name == f"{package}.{name}":
+            value: Any = module
+        else:
+            value = getattr(module, name)
+        # Cache on the package so later lookups skip __getattr__.
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -3,9 +3,60 @@ LLM integration subpackage.
 
 Provides client and utilities for interacting with Gemini
 and building evaluation prompts.
+
+Names are imported from their modules on first use (see ``shared.lazy``).
 """
 
-from shared.llm.gemini_client import GeminiClient
-from shared.llm.prompt_builder import PromptBuilder
+from typing import TYPE_CHECKING
+
+from shared.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from shared.llm.evaluator import CandidateEvaluator
+    from shared.llm.gemini_client import GeminiClient, get_gemini_client
+    from shared.llm.prompt_builder import (
+        BuiltPrompt,
+        CompiledTemplate,
+        PromptBuilder,
+        PromptTemplateError,
+        compile_template,
+        prompt_content_hash,
+    )
+    from shared.llm.rate_limit import AdaptiveRateLimiter
+    from shared.llm.response_cache import ResponseCache, SQLiteResponseStore
+    from shared.llm.tokens import estimate_tokens
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "GeminiClient": "shared.llm.gemini_client",
+        "get_gemini_client": "shared.llm.gemini_client",
+        "CandidateEvaluator": "shared.llm.evaluator",
+        "PromptBuilder": "shared.llm.prompt_builder",
+        "BuiltPrompt": "shared.llm.prompt_builder",
+        "CompiledTemplate": "shared.llm.prompt_builder",
+        "PromptTemplateError": "shared.llm.prompt_builder",
+        "compile_template": "shared.llm.prompt_builder",
+        "prompt_content_hash": "shared.llm.prompt_builder",
+        "AdaptiveRateLimiter": "shared.llm.rate_limit",
+        "ResponseCache": "shared.llm.response_cache",
+        "SQLiteResponseStore": "shared.llm.response_cache",
+        "estimate_tokens": "shared.llm.tokens",
+    },
+)
 
-__all__ = ["GeminiClient", "PromptBuilder"]
+__all__ = [
+    "GeminiClient",
+    "get_gemini_client",
+    "CandidateEvaluator",
+    "PromptBuilder",
+    "BuiltPrompt",
+    "CompiledTemplate",
+    "PromptTemplateError",
+    "compile_template",
+    "prompt_content_hash",
+    "AdaptiveRateLimiter",
+    "ResponseCache",
+    "SQLiteResponseStore",
+    "estimate_tokens",
+]
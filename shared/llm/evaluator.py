@@ -0,0 +1,234 @@
+"""
+Candidate evaluation on top of GeminiClient and PromptBuilder.
+
+Turns structured Gemini responses into ``CandidateEvaluation`` rows. Besides
+one request per candidate, candidates can be packed K at a time into a
+single request so the long recruiter prompt is sent once per batch; items
+of a batched response that are missing or fail validation are retried as
+single-candidate requests.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Optional, Union
+
+from pydantic import ValidationError
+
+from shared.llm.gemini_client import GeminiClient
+from shared.llm.prompt_builder import PromptBuilder
+from shared.schemas import CandidateEvaluation, CandidateRaw, FitLabel
+
+EVALUATION_PROPERTIES: dict[str, Any] = {
+    "fit_label": {"type": "string", "enum": [label.value for label in FitLabel]},
+    "fit_score": {"type": "integer", "minimum": 1, "maximum": 5},
+    "reasons": {"type": "string"},
+    "red_flags": {"type": "string", "nullable": True},
+}
+
+EVALUATION_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": EVALUATION_PROPERTIES,
+    "required": ["fit_label", "fit_score", "reasons"],
+}
+
+BATCH_EVALUATION_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "evaluations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "candidate_id": {"type": "string"},
+                    **EVALUATION_PROPERTIES,
+                },
+                "required": ["candidate_id", "fit_label", "fit_score", "reasons"],
+            },
+        }
+    },
+    "required": ["evaluations"],
+}
+
+EvaluationOutcome = Union[CandidateEvaluation, Exception]
+
+
+class CandidateEvaluator:
+    """
+    Evaluates candidates for one job with one prompt version.
+
+    Example:
+        builder = PromptBuilder.from_prompt(prompt)
+        evaluator = CandidateEvaluator(client, builder, job_post_id)
+        results = evaluator.evaluate_batched(candidates, batch_size=5)
+    """
+
+    def __init__(
+        self,
+        client: GeminiClient,
+        builder: PromptBuilder,
+        job_post_id: str,
+        template_values: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """
+        Initialize the evaluator.
+
+        Args:
+            client: Gemini client used for all requests.
+            builder: Builder for the job's prompt version.
+            job_post_id: Job the candidates are evaluated for.
+            template_values: Extra template variables such as
+                ``job_post_name``.
+        """
+        self.client = client
+        self.builder = builder
+        self.job_post_id = job_post_id
+        self.template_values = {"job_post_id": job_post_id}
+        self.template_values.update(template_values or {})
+
+    def to_evaluation(
+        self, candidate_id: str, response: dict[str, Any]
+    ) -> CandidateEvaluation:
+        """
+        Validate a structured response into an evaluation row.
+
+        Raises:
+            ValidationError: If the response does not match the schema.
+        """
+        return CandidateEvaluation(
+            evaluation_id=str(uuid.uuid4()),
+            candidate_id=candidate_id,
+            job_post_id=self.job_post_id,
+            prompt_version=self.builder.prompt_version,
+            prompt_hash=self.builder.content_hash,
+            evaluated_at=datetime.now(timezone.utc),
+            fit_label=response.get("fit_label"),
+            fit_score=response.get("fit_score"),
+            reasons=response.get("reasons"),
+            red_flags=response.get("red_flags") or None,
+        )
+
+    def evaluate(
+        self, candidate: CandidateRaw, details: Optional[dict[str, str]] = None
+    ) -> CandidateEvaluation:
+        """Evaluate a single candidate with its own request."""
+        prompt = self.builder.build(candidate, details, **self.template_values)
+        response = self.client.generate_structured(prompt, EVALUATION_SCHEMA)
+        return self.to_evaluation(candidate.candidate_id, response)
+
+    def evaluate_many(
+        self,
+        candidates: list[CandidateRaw],
+        details: Optional[dict[str, dict[str, str]]] = None,
+    ) -> list[EvaluationOutcome]:
+        """
+        Evaluate candidates with one concurrent request each.
+
+        Returns:
+            An evaluation or the exception that prevented it, per candidate,
+            in input order.
+        """
+        details = details or {}
+        prompts = [
+            self.builder.build(c, details.get(c.candidate_id), **self.template_values)
+            for c in candidates
+        ]
+        responses = self.client.generate_structured_many(
+            prompts, EVALUATION_SCHEMA, return_exceptions=True
+        )
+        outcomes: list[EvaluationOutcome] = []
+        for candidate, response in zip(candidates, responses):
+            if isinstance(response, Exception):
+                outcomes.append(response)
+                continue
+            try:
+                outcomes.append(self.to_evaluation(candidate.candidate_id, response))
+            except ValidationError as exc:
+                outcomes.append(exc)
+        return outcomes
+
+    def evaluate_batch(
+        self,
+        batch: list[CandidateRaw],
+        details: Optional[dict[str, dict[str, str]]] = None,
+    ) -> dict[str, CandidateEvaluation]:
+        """
+        Evaluate candidates with one batched request, without a fallback.
+
+        Unlike ``evaluate_batched`` this makes a single blocking request on
+        the calling thread, for callers that schedule requests themselves.
+
+        Returns:
+            Evaluation per candidate ID, for the candidates whose item was
+            in the response and valid; the caller retries the others.
+
+        Raises:
+            Exception: Whatever the request raised.
+        """
+        prompt = self.builder.build_batch(batch, details, **self.template_values)
+        response = self.client.generate_structured(
+            prompt.text, BATCH_EVALUATION_SCHEMA
+        )
+        return self._parse_batch(batch, response)
+
+    def _parse_batch(
+        self, batch: list[CandidateRaw], response: dict[str, Any]
+    ) -> dict[str, CandidateEvaluation]:
+        """Valid evaluations of a batched response, by candidate ID."""
+        wanted = {c.candidate_id for c in batch}
+        results: dict[str, CandidateEvaluation] = {}
+        for item in response.get("evaluations") or []:
+            if not isinstance(item, dict):
+                continue
+            candidate_id = item.get("candidate_id")
+            if candidate_id not in wanted or candidate_id in results:
+                continue
+            try:
+                results[candidate_id] = self.to_evaluation(candidate_id, item)
+            except ValidationError:
+                continue
+        return results
+
+    def evaluate_batched(
+        self,
+        candidates: list[CandidateRaw],
+        batch_size: int,
+        details: Optional[dict[str, dict[str, str]]] = None,
+    ) -> list[EvaluationOutcome]:
+        """
+        Evaluate candidates ``batch_size`` at a time per request.
+
+        Batches run concurrently. Candidates whose item is missing from the
+        response or fails validation, and all candidates of a failed batch,
+        are re-evaluated with single-candidate requests.
+
+        Returns:
+            An evaluation or the exception that prevented it, per candidate,
+            in input order.
+        """
+        if batch_size <= 1:
+            return self.evaluate_many(candidates, details)
+
+        batches = [
+            candidates[i : i + batch_size]
+            for i in range(0, len(candidates), batch_size)
+        ]
+        prompts = [
+            self.builder.build_batch(batch, details, **self.template_values).text
+            for batch in batches
+        ]
+        responses = self.client.generate_structured_many(
+            prompts, BATCH_EVALUATION_SCHEMA, return_exceptions=True
+        )
+
+        results: dict[str, EvaluationOutcome] = {}
+        for batch, response in zip(batches, responses):
+            if not isinstance(response, Exception):
+                results.update(self._parse_batch(batch, response))
+
+        fallback = [c for c in candidates if c.candidate_id not in results]
+        if fallback:
+            for candidate, outcome in zip(
+                fallback, self.evaluate_many(fallback, details)
+            ):
+                results[candidate.candidate_id] = outcome
+        return [results[c.candidate_id] for c in candidates]
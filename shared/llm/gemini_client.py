@@ -5,27 +5,136 @@ Wraps the Google Gemini API for candidate evaluation.
 Handles authentication, rate limiting, and response parsing.
 """
 
-from typing import Any, Optional
+import json
+import threading
+from typing import Any, Optional, Union
+
+from shared.auth import CLOUD_PLATFORM_SCOPE, get_credential_provider
+from shared.config import get_config
+from shared.llm.rate_limit import AdaptiveRateLimiter, is_rate_limit_error
+from shared.llm.response_cache import (
+    ResponseCache,
+    cache_key,
+    response_cache_from_config,
+)
+from shared.logging import ContextThreadPoolExecutor
+from shared.metrics import incr, span
+
+# Vertex AI is initialized once per process and models are shared by every
+# client, so warm invocations neither re-import the SDK nor rebuild models.
+_models: dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+# Clients configured from ``get_config()``, shared by every invocation so the
+# rate limiter keeps its learned rate and the response cache its memory tier
+# and SQLite connection.
+_clients: dict[tuple[Any, ...], "GeminiClient"] = {}
+_clients_lock = threading.Lock()
+
+
+def get_generative_model(model_name: str) -> Any:
+    """
+    Return the process-wide ``GenerativeModel`` for ``model_name``.
+
+    The Vertex AI SDK is imported and initialized on the first call, with
+    credentials from the shared ``CredentialProvider``.
+    """
+    with _models_lock:
+        model = _models.get(model_name)
+        if model is None:
+            import vertexai
+            from vertexai.generative_models import GenerativeModel
+
+            if not _models:
+                config = get_config()
+                provider = get_credential_provider()
+                credentials = provider.credentials([CLOUD_PLATFORM_SCOPE])
+                vertexai.init(
+                    project=config["project_id"] or provider.project_id,
+                    location=config["region"],
+                    credentials=credentials,
+                )
+            model = GenerativeModel(model_name)
+            _models[model_name] = model
+        return model
 
 
 class GeminiClient:
     """
     Client for interacting with Google Gemini API.
 
-    TODO: Implement Vertex AI authentication
-    TODO: Add model configuration options
-    TODO: Implement retry logic with exponential backoff
+    All calls share one ``AdaptiveRateLimiter``, so the batch API
+    ``generate_structured_many`` can run many requests in parallel while the
+    client as a whole stays under the configured quota. When a
+    ``ResponseCache`` is given, identical structured requests are answered
+    from it without calling the API.
+
     TODO: Add response streaming support
     """
 
-    def __init__(self, model_name: str = "gemini-pro") -> None:
+    def __init__(
+        self,
+        model_name: str = "gemini-pro",
+        max_concurrency: Optional[int] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        max_retries: int = 5,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
         """
         Initialize the Gemini client.
 
         Args:
             model_name: The Gemini model to use for generation.
+            max_concurrency: Worker threads used by the batch API. Defaults
+                to ``gemini_max_concurrency`` from the config.
+            rate_limiter: Limiter shared by all calls. Defaults to one sized
+                from ``gemini_requests_per_minute``.
+            max_retries: Attempts per request after being throttled.
+            cache: Cache for structured responses; disabled when omitted.
         """
+        config = get_config()
         self.model_name = model_name
+        self.max_concurrency = max_concurrency or config["gemini_max_concurrency"]
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(
+            config["gemini_requests_per_minute"]
+        )
+        self.max_retries = max_retries
+        self.cache = cache
+        self._model: Optional[Any] = None
+
+    @property
+    def model(self) -> Any:
+        """The process-wide Vertex AI ``GenerativeModel``, shared on first use."""
+        if self._model is None:
+            self._model = get_generative_model(self.model_name)
+        return self._model
+
+    def _call(self, prompt: str, generation_config: dict[str, Any]) -> str:
+        """Send one request through the rate limiter, retrying when throttled."""
+        attempt = 0
+        while True:
+            with span("gemini.rate_limit_wait"):
+                sent_at = self.rate_limiter.acquire()
+            incr("gemini.calls")
+            try:
+                with span("gemini.request"):
+                    response = self.model.generate_content(
+                        prompt, generation_config=generation_config
+                    )
+            except Exception as exc:
+                if not is_rate_limit_error(exc) or attempt >= self.max_retries:
+                    incr("gemini.errors")
+                    raise
+                self.rate_limiter.on_throttled(sent_at=sent_at)
+                incr("gemini.retries")
+                attempt += 1
+            else:
+                self.rate_limiter.on_success()
+                usage = getattr(response, "usage_metadata", None)
+                if usage is not None:
+                    incr("gemini.input_tokens", usage.prompt_token_count or 0)
+                    incr("gemini.output_tokens", usage.candidates_token_count or 0)
+                return response.text
 
     def generate(
         self,
@@ -44,12 +153,16 @@ class GeminiClient:
         Returns:
             The generated text response.
         """
-        raise NotImplementedError
+        generation_config: dict[str, Any] = {"temperature": temperature}
+        if max_tokens is not None:
+            generation_config["max_output_tokens"] = max_tokens
+        return self._call(prompt, generation_config)
 
     def generate_structured(
         self,
         prompt: str,
         schema: dict[str, Any],
+        temperature: float = 0.0,
     ) -> dict[str, Any]:
         """
         Generate a structured JSON response.
@@ -57,8 +170,95 @@ class GeminiClient:
         Args:
             prompt: The input prompt.
             schema: JSON schema for the expected response.
+            temperature: Sampling temperature.
 
         Returns:
             Parsed JSON response matching the schema.
         """
-        raise NotImplementedError
+        key = None
+        if self.cache is not None:
+            key = cache_key(self.model_name, temperature, schema, prompt)
+            cached = self.cache.get(key)
+            if cached is not None:
+                incr("llm_cache.hits")
+                return cached
+            incr("llm_cache.misses")
+
+        text = self._call(
+            prompt,
+            {
+                "temperature": temperature,
+                "response_mime_type": "application/json",
+                "response_schema": schema,
+            },
+        )
+        response = json.loads(text)
+        if key is not None:
+            self.cache.put(key, response)
+        return response
+
+    def generate_structured_many(
+        self,
+        prompts: list[str],
+        schema: dict[str, Any],
+        temperature: float = 0.0,
+        return_exceptions: bool = False,
+    ) -> list[Union[dict[str, Any], Exception]]:
+        """
+        Generate structured responses for many prompts concurrently.
+
+        Requests run on up to ``max_concurrency`` threads and share the
+        client's rate limiter.
+
+        Args:
+            prompts: Input prompts.
+            schema: JSON schema every response must follow.
+            temperature: Sampling temperature.
+            return_exceptions: Return a failed request's exception in its
+                slot instead of raising it.
+
+        Returns:
+            Parsed responses (or exceptions), in prompt order.
+        """
+        if not prompts:
+            return []
+
+        def run(prompt: str) -> Union[dict[str, Any], Exception]:
+            try:
+                return self.generate_structured(prompt, schema, temperature)
+            except Exception as exc:
+                if not return_exceptions:
+                    raise
+                return exc
+
+        workers = min(self.max_concurrency, len(prompts))
+        with ContextThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, prompts))
+
+
+def get_gemini_client(config: dict[str, Any]) -> GeminiClient:
+    """
+    Return the process-wide client described by ``config``.
+
+    Args:
+        config: Configuration from ``get_config()``; ``gemini_model`` and the
+            ``llm_cache_*`` settings select the client.
+
+    Returns:
+        The shared client with its response cache, created on first use.
+    """
+    key = (
+        config["gemini_model"],
+        config["llm_cache_path"],
+        config["llm_cache_max_memory_bytes"],
+        config["llm_cache_max_bytes"],
+        config["llm_cache_ttl_seconds"],
+    )
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = GeminiClient(
+                config["gemini_model"], cache=response_cache_from_config(config)
+            )
+            _clients[key] = client
+        return client
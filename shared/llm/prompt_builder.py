@@ -2,51 +2,370 @@
 Prompt construction utilities.
 
 Builds evaluation prompts by combining templates with candidate data.
+Templates come from the ``prompts`` tab and use ``{{ name }}`` placeholders.
+Each template is compiled once per ``(prompt_version, content hash)`` into
+literal segments and placeholder names, so rendering for thousands of
+candidates is a single join and template errors surface before the first
+candidate is processed.
+
+Prompts are kept within a token budget: when the estimated size exceeds
+it, candidate fields are truncated from the lowest priority up.
 """
 
-from shared.schemas import Candidate
+import hashlib
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from shared.config import get_config
+from shared.llm.tokens import estimate_tokens, truncate_to_tokens
+from shared.schemas import CandidateRaw, Prompt
+
+PLACEHOLDER_RE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+# Placeholders a template may use. ``candidate`` is filled by PromptBuilder.
+ALLOWED_PLACEHOLDERS = frozenset({"candidate", "job_post_id", "job_post_name"})
+REQUIRED_PLACEHOLDERS = frozenset({"candidate"})
+
+# Appended to prompts built by ``build_batch``.
+BATCH_INSTRUCTIONS = (
+    "\n\nThe candidate section above contains several candidates, each "
+    "introduced by a '### candidate_id: <id>' heading. Evaluate every "
+    "candidate independently and return exactly one entry per candidate in "
+    "'evaluations', with its candidate_id copied verbatim."
+)
+
+# CandidateRaw fields from most to least important; extra details passed to
+# the builder (CV text, profile answers) rank below all of them.
+CANDIDATE_FIELD_PRIORITY = (
+    "candidate_id",
+    "full_name",
+    "email",
+    "linkedin_url",
+    "cv_url",
+    "raw_profile_url",
+    "phone",
+    "source",
+    "source_candidate_id",
+    "created_at",
+)
+
+
+class PromptTemplateError(ValueError):
+    """Raised when a template uses unknown or lacks required placeholders."""
+
+
+class CompiledTemplate:
+    """
+    A prompt template split into literal segments and placeholder names.
+
+    ``literals`` always has one more element than ``placeholders``; the
+    rendered prompt interleaves them.
+    """
+
+    def __init__(
+        self,
+        template: str,
+        allowed: Iterable[str] = ALLOWED_PLACEHOLDERS,
+        required: Iterable[str] = REQUIRED_PLACEHOLDERS,
+    ) -> None:
+        """
+        Parse and validate a template.
+
+        Args:
+            template: Template text with ``{{ name }}`` placeholders.
+            allowed: Placeholder names the template may use.
+            required: Placeholder names the template must use.
+
+        Raises:
+            PromptTemplateError: If the template uses a name outside
+                ``allowed`` or misses one of ``required``.
+        """
+        literals = []
+        placeholders = []
+        position = 0
+        for match in PLACEHOLDER_RE.finditer(template):
+            literals.append(template[position : match.start()])
+            placeholders.append(match.group(1))
+            position = match.end()
+        literals.append(template[position:])
+
+        names = frozenset(placeholders)
+        unknown = names - frozenset(allowed)
+        if unknown:
+            raise PromptTemplateError(
+                f"Unknown placeholders: {', '.join(sorted(unknown))}"
+            )
+        missing = frozenset(required) - names
+        if missing:
+            raise PromptTemplateError(
+                f"Missing required placeholders: {', '.join(sorted(missing))}"
+            )
+
+        self.template = template
+        self.literals = tuple(literals)
+        self.placeholders = tuple(placeholders)
+        self.names = names
+        self.literal_tokens = sum(estimate_tokens(literal) for literal in literals)
+
+    def render(self, values: dict[str, Any]) -> str:
+        """
+        Substitute values into the template.
+
+        Args:
+            values: Value for every placeholder name; extra keys are ignored.
+
+        Returns:
+            The rendered text.
+        """
+        missing = self.names - values.keys()
+        if missing:
+            raise KeyError(
+                f"No value for placeholders: {', '.join(sorted(missing))}"
+            )
+        parts = [self.literals[0]]
+        for name, literal in zip(self.placeholders, self.literals[1:]):
+            parts.append(str(values[name]))
+            parts.append(literal)
+        return "".join(parts)
+
+
+def prompt_content_hash(content: str) -> str:
+    """
+    Short fingerprint of a prompt's content.
+
+    Stored with each evaluation so edits made without bumping the prompt
+    version can still be told apart.
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+_compiled: dict[tuple[str, str], CompiledTemplate] = {}
+_compiled_lock = threading.Lock()
+
+
+def compile_template(template: str, prompt_version: str = "") -> CompiledTemplate:
+    """
+    Compile a template, reusing an earlier compilation of the same content.
+
+    Args:
+        template: Template text.
+        prompt_version: Version from the ``prompts`` tab, part of the memo key.
+
+    Returns:
+        The memoized compiled template.
+    """
+    content_hash = hashlib.sha256(template.encode("utf-8")).hexdigest()
+    key = (prompt_version, content_hash)
+    with _compiled_lock:
+        compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = CompiledTemplate(template)
+        with _compiled_lock:
+            _compiled[key] = compiled
+    return compiled
+
+
+@dataclass
+class BuiltPrompt:
+    """A rendered prompt with its estimated size."""
+
+    text: str
+    estimated_tokens: int
+    truncated_fields: list[str] = field(default_factory=list)
 
 
 class PromptBuilder:
     """
     Builder for constructing LLM evaluation prompts.
 
-    TODO: Implement template variable substitution
     TODO: Add support for multi-part prompts
-    TODO: Add prompt validation
     """
 
-    def __init__(self, template: str) -> None:
+    def __init__(
+        self,
+        template: str,
+        prompt_version: str = "",
+        token_budget: Optional[int] = None,
+    ) -> None:
         """
         Initialize with a prompt template.
 
         Args:
             template: The prompt template with placeholders.
+            prompt_version: Version of the template, used to memoize its
+                compilation.
+            token_budget: Maximum estimated input tokens of a built prompt.
+                Defaults to ``prompt_token_budget`` from the config.
+
+        Raises:
+            PromptTemplateError: If the template is invalid.
         """
         self.template = template
+        self.prompt_version = prompt_version
+        self.content_hash = prompt_content_hash(template)
+        self.compiled = compile_template(template, prompt_version)
+        if token_budget is None:
+            token_budget = get_config()["prompt_token_budget"]
+        self.token_budget = token_budget
+
+    @classmethod
+    def from_prompt(
+        cls, prompt: Prompt, token_budget: Optional[int] = None
+    ) -> "PromptBuilder":
+        """Create a builder for a row of the ``prompts`` tab."""
+        return cls(prompt.prompt_content, prompt.prompt_version, token_budget)
 
-    def build(self, candidate: Candidate, **kwargs) -> str:
+    def build(
+        self,
+        candidate: CandidateRaw,
+        details: Optional[dict[str, str]] = None,
+        **kwargs,
+    ) -> str:
         """
         Build a complete prompt for a candidate.
 
         Args:
             candidate: The candidate to evaluate.
+            details: Extra candidate text such as the CV, in priority order.
             **kwargs: Additional template variables.
 
         Returns:
             The fully constructed prompt.
         """
-        raise NotImplementedError
+        return self.build_with_estimate(candidate, details, **kwargs).text
+
+    def build_with_estimate(
+        self,
+        candidate: CandidateRaw,
+        details: Optional[dict[str, str]] = None,
+        **kwargs,
+    ) -> BuiltPrompt:
+        """
+        Build a prompt within the token budget and report its size.
+
+        The budget left after the template and the other variables goes to
+        the candidate block; lower-priority candidate fields are truncated
+        first when it does not fit.
+
+        Args:
+            candidate: The candidate to evaluate.
+            details: Extra candidate text such as the CV, in priority order.
+            **kwargs: Additional template variables.
+
+        Returns:
+            The prompt, its estimated token count and the truncated fields.
+        """
+        values = dict(kwargs)
+        fixed_tokens = self.compiled.literal_tokens + sum(
+            estimate_tokens(str(values[name]))
+            for name in self.compiled.placeholders
+            if name != "candidate" and name in values
+        )
+        candidate_budget = max(0, self.token_budget - fixed_tokens)
+        values["candidate"], truncated = _format_candidate(
+            candidate, details, candidate_budget
+        )
+        text = self.compiled.render(values)
+        return BuiltPrompt(text, estimate_tokens(text), truncated)
+
+    def build_batch(
+        self,
+        candidates: list[CandidateRaw],
+        details: Optional[dict[str, dict[str, str]]] = None,
+        **kwargs,
+    ) -> BuiltPrompt:
+        """
+        Build one prompt evaluating several candidates at once.
+
+        The candidate placeholder receives one block per candidate and the
+        budget left after the template is split evenly between them.
+
+        Args:
+            candidates: Candidates to evaluate, all for the same job.
+            details: Extra candidate text keyed by ``candidate_id``.
+            **kwargs: Additional template variables.
+
+        Returns:
+            The prompt, its estimated token count and the truncated fields,
+            prefixed with the candidate ID they belong to.
+        """
+        values = dict(kwargs)
+        fixed_tokens = (
+            self.compiled.literal_tokens
+            + estimate_tokens(BATCH_INSTRUCTIONS)
+            + sum(
+                estimate_tokens(str(values[name]))
+                for name in self.compiled.placeholders
+                if name != "candidate" and name in values
+            )
+        )
+        per_candidate = max(0, self.token_budget - fixed_tokens) // max(
+            1, len(candidates)
+        )
+        blocks = []
+        truncated = []
+        for candidate in candidates:
+            heading = f"### candidate_id: {candidate.candidate_id}"
+            block, cut = _format_candidate(
+                candidate,
+                (details or {}).get(candidate.candidate_id),
+                max(0, per_candidate - estimate_tokens(heading + "\n")),
+            )
+            blocks.append(f"{heading}\n{block}")
+            truncated.extend(f"{candidate.candidate_id}.{name}" for name in cut)
+        values["candidate"] = "\n\n".join(blocks)
+        text = self.compiled.render(values) + BATCH_INSTRUCTIONS
+        return BuiltPrompt(text, estimate_tokens(text), truncated)
 
     @staticmethod
-    def format_candidate_data(candidate: Candidate) -> str:
+    def format_candidate_data(
+        candidate: CandidateRaw,
+        details: Optional[dict[str, str]] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
         """
         Format candidate data for inclusion in a prompt.
 
         Args:
             candidate: The candidate to format.
+            details: Extra candidate text such as the CV, in priority order.
+            max_tokens: Token budget for the formatted block; unlimited if None.
 
         Returns:
             Formatted string representation.
         """
-        raise NotImplementedError
+        return _format_candidate(candidate, details, max_tokens)[0]
+
+
+def _format_candidate(
+    candidate: CandidateRaw,
+    details: Optional[dict[str, str]],
+    max_tokens: Optional[int],
+) -> tuple[str, list[str]]:
+    """Format a candidate as ``name: value`` lines, truncated to a budget."""
+    data = candidate.model_dump(mode="json")
+    fields = [(name, data[name]) for name in CANDIDATE_FIELD_PRIORITY]
+    fields.extend((details or {}).items())
+    lines = [
+        [name, str(value)] for name, value in fields if value not in (None, "")
+    ]
+
+    truncated = []
+    if max_tokens is not None:
+        # Newlines and "name: " labels count towards the budget too.
+        sizes = [estimate_tokens(f"{name}: {value}\n") for name, value in lines]
+        overflow = sum(sizes) - max_tokens
+        for i in reversed(range(len(lines))):
+            if overflow <= 0:
+                break
+            name, value = lines[i]
+            label_tokens = estimate_tokens(f"{name}: \n")
+            keep = max(0, sizes[i] - overflow - label_tokens)
+            lines[i][1] = truncate_to_tokens(value, keep)
+            overflow -= sizes[i] - estimate_tokens(f"{name}: {lines[i][1]}\n")
+            truncated.append(name)
+        lines = [line for line in lines if line[1]]
+
+    return "\n".join(f"{name}: {value}" for name, value in lines), truncated
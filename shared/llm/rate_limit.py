@@ -0,0 +1,159 @@
+"""
+Client-side rate limiting for LLM calls.
+
+A token bucket shared by all worker threads of a client. When the API
+answers 429 / RESOURCE_EXHAUSTED the refill rate is halved and the bucket
+paused; successful calls then restore the rate gradually (AIMD). Requests
+already in flight when a pause starts belong to the same throttling episode:
+their 429s do not compound the backoff, which is capped at
+``max_backoff_seconds``.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """
+    Whether an exception means the API throttled the request.
+
+    Recognizes ``google.api_core`` ``ResourceExhausted`` / ``TooManyRequests``
+    and any error carrying an HTTP 429 code, without importing the SDK.
+    """
+    if type(exc).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    code = getattr(exc, "code", None)
+    if code == 429 or getattr(code, "value", None) == 429:
+        return True
+    return "RESOURCE_EXHAUSTED" in str(exc)
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket with adaptive refill rate.
+
+    Example:
+        limiter = AdaptiveRateLimiter(requests_per_minute=60)
+        sent_at = limiter.acquire()
+        try:
+            call()
+        except Exception as exc:
+            if is_rate_limit_error(exc):
+                limiter.on_throttled(sent_at=sent_at)
+            raise
+        else:
+            limiter.on_success()
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        burst: Optional[int] = None,
+        min_requests_per_minute: float = 1.0,
+        backoff_seconds: float = 2.0,
+        max_backoff_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Initialize a full bucket.
+
+        Args:
+            requests_per_minute: Quota to stay under; also the ceiling the
+                rate recovers to after throttling.
+            burst: Bucket capacity. Defaults to one second of quota, at least 1.
+            min_requests_per_minute: Floor for the rate after backoffs.
+            backoff_seconds: Pause applied on the first throttle; doubles
+                on consecutive throttles.
+            max_backoff_seconds: Longest pause, server ``retry_after``
+                included; keep it well below the function timeout.
+            clock: Monotonic time source, injectable for tests.
+            sleep: Sleep function, injectable for tests.
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        self.max_rate = requests_per_minute / 60.0
+        self.min_rate = min(min_requests_per_minute / 60.0, self.max_rate)
+        self.rate = self.max_rate
+        if burst is None:
+            burst = max(1, round(self.max_rate))
+        self.capacity = float(burst)
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max(backoff_seconds, max_backoff_seconds)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._paused_until = 0.0
+        # When the current pause was started; None before any throttle.
+        self._paused_at: Optional[float] = None
+        self._consecutive_throttles = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - max(self._updated_at, self._paused_until))
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def acquire(self) -> float:
+        """
+        Block until a request may be sent.
+
+        Returns:
+            The clock time the request was let through; pass it to
+            ``on_throttled`` if the request is throttled.
+        """
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return now
+                wait = max(
+                    self._paused_until - now,
+                    (1.0 - self._tokens) / self.rate,
+                )
+            self._sleep(wait)
+
+    def on_success(self) -> None:
+        """Record a successful call; nudges the rate back up."""
+        with self._lock:
+            self._consecutive_throttles = 0
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def on_throttled(
+        self, retry_after: Optional[float] = None, sent_at: Optional[float] = None
+    ) -> None:
+        """
+        Record a 429 response; halves the rate and pauses the bucket.
+
+        A request sent before the current pause started was throttled in
+        the episode that caused it, so its 429 is ignored; a burst of
+        concurrent 429s backs off once.
+
+        Args:
+            retry_after: Server-suggested delay in seconds, if any.
+            sent_at: When the request was let through, as returned by
+                ``acquire``. When omitted every 429 counts.
+        """
+        with self._lock:
+            if (
+                sent_at is not None
+                and self._paused_at is not None
+                and sent_at <= self._paused_at
+            ):
+                return
+            self._consecutive_throttles += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            exponent = min(self._consecutive_throttles - 1, 32)
+            delay = self.backoff_seconds * 2**exponent
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            delay = min(delay, self.max_backoff_seconds)
+            now = self._clock()
+            self._refill(now)
+            self._tokens = 0.0
+            self._paused_at = now
+            self._paused_until = max(self._paused_until, now + delay)
@@ -0,0 +1,268 @@
+"""
+Content-addressed cache for structured LLM responses.
+
+Responses are keyed by a hash of everything that determines them (model,
+temperature, schema and the fully built prompt), so an unchanged
+re-evaluation is served locally instead of calling Gemini. Lookups go
+through a size-bounded in-memory LRU first and an optional SQLite file
+second. The file is bounded too, by total payload size and entry age: on
+Cloud Functions ``/tmp`` is memory-backed and counts against the instance.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+def cache_key(
+    model_name: str, temperature: float, schema: dict[str, Any], prompt: str
+) -> str:
+    """
+    Hash the inputs of a structured generation request.
+
+    Args:
+        model_name: The Gemini model.
+        temperature: Sampling temperature.
+        schema: JSON schema of the response.
+        prompt: The fully built prompt.
+
+    Returns:
+        Hex SHA-256 digest identifying the request.
+    """
+    payload = json.dumps(
+        [model_name, temperature, schema, prompt],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteResponseStore:
+    """
+    Persistent key/value store for cached responses backed by SQLite.
+
+    Entries older than ``ttl_seconds`` are never returned and are purged on
+    open and on write. Once the stored values exceed ``max_bytes`` the
+    oldest entries are evicted; SQLite reuses the freed pages, so the file
+    stays close to that size.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            path: SQLite database file.
+            max_bytes: Budget for the total size of stored values.
+            ttl_seconds: Lifetime of an entry; entries never expire if None.
+            clock: Wall-clock time source, injectable for tests.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(responses)")
+        }
+        # Files written before the store was bounded lack these columns;
+        # their entries count as stored at the epoch, so they expire first.
+        if "size" not in columns:
+            self._conn.execute(
+                "ALTER TABLE responses ADD COLUMN size INTEGER NOT NULL DEFAULT 0"
+            )
+            self._conn.execute("UPDATE responses SET size = length(value)")
+        if "stored_at" not in columns:
+            self._conn.execute(
+                "ALTER TABLE responses ADD COLUMN stored_at REAL NOT NULL DEFAULT 0"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)"
+        )
+        self._bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        with self._lock:
+            self._purge_expired()
+            self._evict()
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the stored values."""
+        return self._bytes
+
+    def _expired_before(self) -> Optional[float]:
+        if self.ttl_seconds is None:
+            return None
+        return self._clock() - self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored value for a key, if any and not expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        expired_before = self._expired_before()
+        if expired_before is not None and row[1] < expired_before:
+            return None
+        return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store a value, replacing any previous one, and enforce the limits."""
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if previous is not None:
+                self._bytes -= previous[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, stored_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, size, self._clock()),
+            )
+            self._bytes += size
+            if self._bytes > self.max_bytes:
+                self._purge_expired()
+                self._evict()
+            self._conn.commit()
+
+    def _purge_expired(self) -> None:
+        """Delete expired entries (caller holds the lock)."""
+        expired_before = self._expired_before()
+        if expired_before is None:
+            return
+        freed = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses WHERE stored_at < ?",
+            (expired_before,),
+        ).fetchone()[0]
+        self._conn.execute(
+            "DELETE FROM responses WHERE stored_at < ?", (expired_before,)
+        )
+        self._bytes -= freed
+
+    def _evict(self) -> None:
+        """Delete the oldest entries until within ``max_bytes`` (lock held)."""
+        excess = self._bytes - self.max_bytes
+        if excess <= 0:
+            return
+        keys = []
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY stored_at, rowid"
+        )
+        for key, size in rows:
+            if excess <= 0:
+                break
+            keys.append((key,))
+            excess -= size
+            self._bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """
+    Two-tier response cache: in-memory LRU in front of an optional store.
+
+    The memory tier evicts least recently used entries once the total size
+    of the cached JSON exceeds ``max_memory_bytes``.
+    """
+
+    def __init__(
+        self,
+        store: Optional[SQLiteResponseStore] = None,
+        max_memory_bytes: int = 32 * 1024 * 1024,
+    ) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            store: Persistent tier; memory-only when omitted.
+            max_memory_bytes: Size budget of the in-memory tier.
+        """
+        self.store = store
+        self.max_memory_bytes = max_memory_bytes
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Return the cached response for a key, or None on a miss."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+        if value is None and self.store is not None:
+            value = self.store.get(key)
+            if value is not None:
+                self._remember(key, value)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(value)
+
+    def put(self, key: str, response: dict[str, Any]) -> None:
+        """Cache a response in both tiers."""
+        value = json.dumps(response, ensure_ascii=False)
+        self._remember(key, value)
+        if self.store is not None:
+            self.store.put(key, value)
+
+    def _remember(self, key: str, value: str) -> None:
+        size = len(value)
+        if size > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory[key] = value
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+
+def response_cache_from_config(config: dict[str, Any]) -> ResponseCache:
+    """Build the response cache described by ``get_config()``."""
+    path = config["llm_cache_path"]
+    store = None
+    if path:
+        store = SQLiteResponseStore(
+            path,
+            max_bytes=config["llm_cache_max_bytes"],
+            ttl_seconds=config["llm_cache_ttl_seconds"] or None,
+        )
+    return ResponseCache(store, max_memory_bytes=config["llm_cache_max_memory_bytes"])
@@ -0,0 +1,45 @@
+"""
+Token estimation and truncation helpers.
+
+Uses a character-based estimate (about four characters per token for
+Gemini on mixed Spanish/English text), which is cheap enough to run per
+candidate and close enough to size budgets and batches. It is not a
+tokenizer; call ``GenerativeModel.count_tokens`` when an exact count matters.
+"""
+
+import math
+
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_MARKER = " [...]"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Shorten a text to roughly ``max_tokens`` tokens.
+
+    Cuts at the last whitespace before the limit when there is one and
+    appends a marker so the model knows the text is incomplete.
+
+    Args:
+        text: Text to shorten.
+        max_tokens: Token budget, marker included.
+
+    Returns:
+        The text unchanged if it fits, otherwise its truncated prefix.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    max_chars = max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER)
+    if max_chars <= 0:
+        return ""
+    cut = text[:max_chars]
+    space = cut.rfind(" ")
+    if space > max_chars // 2:
+        cut = cut[:space]
+    return cut.rstrip() + TRUNCATION_MARKER
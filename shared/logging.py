@@ -3,16 +3,291 @@ Logging configuration for the AI Hiring MVP.
 
 Provides structured logging compatible with GCP Cloud Logging.
 Ensures consistent log format across all Cloud Functions.
+
+Loggers from ``get_logger`` never write from the calling thread: records
+go through a ``QueueHandler`` onto an unbounded in-memory queue, and one
+``QueueListener`` thread per process serializes them as single-line JSON to
+stdout, where Cloud Logging picks them up. Logging a line per candidate
+therefore costs the request thread little more than a queue put.
+
+Cloud Functions throttle the CPU once a response is sent, so records still
+queued then may only be written during a later request, or never. Leaving
+the outermost ``correlation_context`` therefore waits for the queue to be
+drained (see ``flush``), and records logged while no listener is running
+(e.g. after shutdown) are written synchronously.
+
+Every record carries the correlation ID of the request it was logged for.
+The ID lives in a ``contextvars.ContextVar``: asyncio tasks inherit it on
+their own, and worker threads do when started through
+``ContextThreadPoolExecutor`` or ``propagate_context``.
 """
 
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, Mapping, Optional, TypeVar
+
+from shared.config import get_config
+
+T = TypeVar("T")
+
+# Headers a correlation ID is taken from, in order of preference.
+CORRELATION_HEADERS = ("X-Correlation-ID", "X-Request-ID", "X-Cloud-Trace-Context")
+
+# Cloud Logging severities by Python level name.
+_SEVERITIES = {"WARNING": "WARNING", "CRITICAL": "CRITICAL", "FATAL": "CRITICAL"}
+
+# Attributes every LogRecord has; anything else was passed via ``extra``.
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime", "correlation_id"}
+
+_correlation_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "correlation_id", default=None
+)
+
+
+# --------------------------------
+# Correlation IDs
+# --------------------------------
+
+
+def get_correlation_id() -> Optional[str]:
+    """Return the correlation ID of the current request, if any."""
+    return _correlation_id.get()
+
+
+def new_correlation_id() -> str:
+    """Generate a fresh correlation ID."""
+    return uuid.uuid4().hex
+
+
+def correlation_id_from_headers(headers: Mapping[str, str]) -> str:
+    """
+    Pick the correlation ID of an incoming request.
+
+    Uses the first of ``CORRELATION_HEADERS`` present; for
+    ``X-Cloud-Trace-Context`` only the trace ID is kept, so log lines match
+    the request's trace. Generates a new ID when none is present.
+    """
+    for header in CORRELATION_HEADERS:
+        value = headers.get(header)
+        if value:
+            return value.split("/", 1)[0].strip()
+    return new_correlation_id()
+
+
+@contextmanager
+def correlation_context(correlation_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Set the correlation ID for the duration of a block.
+
+    Leaving the outermost block flushes the queued log records.
+
+    Args:
+        correlation_id: ID to use; a new one is generated when omitted.
+
+    Yields:
+        The correlation ID in effect.
+
+    Example:
+        with correlation_context(correlation_id_from_headers(request.headers)):
+            return handle(request)
+    """
+    value = correlation_id or new_correlation_id()
+    token = _correlation_id.set(value)
+    try:
+        yield value
+    finally:
+        _correlation_id.reset(token)
+        if _correlation_id.get() is None:
+            # End of the request: write its records before the response.
+            flush()
+
+
+def propagate_context(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    Bind ``fn`` to the caller's context, e.g. before handing it to a thread.
+
+    Each call runs in its own copy of the captured context, so the wrapper
+    may be called from several threads at once.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> T:
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ``ThreadPoolExecutor`` whose tasks run in the submitter's context.
+
+    A drop-in replacement that keeps the correlation ID (and any other
+    context variable) of the submitting thread or asyncio task in the
+    workers, including for ``loop.run_in_executor``.
+    """
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future:
+        context = contextvars.copy_context()
+        return super().submit(context.run, fn, *args, **kwargs)
+
+
+# --------------------------------
+# JSON output
+# --------------------------------
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one-line JSON understood by Cloud Logging."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "severity": _SEVERITIES.get(record.levelname, record.levelname),
+            "message": record.getMessage(),
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "logger": record.name,
+        }
+        correlation_id = getattr(record, "correlation_id", None)
+        if correlation_id:
+            entry["correlation_id"] = correlation_id
+            entry["logging.googleapis.com/labels"] = {
+                "correlation_id": correlation_id
+            }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.levelno >= logging.ERROR:
+            entry["logging.googleapis.com/sourceLocation"] = {
+                "file": record.pathname,
+                "line": record.lineno,
+                "function": record.funcName,
+            }
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _FlushMarker:
+    """Queued behind pending records; set once the listener reaches it."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class _Listener(logging.handlers.QueueListener):
+    """``QueueListener`` that signals flush markers instead of writing them."""
+
+    def handle(self, record: Any) -> None:
+        if isinstance(record, _FlushMarker):
+            record.done.set()
+            return
+        super().handle(record)
+
+    def is_alive(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+
+class _ContextQueueHandler(logging.handlers.QueueHandler):
+    """Stamps the correlation ID in the calling thread and enqueues the record.
+
+    Unlike ``QueueHandler.prepare`` nothing is formatted here; the listener
+    thread does all serialization. Without a running listener the record is
+    written right away instead, so it is not left in the queue.
+    """
+
+    def __init__(
+        self, records: queue.SimpleQueue, listener: _Listener, output: logging.Handler
+    ) -> None:
+        super().__init__(records)
+        self.listener = listener
+        self.output = output
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.correlation_id = _correlation_id.get()
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.listener.is_alive():
+            super().emit(record)
+        else:
+            self.output.handle(self.prepare(record))
+
+
+_handler: Optional[logging.Handler] = None
+_listener: Optional[_Listener] = None
+_setup_lock = threading.Lock()
+
+
+def _queue_handler() -> logging.Handler:
+    """Start the process-wide listener on first use and return its handler."""
+    global _handler, _listener
+    with _setup_lock:
+        if _handler is None:
+            records: queue.SimpleQueue = queue.SimpleQueue()
+            output = logging.StreamHandler(sys.stdout)
+            output.setFormatter(JsonFormatter())
+            _listener = _Listener(records, output)
+            _listener.start()
+            # Flush queued records when the instance shuts down.
+            atexit.register(_listener.stop)
+            _handler = _ContextQueueHandler(records, _listener, output)
+        return _handler
+
+
+def flush(timeout: Optional[float] = 5.0) -> bool:
+    """
+    Wait until every record queued so far has been written.
+
+    Args:
+        timeout: Longest wait in seconds; None waits indefinitely.
+
+    Returns:
+        False if the timeout passed first, True otherwise (also when no
+        listener is running, as records are then written synchronously).
+    """
+    listener = _listener
+    if listener is None or not listener.is_alive():
+        return True
+    marker = _FlushMarker()
+    listener.queue.put_nowait(marker)
+    return marker.done.wait(timeout)
 
 
 def get_logger(name: str) -> logging.Logger:
     """
     Get a configured logger instance.
 
-    TODO: Configure structured JSON logging for GCP
-    TODO: Add correlation ID support for request tracing
+    The logger emits JSON lines through the shared background writer at the
+    level set by ``log_level``, and does not propagate to the root logger
+    so records are written once.
+
+    Args:
+        name: Logger name, usually ``__name__``.
+
+    Returns:
+        The configured ``logging.Logger``.
     """
-    raise NotImplementedError
+    logger = logging.getLogger(name)
+    handler = _queue_handler()
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+        logger.setLevel(get_config()["log_level"])
+        logger.propagate = False
+    return logger
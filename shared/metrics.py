@@ -0,0 +1,136 @@
+"""
+Per-invocation timing and counter instrumentation.
+
+A handler opens a collection with ``collect()``; code anywhere below it
+(including worker threads started through ``shared.logging``'s
+``ContextThreadPoolExecutor`` and asyncio tasks) records into it with
+``incr`` and ``span``. The collection lives in a context variable, so
+concurrent invocations never mix, and outside a collection every call is a
+no-op costing one context-variable lookup.
+
+Counter and span names are dotted, ``<component>.<what>``:
+
+- ``sheets.*`` / ``drive.*``: API calls, bytes sent and received;
+- ``sheets_cache.*``: snapshot cache hits and misses per tab;
+- ``gemini.*``: calls, throttling retries, input/output tokens, latency;
+- ``llm_cache.*``: response cache hits and misses;
+- ``teamtailor.*`` / ``getonboard.*``: ATS calls, retries, latency.
+
+Example:
+    with collect() as metrics:
+        with span("evaluate"):
+            ...
+        incr("gemini.input_tokens", 812)
+    body["metrics"] = metrics.summary()
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+_current: contextvars.ContextVar[Optional["Metrics"]] = contextvars.ContextVar(
+    "metrics", default=None
+)
+
+
+class Metrics:
+    """Thread-safe counters and span timings of one invocation."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.counters: dict[str, float] = {}
+        # name -> [count, total seconds, max seconds]
+        self.spans: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Add ``value`` to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_span(self, name: str, seconds: float) -> None:
+        """Add one timing of ``name``."""
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                self.spans[name] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Summarize the invocation.
+
+        Returns:
+            ``elapsed_ms``, the ``counters``, per-span ``count``/``total_ms``/
+            ``avg_ms``/``max_ms``, and a ``hit_rates`` entry for every
+            ``<prefix>.hits``/``<prefix>.misses`` counter pair.
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            spans = {
+                name: {
+                    "count": int(count),
+                    "total_ms": round(total * 1000, 1),
+                    "avg_ms": round(total * 1000 / count, 1),
+                    "max_ms": round(longest * 1000, 1),
+                }
+                for name, (count, total, longest) in sorted(self.spans.items())
+            }
+        hit_rates = {}
+        for name in counters:
+            if name.endswith(".hits"):
+                prefix = name[: -len(".hits")]
+                hits = counters[name]
+                total = hits + counters.get(f"{prefix}.misses", 0)
+                hit_rates[prefix] = round(hits / total, 3) if total else None
+        return {
+            "elapsed_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "counters": {
+                name: int(value) if float(value).is_integer() else value
+                for name, value in sorted(counters.items())
+            },
+            "spans": spans,
+            "hit_rates": hit_rates,
+        }
+
+
+@contextmanager
+def collect() -> Iterator[Metrics]:
+    """Collect metrics of everything run inside the block."""
+    metrics = Metrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def current() -> Optional[Metrics]:
+    """Return the active collection, if any."""
+    return _current.get()
+
+
+def incr(name: str, value: float = 1) -> None:
+    """Add ``value`` to a counter of the active collection."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.incr(name, value)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the block as one occurrence of ``name`` (also when it raises)."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record_span(name, time.perf_counter() - start)
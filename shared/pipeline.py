@@ -0,0 +1,149 @@
+"""
+Bounded producer/consumer helpers for streaming pipelines.
+
+``prefetch`` runs an iterator one or more items ahead on a background
+thread and ``BackgroundWriter`` drains a sink on another, so fetching,
+transforming and writing overlap while at most ``depth`` items per stage
+are held in memory.
+"""
+
+import queue
+import threading
+from typing import Callable, Generic, Iterable, Iterator, Optional, TypeVar
+
+from shared.logging import propagate_context
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def prefetch(iterable: Iterable[T], depth: int = 1) -> Iterator[T]:
+    """
+    Iterate ``iterable`` on a background thread, ``depth`` items ahead.
+
+    The producer only advances the iterator while fewer than ``depth``
+    items are waiting, so at most ``depth`` items are fetched but not yet
+    consumed. Exceptions raised by the producer are re-raised in the
+    consumer. When the consumer stops early, the producer stops too.
+
+    Args:
+        iterable: Source of items, e.g. a lazily paginated API listing.
+        depth: Items fetched ahead of the consumer.
+
+    Yields:
+        The items of ``iterable``, in order.
+    """
+    buffer: queue.Queue = queue.Queue()
+    slots = threading.Semaphore(depth)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                buffer.put(item)
+                while not slots.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+        except BaseException as exc:
+            buffer.put(_Failure(exc))
+        else:
+            buffer.put(_DONE)
+
+    # The first item is fetched without waiting for a slot.
+    slots.acquire()
+    thread = threading.Thread(
+        target=propagate_context(produce), name="prefetch", daemon=True
+    )
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            slots.release()
+            yield item
+    finally:
+        stop.set()
+
+
+class BackgroundWriter(Generic[T]):
+    """
+    Sends items to a sink on a background thread, in submission order.
+
+    ``submit`` blocks once ``depth`` items are waiting, which keeps memory
+    bounded when the sink is slower than the producer. The first sink error
+    is re-raised by the next ``submit`` or by ``close``; items after it are
+    dropped.
+
+    Example:
+        with BackgroundWriter(lambda rows: client.append_rows(tab, rows)) as w:
+            for rows in pages:
+                w.submit(rows)
+    """
+
+    def __init__(self, sink: Callable[[T], None], depth: int = 1) -> None:
+        """
+        Start the writer thread.
+
+        Args:
+            sink: Called with every submitted item.
+            depth: Items allowed to wait for the sink.
+        """
+        self._sink = sink
+        self._queue: queue.Queue = queue.Queue(maxsize=depth)
+        self._error: Optional[BaseException] = None
+        self.written = 0
+        self._thread = threading.Thread(
+            target=propagate_context(self._run), name="writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            if self._error is not None:
+                continue
+            try:
+                self._sink(item)
+                self.written += 1
+            except BaseException as exc:
+                self._error = exc
+
+    def submit(self, item: T) -> None:
+        """Queue an item for the sink."""
+        if self._error is not None:
+            raise self._error
+        self._queue.put(item)
+
+    def close(self) -> None:
+        """Wait for queued items to be written and re-raise any sink error."""
+        if self._thread.is_alive():
+            self._queue.put(_DONE)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "BackgroundWriter[T]":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Let the original exception win over a sink error.
+        try:
+            self.close()
+        except BaseException:
+            pass
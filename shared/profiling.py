@@ -0,0 +1,196 @@
+"""
+On-demand profiling of single Cloud Function invocations.
+
+Profiling is opt-in per deployment with ``PROFILING_ENABLED``. Only then
+does an entry point import this module and check
+``requested_profile(request)``, running the handler through
+``run_profiled`` when a caller asked for it; otherwise the handler is
+called directly and nothing here is involved.
+
+A profile is requested with the ``X-Profile`` header or the ``profile``
+query parameter:
+
+- ``1`` / ``cprofile``: deterministic ``cProfile`` of the request thread,
+  saved as a ``.pstats`` file (``python -m pstats <file>``, snakeviz, ...);
+- ``sample``: a sampling profiler that records the stacks of all threads
+  every few milliseconds, saved as collapsed stacks (``flamegraph.pl``,
+  speedscope). Use it when the work runs on worker threads, as in
+  ``evaluate_candidate``.
+
+Profiles are written under ``profile_dir``, the system temp directory by
+default. The JSON response gets a ``profile`` object with the file path;
+with ``X-Profile-Output: inline`` (or ``profile_output=inline``) it also
+carries the profile itself, so no access to the instance's disk is needed.
+"""
+
+import base64
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Optional
+
+from shared.config import get_config
+from shared.logging import get_correlation_id, get_logger
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_PARAM = "profile"
+OUTPUT_HEADER = "X-Profile-Output"
+OUTPUT_PARAM = "profile_output"
+
+CPROFILE = "cprofile"
+SAMPLE = "sample"
+_MODES = {"1": CPROFILE, "true": CPROFILE, CPROFILE: CPROFILE, SAMPLE: SAMPLE}
+
+# Functions listed in the inline cProfile summary.
+SUMMARY_LIMIT = 40
+
+logger = get_logger(__name__)
+
+
+def requested_profile(request: Any) -> Optional[str]:
+    """
+    Return the profiler a request asked for, or None.
+
+    Args:
+        request: The incoming Flask request.
+
+    Returns:
+        ``"cprofile"`` or ``"sample"``; None when profiling was not
+        requested, is disabled by ``profiling_enabled``, or the value is
+        unknown.
+    """
+    value = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_PARAM)
+    if not value:
+        return None
+    mode = _MODES.get(value.strip().lower())
+    if mode is None or not get_config()["profiling_enabled"]:
+        return None
+    return mode
+
+
+class StackSampler:
+    """
+    Samples the stacks of every thread on a background thread.
+
+    Example:
+        with StackSampler() as sampler:
+            work()
+        print(sampler.collapsed())
+    """
+
+    def __init__(self, interval_seconds: float = 0.005) -> None:
+        """
+        Initialize the sampler.
+
+        Args:
+            interval_seconds: Time between samples.
+        """
+        self.interval_seconds = interval_seconds
+        self.samples = 0
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    filename = os.path.basename(code.co_filename)
+                    stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format, one ``stack count`` per line."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.counts.items())
+
+
+def _profile_path(function: str, extension: str) -> str:
+    directory = get_config()["profile_dir"] or tempfile.gettempdir()
+    os.makedirs(directory, exist_ok=True)
+    name = f"{function}-{int(time.time() * 1000)}-{get_correlation_id() or os.getpid()}"
+    return os.path.join(directory, f"{name}.{extension}")
+
+
+def run_profiled(
+    function: str,
+    handler: Callable[[Any], tuple[str, int]],
+    request: Any,
+    mode: str,
+) -> tuple[str, int]:
+    """
+    Run one invocation under a profiler and save the profile.
+
+    Args:
+        function: Function name, used in the file name.
+        handler: The function's ``handle``.
+        request: The incoming request, passed to ``handler``.
+        mode: ``"cprofile"`` or ``"sample"``, from ``requested_profile``.
+
+    Returns:
+        The handler's response. A JSON object body gains a ``profile`` entry
+        with the file path and, for inline output, the profile data.
+    """
+    inline = (
+        request.headers.get(OUTPUT_HEADER) or request.args.get(OUTPUT_PARAM) or ""
+    ).lower() == "inline"
+    report: dict[str, Any] = {"format": mode}
+
+    if mode == SAMPLE:
+        with StackSampler() as sampler:
+            body, status = handler(request)
+        path = _profile_path(function, "collapsed")
+        data = sampler.collapsed()
+        with open(path, "w") as f:
+            f.write(data)
+        report["samples"] = sampler.samples
+        if inline:
+            report["collapsed"] = data
+    else:
+        profiler = cProfile.Profile()
+        body, status = profiler.runcall(handler, request)
+        path = _profile_path(function, "pstats")
+        profiler.dump_stats(path)
+        if inline:
+            summary = io.StringIO()
+            stats = pstats.Stats(profiler, stream=summary)
+            stats.sort_stats("cumulative").print_stats(SUMMARY_LIMIT)
+            report["summary"] = summary.getvalue()
+            with open(path, "rb") as f:
+                report["pstats_base64"] = base64.b64encode(f.read()).decode("ascii")
+
+    report["path"] = path
+    logger.info("Profile written", extra={"profile_path": path, "format": mode})
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return body, status
+    if isinstance(payload, dict):
+        payload["profile"] = report
+        body = json.dumps(payload)
+    return body, status
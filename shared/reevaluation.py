@@ -0,0 +1,133 @@
+"""
+Planning of re-evaluations after prompt changes.
+
+Each evaluation records the prompt version and a hash of the prompt content
+it was made with. Comparing the latest evaluation of every candidate and job
+with the job's current ``default_prompt_version`` and that prompt's content
+yields the minimal set of candidates that need a new evaluation; everything
+evaluated with the current prompt is skipped.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterable
+
+from shared.llm.prompt_builder import prompt_content_hash
+from shared.schemas import CandidateEvaluation, JobPost, Prompt
+
+# Why a candidate needs a new evaluation.
+REASON_VERSION = "prompt_version_changed"
+REASON_CONTENT = "prompt_content_changed"
+REASON_UNHASHED = "prompt_hash_missing"
+
+
+@dataclass(frozen=True)
+class ReevaluationItem:
+    """A candidate to evaluate again for a job with its current prompt."""
+
+    candidate_id: str
+    job_post_id: str
+    prompt_version: str
+    reason: str
+
+
+@dataclass
+class ReevaluationPlan:
+    """Minimal work set and what was skipped."""
+
+    items: list[ReevaluationItem] = field(default_factory=list)
+    up_to_date: int = 0
+    # Job posts without a prompt row for their default version.
+    missing_prompts: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def counts(self) -> dict[str, int]:
+        """Number of items per reason."""
+        return dict(Counter(item.reason for item in self.items))
+
+
+def as_utc(value: datetime) -> datetime:
+    """Treat a naive timestamp as UTC, so naive and aware ones compare."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def latest_evaluations(
+    evaluations: Iterable[CandidateEvaluation],
+) -> dict[tuple[str, str], CandidateEvaluation]:
+    """Latest evaluation per ``(candidate_id, job_post_id)``."""
+    latest: dict[tuple[str, str], CandidateEvaluation] = {}
+    for evaluation in evaluations:
+        key = (evaluation.candidate_id, evaluation.job_post_id)
+        current = latest.get(key)
+        evaluated_at = as_utc(evaluation.evaluated_at)
+        if current is None or evaluated_at >= as_utc(current.evaluated_at):
+            latest[key] = evaluation
+    return latest
+
+
+def plan_reevaluation(
+    job_posts: Iterable[JobPost],
+    prompts: Iterable[Prompt],
+    evaluations: Iterable[CandidateEvaluation],
+    include_unhashed: bool = False,
+) -> ReevaluationPlan:
+    """
+    Find the candidates whose latest evaluation used an outdated prompt.
+
+    A latest evaluation is outdated when its ``prompt_version`` differs from
+    the job's ``default_prompt_version``, or when the version matches but
+    its ``prompt_hash`` differs from the hash of that prompt's content.
+
+    Args:
+        job_posts: Job posts; inactive ones are ignored.
+        prompts: Rows of the ``prompts`` tab.
+        evaluations: Existing evaluations.
+        include_unhashed: Also re-evaluate rows of the current version that
+            predate ``prompt_hash`` and so cannot be compared. Off by
+            default to avoid a blanket re-scoring of old rows.
+
+    Returns:
+        The items to re-evaluate, in evaluation order.
+    """
+    contents = {(p.job_post_id, p.prompt_version): p.prompt_content for p in prompts}
+    plan = ReevaluationPlan()
+
+    targets: dict[str, tuple[str, str]] = {}
+    for job in job_posts:
+        if not job.active:
+            continue
+        content = contents.get((job.job_post_id, job.default_prompt_version))
+        if content is None:
+            plan.missing_prompts.append(job.job_post_id)
+            continue
+        targets[job.job_post_id] = (
+            job.default_prompt_version,
+            prompt_content_hash(content),
+        )
+
+    for (candidate_id, job_post_id), evaluation in latest_evaluations(
+        evaluations
+    ).items():
+        target = targets.get(job_post_id)
+        if target is None:
+            continue
+        version, content_hash = target
+        if evaluation.prompt_version != version:
+            reason = REASON_VERSION
+        elif evaluation.prompt_hash is None:
+            if not include_unhashed:
+                plan.up_to_date += 1
+                continue
+            reason = REASON_UNHASHED
+        elif evaluation.prompt_hash != content_hash:
+            reason = REASON_CONTENT
+        else:
+            plan.up_to_date += 1
+            continue
+        plan.items.append(
+            ReevaluationItem(candidate_id, job_post_id, version, reason)
+        )
+    return plan
@@ -1,14 +1,27 @@
 """
 Data schemas for the AI Hiring MVP.
 
-Pydantic models for candidates, evaluations, job posts, and prompts.
+Pydantic models for candidates, evaluations, job posts, and prompts,
+plus a bulk codec between sheet rows and models.
 """
 
+import types
 from datetime import datetime
 from enum import Enum
-from typing import Optional
-
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Generic,
+    Optional,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 
 
 # --------------------------------
@@ -105,6 +118,9 @@ class CandidateEvaluation(BaseModel):
     decision: Decision = Decision.HOLD
     teamtailor_status: TeamtailorStatus = TeamtailorStatus.NOT_SENT
 
+    # Hash of the prompt content used; last so older columns keep their place
+    prompt_hash: Optional[str] = None
+
 
 # --------------------------------
 # TABLE 3: job_posts
@@ -138,3 +154,382 @@ class Prompt(BaseModel):
     prompt_version: str
     job_post_id: str
     prompt_content: str
+
+
+# --------------------------------
+# TABLE 5: sync_state
+# --------------------------------
+
+
+class SyncState(BaseModel):
+    """
+    Ingestion high-water mark for one job post.
+    Newest source record already stored, by creation time then ID.
+    """
+
+    job_post_id: str
+    source: Source
+    cursor_created_at: datetime
+    cursor_id: str
+    updated_at: datetime
+
+
+# --------------------------------
+# Sheet registry
+# --------------------------------
+
+# Tab name -> row model. Column order of each tab follows ``model_fields``.
+SHEET_MODELS: dict[str, type[BaseModel]] = {
+    "candidates_raw": CandidateRaw,
+    "candidates_evaluations": CandidateEvaluation,
+    "job_posts": JobPost,
+    "prompts": Prompt,
+    "sync_state": SyncState,
+}
+
+
+# --------------------------------
+# Row codec
+# --------------------------------
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_BOOL_CELLS = {"TRUE": True, "FALSE": False, "true": True, "false": False}
+
+
+def unwrap_optional(annotation: Any) -> Any:
+    """Return ``X`` for ``Optional[X]``, or the annotation unchanged."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _cell_parser(annotation: Any) -> Callable[[Any], Any]:
+    """
+    Build a fast parser from a non-empty cell to a field value.
+
+    Common types are converted directly; anything unusual, and any value
+    the fast path rejects, goes through pydantic so errors stay readable.
+    """
+    adapter = TypeAdapter(annotation)
+    fallback = adapter.validate_python
+    kind = unwrap_optional(annotation)
+
+    if kind is str:
+        return lambda value: value if isinstance(value, str) else fallback(value)
+    if isinstance(kind, type) and issubclass(kind, Enum):
+        members = {member.value: member for member in kind}
+
+        def parse_enum(value: Any) -> Any:
+            member = members.get(value)
+            return member if member is not None else fallback(value)
+
+        return parse_enum
+    if kind is bool:
+
+        def parse_bool(value: Any) -> Any:
+            parsed = _BOOL_CELLS.get(value) if isinstance(value, str) else None
+            return parsed if parsed is not None else fallback(value)
+
+        return parse_bool
+    if kind is int:
+
+        def parse_int(value: Any) -> Any:
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return fallback(value)
+
+        return parse_int
+    if kind is datetime:
+
+        def parse_datetime(value: Any) -> Any:
+            try:
+                return datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                return fallback(value)
+
+        return parse_datetime
+    return fallback
+
+
+def _cell_formatter(annotation: Any) -> Callable[[Any], Any]:
+    """Build a fast formatter from a field value to a cell, see ``format_cell``."""
+    kind = unwrap_optional(annotation)
+    if kind is str or kind is int:
+        return lambda value: "" if value is None else value
+    if isinstance(kind, type) and issubclass(kind, Enum):
+        return lambda value: (
+            value.value if isinstance(value, Enum) else format_cell(value)
+        )
+    if kind is datetime:
+        return lambda value: (
+            value.isoformat() if isinstance(value, datetime) else format_cell(value)
+        )
+    return format_cell
+
+
+def format_cell(value: Any) -> Any:
+    """Convert a model value into what is written to a cell."""
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return value
+
+
+class RowCodec(Generic[ModelT]):
+    """
+    Bulk conversion between sheet rows and models of one tab.
+
+    Decoding works column by column: each column is converted with a parser
+    chosen once per field (dict lookups for enums, ``fromisoformat`` for
+    datetimes) and rows are assembled with ``model_construct``, skipping
+    per-row model validation. Cell types are still checked, and so are the
+    columns that need more: an empty cell of a required field, or a value
+    breaking a field constraint such as the ``fit_score`` bounds, sends its
+    row through ``model_validate``, which raises the ``ValidationError``.
+    ``strict=True`` validates every row through ``TypeAdapter(list[Model])``
+    in a single call instead.
+
+    Empty cells of optional fields become the field's default.
+
+    Example:
+        codec = get_row_codec(CandidateRaw)
+        records = codec.decode(rows[1:], header=rows[0])
+        rows = codec.encode(records)
+    """
+
+    def __init__(self, model: type[ModelT]) -> None:
+        """
+        Precompute the column map and the per-field parsers.
+
+        Args:
+            model: The schema model of the tab.
+        """
+        self.model = model
+        self.fields = list(model.model_fields)
+        self.columns = {name: i for i, name in enumerate(self.fields)}
+        self._parsers = {
+            name: _cell_parser(field.annotation)
+            for name, field in model.model_fields.items()
+        }
+        self._defaults = {
+            name: None if field.is_required() else field.get_default()
+            for name, field in model.model_fields.items()
+        }
+        self._required = {
+            name for name, field in model.model_fields.items() if field.is_required()
+        }
+        # Constraints (``Field(ge=1)``, ...) the cell parsers do not apply.
+        self._constraints = {
+            name: TypeAdapter(Annotated[(field.annotation, *field.metadata)])
+            for name, field in model.model_fields.items()
+            if field.metadata
+        }
+        self._formatters = [
+            _cell_formatter(field.annotation) for field in model.model_fields.values()
+        ]
+        self._list_adapter = TypeAdapter(list[model])
+
+    def _source_columns(self, header: Optional[list[str]]) -> list[tuple[str, int]]:
+        """Pair each known field with its column index in the rows."""
+        if header is None:
+            return list(self.columns.items())
+        return [
+            (name, index) for index, name in enumerate(header) if name in self.columns
+        ]
+
+    def decode_columns(
+        self, rows: list[list[Any]], header: Optional[list[str]] = None
+    ) -> dict[str, list[Any]]:
+        """
+        Parse rows into one list of field values per field.
+
+        Args:
+            rows: Data rows, header excluded; short rows are padded.
+            header: Column names of ``rows``; defaults to ``model_fields``
+                order.
+
+        Returns:
+            Field name -> values, one per row.
+
+        Raises:
+            ValidationError: If a row leaves a required field empty or
+                breaks a field constraint.
+        """
+        source = self._source_columns(header)
+        columns = {}
+        for name, index in source:
+            parse = self._parsers[name]
+            default = self._defaults[name]
+            cells = [row[index] if index < len(row) else "" for row in rows]
+            values = [
+                default if cell == "" or cell is None else parse(cell)
+                for cell in cells
+            ]
+            position = self._first_invalid(name, values)
+            if position is not None:
+                self._validate_row(rows[position], source)
+            columns[name] = values
+        missing = self._required.difference(name for name, _ in source)
+        if rows and missing:
+            self._validate_row(rows[0], source)
+        return columns
+
+    def decode(
+        self,
+        rows: list[list[Any]],
+        header: Optional[list[str]] = None,
+        strict: bool = False,
+    ) -> list[ModelT]:
+        """
+        Convert data rows into models.
+
+        Args:
+            rows: Data rows, header excluded.
+            header: Column names of ``rows``; defaults to ``model_fields``
+                order.
+            strict: Fully validate every row, constraints included.
+
+        Returns:
+            One model per row.
+
+        Raises:
+            ValidationError: If a row is invalid; without ``strict`` only
+                empty required cells and constraint violations are found.
+        """
+        if strict:
+            source = self._source_columns(header)
+            data = [
+                {
+                    name: row[index]
+                    for name, index in source
+                    if index < len(row) and row[index] != ""
+                }
+                for row in rows
+            ]
+            return self._list_adapter.validate_python(data)
+
+        return self.construct_columns(self.decode_columns(rows, header), len(rows))
+
+    def _first_invalid(self, name: str, values: list[Any]) -> Optional[int]:
+        """Position of the first value the fast parsers let through wrongly."""
+        if name in self._required and None in values:
+            return values.index(None)
+        adapter = self._constraints.get(name)
+        if adapter is not None:
+            for position, value in enumerate(values):
+                if value is None:
+                    continue
+                try:
+                    adapter.validate_python(value)
+                except ValidationError:
+                    return position
+        return None
+
+    def _validate_row(self, row: list[Any], source: list[tuple[str, int]]) -> None:
+        """Validate one row as ``strict`` decoding would, raising its errors."""
+        data = {
+            name: row[index]
+            for name, index in source
+            if index < len(row) and row[index] != ""
+        }
+        self.model.model_validate(data)
+
+    def parse_cell(self, name: str, value: Any) -> Any:
+        """
+        Parse one cell of field ``name``; empty cells become the default.
+
+        Raises:
+            ValidationError: If the cell of a required field is empty or the
+                value breaks the field's constraints.
+        """
+        if value == "" or value is None:
+            parsed = self._defaults[name]
+            if name not in self._required:
+                return parsed
+        else:
+            parsed = self._parsers[name](value)
+            if self._first_invalid(name, [parsed]) is None:
+                return parsed
+        # Validate the field alone to raise an error naming it.
+        self.model.__pydantic_validator__.validate_assignment(
+            self.model.model_construct(), name, parsed
+        )
+        return parsed
+
+    def construct_columns(
+        self, columns: dict[str, list[Any]], count: int
+    ) -> list[ModelT]:
+        """
+        Assemble models from already parsed field columns, unvalidated.
+
+        Args:
+            columns: Field name -> values, as from ``decode_columns``;
+                missing fields get their defaults.
+            count: Number of rows.
+
+        Returns:
+            One model per row.
+        """
+        columns = dict(columns)
+        for name in self.fields:
+            if name not in columns:
+                columns[name] = [self._defaults[name]] * count
+        names = list(columns)
+        fields_set = set(self.fields)
+        construct = self.model.model_construct
+        return [
+            construct(_fields_set=set(fields_set), **dict(zip(names, values)))
+            for values in zip(*columns.values())
+        ]
+
+    def decode_partial(self, fields: dict[str, Any]) -> ModelT:
+        """
+        Build a model holding only some fields, from their cell values.
+
+        Fields left out, and given fields whose cell is empty, are at their
+        defaults (None for required fields); ``model_fields_set`` tells
+        which were given.
+        """
+        data = {
+            name: (
+                self._defaults[name]
+                if value == "" or value is None
+                else self._parsers[name](value)
+            )
+            for name, value in fields.items()
+        }
+        return self.model.model_construct(_fields_set=set(data), **data)
+
+    def encode(self, records: list[ModelT]) -> list[list[Any]]:
+        """Convert models into rows in ``model_fields`` order, column by column."""
+        if not records:
+            return []
+        dicts = [record.__dict__ for record in records]
+        columns = [
+            list(map(formatter, [data.get(name) for data in dicts]))
+            for name, formatter in zip(self.fields, self._formatters)
+        ]
+        return [list(row) for row in zip(*columns)]
+
+    def encode_one(self, record: ModelT) -> list[Any]:
+        """Convert one model into a row in ``model_fields`` order."""
+        data = record.__dict__
+        return [
+            formatter(data.get(name))
+            for name, formatter in zip(self.fields, self._formatters)
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_row_codec(model: type[ModelT]) -> RowCodec[ModelT]:
+    """Return the shared codec of a model."""
+    return RowCodec(model)
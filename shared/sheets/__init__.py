@@ -3,9 +3,70 @@ Google Sheets integration subpackage.
 
 Provides client and repository abstractions for reading/writing
 candidate data and prompts from Google Sheets.
+
+Names are imported from their modules on first use (see ``shared.lazy``).
 """
 
-from shared.sheets.client import SheetsClient
-from shared.sheets.repositories import CandidateRepository, PromptRepository
+from typing import TYPE_CHECKING
+
+from shared.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from shared.sheets.batch import BatchResult, PendingRead, SheetsBatch
+    from shared.sheets.cache import (
+        SheetSnapshotCache,
+        TabSnapshot,
+        get_snapshot_cache,
+    )
+    from shared.sheets.client import SheetsClient
+    from shared.sheets.dedup import CandidateDedupIndex
+    from shared.sheets.pending import (
+        PendingPush,
+        PendingPushView,
+        get_pending_push_view,
+    )
+    from shared.sheets.repositories import (
+        CandidateRepository,
+        EvaluationRepository,
+        PromptRepository,
+        SyncStateRepository,
+    )
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "SheetsClient": "shared.sheets.client",
+        "SheetsBatch": "shared.sheets.batch",
+        "PendingRead": "shared.sheets.batch",
+        "BatchResult": "shared.sheets.batch",
+        "SheetSnapshotCache": "shared.sheets.cache",
+        "TabSnapshot": "shared.sheets.cache",
+        "get_snapshot_cache": "shared.sheets.cache",
+        "CandidateRepository": "shared.sheets.repositories",
+        "CandidateDedupIndex": "shared.sheets.dedup",
+        "EvaluationRepository": "shared.sheets.repositories",
+        "PendingPush": "shared.sheets.pending",
+        "PendingPushView": "shared.sheets.pending",
+        "get_pending_push_view": "shared.sheets.pending",
+        "PromptRepository": "shared.sheets.repositories",
+        "SyncStateRepository": "shared.sheets.repositories",
+    },
+)
 
-__all__ = ["SheetsClient", "CandidateRepository", "PromptRepository"]
+__all__ = [
+    "SheetsClient",
+    "SheetsBatch",
+    "PendingRead",
+    "BatchResult",
+    "SheetSnapshotCache",
+    "TabSnapshot",
+    "get_snapshot_cache",
+    "CandidateRepository",
+    "CandidateDedupIndex",
+    "EvaluationRepository",
+    "PendingPush",
+    "PendingPushView",
+    "get_pending_push_view",
+    "PromptRepository",
+    "SyncStateRepository",
+]
@@ -0,0 +1,147 @@
+"""
+A1 notation helpers.
+
+Builds ranges from row and column numbers and coalesces sets of dirty
+rows into the fewest contiguous rectangular ranges.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+_RANGE_START_RE = re.compile(r"![A-Z]+(\d+)")
+
+
+def column_letter(index: int) -> str:
+    """
+    Convert a zero-based column index to its A1 letters.
+
+    Args:
+        index: Column index, 0 for column A.
+
+    Returns:
+        Column letters, e.g. ``"A"``, ``"Z"``, ``"AA"``.
+    """
+    if index < 0:
+        raise ValueError("Column index must be non-negative")
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def a1_range(
+    sheet_name: str, first_row: int, last_row: int, first_col: int, last_col: int
+) -> str:
+    """
+    Build an A1 range for a rectangle of cells.
+
+    Args:
+        sheet_name: Tab name.
+        first_row: First sheet row, 1-based.
+        last_row: Last sheet row, inclusive.
+        first_col: First column, 0-based.
+        last_col: Last column, 0-based and inclusive.
+
+    Returns:
+        A range such as ``"candidates_raw!A5:J9"``.
+    """
+    start = f"{column_letter(first_col)}{first_row}"
+    end = f"{column_letter(last_col)}{last_row}"
+    return f"{sheet_name}!{start}:{end}"
+
+
+def column_range(
+    sheet_name: str,
+    column: int,
+    first_row: int = 2,
+    last_column: Optional[int] = None,
+) -> str:
+    """
+    Build an open-ended A1 range covering columns from ``first_row`` down.
+
+    Args:
+        sheet_name: Tab name.
+        column: Column index, 0-based.
+        first_row: First sheet row, 1-based; 2 skips the header.
+        last_column: Last column, 0-based and inclusive; defaults to
+            ``column``.
+
+    Returns:
+        A range such as ``"candidates_raw!F2:F"`` or ``"candidates_raw!A2:C"``.
+    """
+    first = column_letter(column)
+    last = column_letter(column if last_column is None else last_column)
+    return f"{sheet_name}!{first}{first_row}:{last}"
+
+
+def coalesce_columns(columns: Iterable[int]) -> list[tuple[int, int]]:
+    """
+    Merge column indexes into contiguous ``(first_col, last_col)`` runs.
+
+    Args:
+        columns: Column indexes, 0-based, in any order.
+
+    Returns:
+        Inclusive runs ordered by column, e.g. ``[(0, 1), (9, 9)]``.
+    """
+    runs: list[tuple[int, int]] = []
+    for column in sorted(set(columns)):
+        if runs and runs[-1][1] == column - 1:
+            runs[-1] = (runs[-1][0], column)
+        else:
+            runs.append((column, column))
+    return runs
+
+
+def first_row_of(range_name: str) -> int:
+    """Return the first row number of an A1 range like ``"tab!A5:J7"``."""
+    match = _RANGE_START_RE.search(range_name)
+    if match is None:
+        raise ValueError(f"Range has no row number: {range_name!r}")
+    return int(match.group(1))
+
+
+@dataclass(frozen=True)
+class RowBlock:
+    """Contiguous sheet rows sharing the same column span."""
+
+    first_row: int
+    last_row: int
+    first_col: int
+    last_col: int
+
+    @property
+    def rows(self) -> range:
+        return range(self.first_row, self.last_row + 1)
+
+
+def coalesce_rows(spans: dict[int, tuple[int, int]]) -> list[RowBlock]:
+    """
+    Merge dirty rows into the fewest contiguous blocks.
+
+    Neighbouring rows are merged when they cover the same column span, so
+    a run of rows with only ``teamtailor_status`` changed becomes a single
+    one-column range.
+
+    Args:
+        spans: Sheet row number -> ``(first_col, last_col)`` to write.
+
+    Returns:
+        Blocks ordered by row.
+    """
+    blocks: list[RowBlock] = []
+    for row in sorted(spans):
+        first_col, last_col = spans[row]
+        previous = blocks[-1] if blocks else None
+        if (
+            previous is not None
+            and previous.last_row == row - 1
+            and (previous.first_col, previous.last_col) == (first_col, last_col)
+        ):
+            blocks[-1] = RowBlock(previous.first_row, row, first_col, last_col)
+        else:
+            blocks.append(RowBlock(row, row, first_col, last_col))
+    return blocks
@@ -0,0 +1,155 @@
+"""
+Batched Sheets operations.
+
+Collects reads, writes and appends and sends each group as a single
+``values.batchGet`` / ``values.batchUpdate`` / ``values.append`` call,
+so the number of API calls per flush stays constant regardless of how
+many ranges are touched.
+"""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from shared.sheets.client import SheetsClient
+
+
+class PendingRead:
+    """Handle for a queued read; holds the values once the batch is flushed."""
+
+    def __init__(self, range_name: str) -> None:
+        self.range_name = range_name
+        self._values: Optional[list[list[Any]]] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the owning batch has been flushed."""
+        return self._values is not None
+
+    @property
+    def values(self) -> list[list[Any]]:
+        """The rows read for this range."""
+        if self._values is None:
+            raise RuntimeError(f"Read of {self.range_name!r} has not been flushed yet")
+        return self._values
+
+
+@dataclass
+class BatchResult:
+    """Per-range outcome of one flush."""
+
+    reads: dict[str, list[list[Any]]] = field(default_factory=dict)
+    written_ranges: list[str] = field(default_factory=list)
+    appended_rows: dict[str, int] = field(default_factory=dict)
+    api_calls: int = 0
+
+
+class SheetsBatch:
+    """
+    Accumulates Sheets operations and sends them in as few calls as possible.
+
+    Reads become one ``batchGet``, writes one ``batchUpdate`` and appends one
+    ``append`` per sheet. Once ``max_ranges`` operations are queued the batch
+    flushes itself. Used as a context manager it flushes on a clean exit and
+    drops queued writes if the block raised.
+
+    Example:
+        with client.batch() as batch:
+            header = batch.read("candidates_raw!1:1")
+            batch.write("candidates_evaluations!K5", [["sent"]])
+        header.values
+    """
+
+    DEFAULT_MAX_RANGES = 100
+
+    def __init__(self, client: "SheetsClient", max_ranges: int = DEFAULT_MAX_RANGES) -> None:
+        """
+        Initialize an empty batch.
+
+        Args:
+            client: The client used to send the batched calls.
+            max_ranges: Queued operations that trigger an automatic flush.
+        """
+        if max_ranges < 1:
+            raise ValueError("max_ranges must be at least 1")
+        self.client = client
+        self.max_ranges = max_ranges
+        self._reads: list[PendingRead] = []
+        self._writes: list[tuple[str, list[list[Any]]]] = []
+        self._appends: dict[str, list[list[Any]]] = {}
+        self.results: list[BatchResult] = []
+
+    def __enter__(self) -> "SheetsBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            self.clear()
+
+    def __len__(self) -> int:
+        return len(self._reads) + len(self._writes) + len(self._appends)
+
+    def read(self, range_name: str) -> PendingRead:
+        """Queue a read; the returned handle is filled on flush."""
+        pending = PendingRead(range_name)
+        self._reads.append(pending)
+        self._maybe_flush()
+        return pending
+
+    def write(self, range_name: str, values: list[list[Any]]) -> None:
+        """Queue a write of ``values`` to ``range_name``."""
+        self._writes.append((range_name, values))
+        self._maybe_flush()
+
+    def append(self, sheet_name: str, rows: list[list[Any]]) -> None:
+        """Queue rows to append; appends to the same sheet are merged."""
+        if not rows:
+            return
+        self._appends.setdefault(sheet_name, []).extend(rows)
+        self._maybe_flush()
+
+    def clear(self) -> None:
+        """Drop all queued operations without sending them."""
+        self._reads = []
+        self._writes = []
+        self._appends = {}
+
+    def flush(self) -> BatchResult:
+        """
+        Send all queued operations.
+
+        Writes are sent before reads so a read in the same batch observes
+        the written values.
+
+        Returns:
+            The per-range results of this flush.
+        """
+        reads, writes, appends = self._reads, self._writes, self._appends
+        self.clear()
+        result = BatchResult()
+
+        if writes:
+            self.client.batch_write(writes)
+            result.written_ranges = [range_name for range_name, _ in writes]
+            result.api_calls += 1
+
+        for sheet_name, rows in appends.items():
+            self.client.append_rows(sheet_name, rows)
+            result.appended_rows[sheet_name] = len(rows)
+            result.api_calls += 1
+
+        if reads:
+            values = self.client.batch_read([pending.range_name for pending in reads])
+            result.api_calls += 1
+            for pending, range_values in zip(reads, values):
+                pending._values = range_values
+                result.reads[pending.range_name] = range_values
+
+        self.results.append(result)
+        return result
+
+    def _maybe_flush(self) -> None:
+        if len(self) >= self.max_ranges:
+            self.flush()
@@ -0,0 +1,165 @@
+"""
+In-process snapshot cache for spreadsheet tabs.
+
+Cloud Functions keep module state between warm invocations, so tabs read
+once are kept here, parsed into their schema models, and reused until the
+TTL runs out. An expired snapshot is only re-read when the spreadsheet
+revision reported by Drive has changed since it was loaded.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from pydantic import BaseModel
+
+from shared.config import get_config
+from shared.metrics import incr
+from shared.schemas import SHEET_MODELS
+from shared.sheets.client import SheetsClient
+from shared.sheets.rows import numbered_rows_to_models
+
+
+@dataclass
+class TabSnapshot:
+    """Parsed contents of one tab at a given spreadsheet revision."""
+
+    sheet_name: str
+    header: list[str]
+    records: list[BaseModel]
+    row_numbers: list[int]
+    revision: str
+    loaded_at: float
+
+
+class SheetSnapshotCache:
+    """
+    TTL-bounded cache of parsed tabs for one spreadsheet.
+
+    Within the TTL snapshots are served without any API call. After it the
+    cache asks Drive for the current revision once for all requested tabs and
+    re-reads (in one ``batchGet``) only if the spreadsheet changed.
+    """
+
+    def __init__(
+        self,
+        client: SheetsClient,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            client: Client for the spreadsheet being cached.
+            ttl_seconds: Snapshot lifetime. Defaults to
+                ``sheets_cache_ttl_seconds`` from the config.
+            clock: Monotonic time source, injectable for tests.
+        """
+        self.client = client
+        if ttl_seconds is None:
+            ttl_seconds = get_config()["sheets_cache_ttl_seconds"]
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._snapshots: dict[str, TabSnapshot] = {}
+        self._lock = threading.Lock()
+
+    def get(self, sheet_name: str) -> TabSnapshot:
+        """Return the snapshot of a single tab, loading it if needed."""
+        return self.get_many([sheet_name])[sheet_name]
+
+    def get_records(self, sheet_name: str) -> list[BaseModel]:
+        """Return the parsed records of a tab."""
+        return self.get(sheet_name).records
+
+    def get_many(self, sheet_names: list[str]) -> dict[str, TabSnapshot]:
+        """
+        Return snapshots of several tabs, refreshing stale ones together.
+
+        Args:
+            sheet_names: Tabs to return; each must be in ``SHEET_MODELS``.
+
+        Returns:
+            Mapping of tab name to snapshot.
+        """
+        for sheet_name in sheet_names:
+            if sheet_name not in SHEET_MODELS:
+                raise KeyError(f"Unknown sheet: {sheet_name}")
+
+        with self._lock:
+            now = self._clock()
+            stale = [
+                name
+                for name in sheet_names
+                if name not in self._snapshots
+                or now - self._snapshots[name].loaded_at >= self.ttl_seconds
+            ]
+            loaded = self._refresh(stale, now) if stale else 0
+            incr("sheets_cache.hits", len(sheet_names) - loaded)
+            incr("sheets_cache.misses", loaded)
+            return {name: self._snapshots[name] for name in sheet_names}
+
+    def invalidate(self, sheet_name: Optional[str] = None) -> None:
+        """Drop one tab's snapshot, or all of them."""
+        with self._lock:
+            if sheet_name is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(sheet_name, None)
+
+    def _refresh(self, sheet_names: list[str], now: float) -> int:
+        """Reload tabs changed since their snapshot; returns how many."""
+        revision = self.client.get_revision()
+
+        to_load = []
+        for name in sheet_names:
+            snapshot = self._snapshots.get(name)
+            if snapshot is not None and snapshot.revision == revision:
+                snapshot.loaded_at = now
+            else:
+                to_load.append(name)
+        if not to_load:
+            return 0
+
+        tabs = self.client.batch_read(to_load)
+        for name, rows in zip(to_load, tabs):
+            row_numbers, records = numbered_rows_to_models(SHEET_MODELS[name], rows)
+            self._snapshots[name] = TabSnapshot(
+                sheet_name=name,
+                header=list(rows[0]) if rows else [],
+                records=records,
+                row_numbers=row_numbers,
+                revision=revision,
+                loaded_at=now,
+            )
+        return len(to_load)
+
+
+# Per-process caches keyed by spreadsheet ID; they outlive a single request.
+_caches: dict[str, SheetSnapshotCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_snapshot_cache(client: SheetsClient) -> SheetSnapshotCache:
+    """
+    Return the process-wide snapshot cache for a client's spreadsheet.
+
+    The snapshots outlive the request, the client does not: the cache
+    switches to the client of the latest caller, so services injected into
+    an earlier client are not kept for the life of the process.
+
+    Args:
+        client: Client used to load tabs on a cache miss.
+
+    Returns:
+        The shared cache, created on first use.
+    """
+    with _caches_lock:
+        cache = _caches.get(client.spreadsheet_id)
+        if cache is None:
+            cache = SheetSnapshotCache(client)
+            _caches[client.spreadsheet_id] = cache
+        else:
+            cache.client = client
+        return cache
@@ -5,36 +5,171 @@ Wraps the Google Sheets API with authentication and common operations.
 Handles credential management and API error handling.
 """
 
-from typing import Any
+from typing import Any, Optional
+
+from shared.google_api import DEFAULT_SCOPES, get_service
+from shared.sheets.batch import SheetsBatch
+
+SHEETS_SCOPES = DEFAULT_SCOPES
+
+# Values are written exactly as given; the sheets hold plain data, not formulas.
+VALUE_INPUT_OPTION = "RAW"
 
 
 class SheetsClient:
     """
     Client for interacting with Google Sheets API.
 
-    TODO: Implement authentication via service account
-    TODO: Add methods for reading ranges
-    TODO: Add methods for writing/appending rows
-    TODO: Add batch operation support
+    Single-range helpers (``read_range``, ``write_range``, ``append_rows``)
+    each cost one API call. Handlers touching many ranges should go through
+    ``batch()`` so reads and writes are grouped into ``values.batchGet`` /
+    ``values.batchUpdate`` calls.
+
+    Authentication goes through the process-wide ``CredentialProvider``
+    (``shared.auth``), so clients never mint their own access tokens.
     """
 
-    def __init__(self, spreadsheet_id: str) -> None:
+    def __init__(
+        self,
+        spreadsheet_id: str,
+        service: Optional[Any] = None,
+        drive_service: Optional[Any] = None,
+    ) -> None:
         """
         Initialize the Sheets client.
 
         Args:
             spreadsheet_id: The ID of the Google Spreadsheet to operate on.
+            service: Optional pre-built ``sheets`` v4 service resource.
+                If omitted, each access goes through ``get_service``, which
+                reuses one service per process across warm invocations.
+            drive_service: Optional pre-built ``drive`` v3 service resource,
+                used only to read the spreadsheet revision.
         """
         self.spreadsheet_id = spreadsheet_id
+        self._service = service
+        self._drive_service = drive_service
+
+    @property
+    def service(self) -> Any:
+        """
+        The underlying ``sheets`` v4 service resource.
+
+        Not stored on the client: going through ``get_service`` on every
+        access renews the shared credentials' token when it is due.
+        """
+        if self._service is not None:
+            return self._service
+        return get_service("sheets", "v4", SHEETS_SCOPES)
+
+    @property
+    def drive_service(self) -> Any:
+        """The ``drive`` v3 service resource used for file metadata."""
+        if self._drive_service is not None:
+            return self._drive_service
+        return get_service("drive", "v3", SHEETS_SCOPES)
+
+    def _values(self) -> Any:
+        return self.service.spreadsheets().values()
 
     def read_range(self, range_name: str) -> list[list[Any]]:
         """Read values from a named range."""
-        raise NotImplementedError
+        response = (
+            self._values()
+            .get(spreadsheetId=self.spreadsheet_id, range=range_name)
+            .execute()
+        )
+        return response.get("values", [])
 
     def write_range(self, range_name: str, values: list[list[Any]]) -> None:
         """Write values to a named range."""
-        raise NotImplementedError
+        self._values().update(
+            spreadsheetId=self.spreadsheet_id,
+            range=range_name,
+            valueInputOption=VALUE_INPUT_OPTION,
+            body={"values": values},
+        ).execute()
+
+    def append_rows(self, sheet_name: str, rows: list[list[Any]]) -> Optional[str]:
+        """
+        Append rows to a sheet.
+
+        Returns:
+            The A1 range the rows were written to, or None if nothing was sent.
+        """
+        if not rows:
+            return None
+        response = self._values().append(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{sheet_name}!A1",
+            valueInputOption=VALUE_INPUT_OPTION,
+            insertDataOption="INSERT_ROWS",
+            body={"values": rows},
+        ).execute()
+        return response.get("updates", {}).get("updatedRange")
+
+    def batch_read(self, range_names: list[str]) -> list[list[list[Any]]]:
+        """
+        Read several ranges in a single ``values.batchGet`` call.
+
+        Args:
+            range_names: A1 ranges to read.
+
+        Returns:
+            One list of rows per requested range, in request order.
+        """
+        if not range_names:
+            return []
+        response = (
+            self._values()
+            .batchGet(spreadsheetId=self.spreadsheet_id, ranges=range_names)
+            .execute()
+        )
+        value_ranges = response.get("valueRanges", [])
+        return [vr.get("values", []) for vr in value_ranges]
+
+    def batch_write(self, data: list[tuple[str, list[list[Any]]]]) -> None:
+        """
+        Write several ranges in a single ``values.batchUpdate`` call.
 
-    def append_rows(self, sheet_name: str, rows: list[list[Any]]) -> None:
-        """Append rows to a sheet."""
-        raise NotImplementedError
+        Args:
+            data: ``(range_name, values)`` pairs to write.
+        """
+        if not data:
+            return
+        self._values().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={
+                "valueInputOption": VALUE_INPUT_OPTION,
+                "data": [
+                    {"range": range_name, "values": values}
+                    for range_name, values in data
+                ],
+            },
+        ).execute()
+
+    def get_revision(self) -> str:
+        """
+        Return a token that changes whenever the spreadsheet is edited.
+
+        Reads the Drive file ``version`` (falling back to ``modifiedTime``),
+        which is far cheaper than re-reading any tab.
+        """
+        metadata = (
+            self.drive_service.files()
+            .get(fileId=self.spreadsheet_id, fields="version,modifiedTime")
+            .execute()
+        )
+        return str(metadata.get("version") or metadata.get("modifiedTime", ""))
+
+    def batch(self, max_ranges: int = SheetsBatch.DEFAULT_MAX_RANGES) -> SheetsBatch:
+        """
+        Start a batch of reads and writes against this spreadsheet.
+
+        Args:
+            max_ranges: Queued ranges that trigger an automatic flush.
+
+        Returns:
+            A ``SheetsBatch``; use it as a context manager to flush on exit.
+        """
+        return SheetsBatch(self, max_ranges=max_ranges)
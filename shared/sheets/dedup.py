@@ -0,0 +1,116 @@
+"""
+Key-only dedup index for ``candidates_raw``.
+
+Ingestion only needs to know whether a ``(source, source_candidate_id)``
+or an email is already stored, so instead of parsing whole rows this reads
+just those columns in one ``batchGet`` and keeps 64-bit digests of the
+keys in a set. Incoming records are then checked with set lookups.
+"""
+
+import hashlib
+from typing import Iterable
+
+from shared.schemas import CandidateRaw, Source
+from shared.sheets.a1 import column_range
+from shared.sheets.client import SheetsClient
+from shared.sheets.rows import header_for
+
+SHEET_NAME = "candidates_raw"
+KEY_FIELDS = ("source", "source_candidate_id", "email")
+
+
+def _digest(*parts: str) -> int:
+    """64-bit digest of a key; collisions are negligible at sheet scale."""
+    data = "\x1f".join(parts).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _keys(source: str, source_candidate_id: str, email: str) -> list[int]:
+    keys = [_digest("source", source, source_candidate_id)]
+    email = email.strip().lower()
+    if email:
+        keys.append(_digest("email", email))
+    return keys
+
+
+class CandidateDedupIndex:
+    """
+    Set of identity keys of stored candidates.
+
+    A candidate is a duplicate if its source ID or its normalized email is
+    already in the set.
+    """
+
+    def __init__(self) -> None:
+        self._keys: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @classmethod
+    def load(cls, client: SheetsClient) -> "CandidateDedupIndex":
+        """
+        Build the index from the key columns of ``candidates_raw``.
+
+        Args:
+            client: Client for the spreadsheet.
+
+        Returns:
+            An index of every stored candidate.
+        """
+        header = header_for(CandidateRaw)
+        ranges = [column_range(SHEET_NAME, header.index(f)) for f in KEY_FIELDS]
+        columns = client.batch_read(ranges)
+        values = [[row[0] if row else "" for row in column] for column in columns]
+
+        index = cls()
+        length = max((len(column) for column in values), default=0)
+        for column in values:
+            column.extend([""] * (length - len(column)))
+        for source, source_candidate_id, email in zip(*values):
+            if source_candidate_id or email:
+                index._keys.update(_keys(source, source_candidate_id, email))
+        return index
+
+    def contains(self, candidate: CandidateRaw) -> bool:
+        """Whether a candidate matches a stored one by source ID or email."""
+        keys = _keys(
+            Source(candidate.source).value,
+            candidate.source_candidate_id,
+            candidate.email,
+        )
+        return any(key in self._keys for key in keys)
+
+    def add(self, candidate: CandidateRaw) -> None:
+        """Record a candidate as stored."""
+        self._keys.update(
+            _keys(
+                Source(candidate.source).value,
+                candidate.source_candidate_id,
+                candidate.email,
+            )
+        )
+
+    def split_new(
+        self, candidates: Iterable[CandidateRaw]
+    ) -> tuple[list[CandidateRaw], int]:
+        """
+        Separate new candidates from duplicates and record the new ones.
+
+        Duplicates within ``candidates`` are caught too.
+
+        Args:
+            candidates: Incoming candidates, e.g. one ingested page.
+
+        Returns:
+            The new candidates and the number of duplicates skipped.
+        """
+        new = []
+        duplicates = 0
+        for candidate in candidates:
+            if self.contains(candidate):
+                duplicates += 1
+            else:
+                self.add(candidate)
+                new.append(candidate)
+        return new, duplicates
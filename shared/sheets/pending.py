@@ -0,0 +1,271 @@
+"""
+Materialized "pending push" view of ``candidates_evaluations``.
+
+Pushing to TeamTailor only concerns evaluations with ``decision=push`` and
+``teamtailor_status`` in ``{not_sent, failed}``, a small and shrinking
+share of a tab that keeps growing. The view is kept per process between
+warm invocations. On refresh it reads only the narrow
+``evaluation_id``/``decision``/``teamtailor_status`` columns and fetches
+full rows just for evaluations that became pending since the last run.
+Rows that were already pending are updated from the status columns, and
+nothing at all is read when the spreadsheet revision is unchanged.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from shared.schemas import (
+    CandidateEvaluation,
+    Decision,
+    TeamtailorStatus,
+    get_row_codec,
+)
+from shared.sheets.a1 import a1_range, coalesce_rows
+from shared.sheets.cache import get_snapshot_cache
+from shared.sheets.client import SheetsClient
+from shared.sheets.repositories import (
+    PENDING_PUSH_STATUSES,
+    EvaluationRepository,
+)
+
+STATUS_FIELDS = ["evaluation_id", "decision", "teamtailor_status"]
+
+
+@dataclass(frozen=True)
+class PendingPush:
+    """An evaluation waiting to be pushed and the sheet row holding it."""
+
+    evaluation: CandidateEvaluation
+    row_number: int
+
+
+class PendingPushView:
+    """
+    Approved evaluations not yet sent to TeamTailor, refreshed incrementally.
+
+    Example:
+        view = get_pending_push_view(client)
+        for item in view.refresh():
+            ...
+        view.set_statuses({evaluation_id: TeamtailorStatus.SENT})
+    """
+
+    def __init__(self, client: SheetsClient) -> None:
+        """
+        Initialize an empty view.
+
+        Args:
+            client: Client for the spreadsheet.
+        """
+        self.client = client
+        self._repository = EvaluationRepository(client)
+        self._codec = get_row_codec(CandidateEvaluation)
+        self._revision: Optional[str] = None
+        self._pending: dict[str, PendingPush] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def refresh(self) -> list[PendingPush]:
+        """
+        Bring the view up to date and return it.
+
+        Returns:
+            Pending evaluations in sheet order.
+        """
+        with self._lock:
+            revision = self.client.get_revision()
+            if revision != self._revision or not revision:
+                self._rebuild()
+                self._revision = revision
+            return self._snapshot()
+
+    def _rebuild(self) -> None:
+        statuses = {}
+        for row in self._repository.project(STATUS_FIELDS):
+            if not row.evaluation_id:
+                continue
+            try:
+                decision = Decision(row.decision or Decision.HOLD.value)
+                status = TeamtailorStatus(
+                    row.teamtailor_status or TeamtailorStatus.NOT_SENT.value
+                )
+            except ValueError:
+                # Unknown values typed into the sheet are never pushed.
+                continue
+            if decision == Decision.PUSH and status in PENDING_PUSH_STATUSES:
+                statuses[row.evaluation_id] = (row.row_number, status)
+
+        pending = {}
+        to_fetch = {}
+        for evaluation_id, (row_number, status) in statuses.items():
+            known = self._pending.get(evaluation_id)
+            if known is None:
+                to_fetch[row_number] = evaluation_id
+                continue
+            evaluation = known.evaluation
+            if evaluation.teamtailor_status != status:
+                evaluation = evaluation.model_copy(
+                    update={"teamtailor_status": status}
+                )
+            pending[evaluation_id] = PendingPush(evaluation, row_number)
+
+        for evaluation in self._fetch(to_fetch):
+            pending[evaluation.evaluation_id] = PendingPush(
+                evaluation, statuses[evaluation.evaluation_id][0]
+            )
+        self._pending = pending
+
+    def _fetch(self, rows: dict[int, str]) -> list[CandidateEvaluation]:
+        """Read whole rows of newly pending evaluations, in bounded batchGets."""
+        if not rows:
+            return []
+        last_col = len(self._codec.fields) - 1
+        blocks = coalesce_rows({row: (0, last_col) for row in rows})
+        ranges = [
+            a1_range(self._repository.sheet_name, b.first_row, b.last_row, 0, last_col)
+            for b in blocks
+        ]
+        with self.client.batch() as batch:
+            reads = [batch.read(range_name) for range_name in ranges]
+        evaluations = []
+        for block, read in zip(blocks, reads):
+            values = read.values + [[]] * (len(block.rows) - len(read.values))
+            for row_number, row in zip(block.rows, values):
+                # Skip rows moved or cleared since the status scan; the next
+                # refresh picks them up at their new position.
+                if not any(row):
+                    continue
+                evaluation = self._codec.decode([row])[0]
+                if evaluation.evaluation_id == rows[row_number]:
+                    evaluations.append(evaluation)
+        return evaluations
+
+    def _snapshot(self) -> list[PendingPush]:
+        return sorted(self._pending.values(), key=lambda item: item.row_number)
+
+    def set_statuses(self, statuses: dict[str, TeamtailorStatus]) -> int:
+        """
+        Write new ``teamtailor_status`` values of pending evaluations.
+
+        Rows may have moved since the last refresh (sorted or edited by a
+        recruiter), so the ``evaluation_id`` cells of the target rows are
+        read back first and evaluations found elsewhere are re-mapped (see
+        ``_locate``). All cells then go out in one ``batchUpdate``, adjacent
+        rows sharing a range. Evaluations that are no longer pending, or no
+        longer in the tab, leave the view.
+
+        Args:
+            statuses: Evaluation ID -> new status; IDs not in the view are
+                ignored.
+
+        Returns:
+            The number of ranges written.
+        """
+        with self._lock:
+            targets = {
+                evaluation_id: status
+                for evaluation_id, status in statuses.items()
+                if evaluation_id in self._pending
+            }
+            if not targets:
+                return 0
+            located = self._locate({self._pending[e].row_number: e for e in targets})
+            for evaluation_id in targets.keys() - located.keys():
+                del self._pending[evaluation_id]
+            updates = {
+                row_number: (evaluation_id, targets[evaluation_id])
+                for evaluation_id, row_number in located.items()
+            }
+            if not updates:
+                return 0
+
+            column = self._codec.columns["teamtailor_status"]
+            data = []
+            spans = {row: (column, column) for row in updates}
+            for block in coalesce_rows(spans):
+                range_name = a1_range(
+                    self._repository.sheet_name,
+                    block.first_row,
+                    block.last_row,
+                    column,
+                    column,
+                )
+                values = [[updates[row][1].value] for row in block.rows]
+                data.append((range_name, values))
+            self.client.batch_write(data)
+
+            for row_number, (evaluation_id, status) in updates.items():
+                if status in PENDING_PUSH_STATUSES:
+                    evaluation = self._pending[evaluation_id].evaluation
+                    self._pending[evaluation_id] = PendingPush(
+                        evaluation.model_copy(update={"teamtailor_status": status}),
+                        row_number,
+                    )
+                else:
+                    del self._pending[evaluation_id]
+            get_snapshot_cache(self.client).invalidate(self._repository.sheet_name)
+            return len(data)
+
+    def _locate(self, expected: dict[int, str]) -> dict[str, int]:
+        """
+        Find the current rows of evaluations expected at known rows.
+
+        The ``evaluation_id`` cells of the expected rows are read through a
+        ``SheetsBatch``, so a scattered set of rows still takes few, bounded
+        ``batchGet`` calls; only when some evaluation is no longer where it
+        was is the whole ``evaluation_id`` column read to find it.
+
+        Args:
+            expected: Sheet row -> evaluation ID last seen there.
+
+        Returns:
+            Evaluation ID -> sheet row, for the evaluations still in the tab.
+        """
+        column = self._codec.columns["evaluation_id"]
+        blocks = coalesce_rows({row: (column, column) for row in expected})
+        ranges = [
+            a1_range(
+                self._repository.sheet_name, b.first_row, b.last_row, column, column
+            )
+            for b in blocks
+        ]
+        with self.client.batch() as batch:
+            reads = [batch.read(range_name) for range_name in ranges]
+        located = {}
+        for block, read in zip(blocks, reads):
+            for row_number, row in zip(block.rows, read.values):
+                if row and row[0] == expected[row_number]:
+                    located[row[0]] = row_number
+
+        moved = set(expected.values()) - located.keys()
+        if moved:
+            for row in self._repository.project(["evaluation_id"]):
+                if row.evaluation_id in moved:
+                    located[row.evaluation_id] = row.row_number
+        return located
+
+
+# Per-process views keyed by spreadsheet ID; they outlive a single request.
+_views: dict[str, PendingPushView] = {}
+_views_lock = threading.Lock()
+
+
+def get_pending_push_view(client: SheetsClient) -> PendingPushView:
+    """
+    Return the process-wide pending push view of a client's spreadsheet.
+
+    Args:
+        client: Client used to refresh the view.
+
+    Returns:
+        The shared view, created on first use.
+    """
+    with _views_lock:
+        view = _views.get(client.spreadsheet_id)
+        if view is None:
+            view = PendingPushView(client)
+            _views[client.spreadsheet_id] = view
+        return view
@@ -2,37 +2,586 @@
 Repository abstractions for Sheets data access.
 
 Provides domain-specific data access patterns on top of the raw Sheets client.
+Each repository reads its tab once and builds hash indexes over it, so
+lookups and dedup checks are O(1) instead of a scan per call.
 """
 
-from typing import Optional
+from bisect import insort
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Generic, Iterable, NamedTuple, Optional, Sequence, TypeVar
 
-from shared.schemas import Candidate, Evaluation
+from pydantic import BaseModel
+
+from shared.columnar import ColumnarTable
+from shared.schemas import (
+    CandidateEvaluation,
+    CandidateRaw,
+    Decision,
+    Source,
+    SyncState,
+    TeamtailorStatus,
+    get_row_codec,
+)
+from shared.sheets.a1 import (
+    a1_range,
+    coalesce_columns,
+    coalesce_rows,
+    column_range,
+    first_row_of,
+)
+from shared.sheets.cache import SheetSnapshotCache
 from shared.sheets.client import SheetsClient
+from shared.sheets.rows import (
+    header_for,
+    model_to_row,
+    models_to_rows,
+    numbered_rows_to_models,
+    partial_model,
+)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+EvaluationKey = tuple[str, str, str]
+
+# Statuses of approved evaluations that still have to reach TeamTailor.
+PENDING_PUSH_STATUSES = frozenset({TeamtailorStatus.NOT_SENT, TeamtailorStatus.FAILED})
+
+
+@lru_cache(maxsize=None)
+def _projection_type(sheet_name: str, fields: tuple[str, ...]) -> type[NamedTuple]:
+    return namedtuple(f"{sheet_name}_projection", fields + ("row_number",))
+
 
+def normalize_email(email: str) -> str:
+    """Canonical form of an email address used for dedup."""
+    return email.strip().lower()
 
-class CandidateRepository:
+
+def is_pending_push(evaluation: CandidateEvaluation) -> bool:
+    """Whether a recruiter approved an evaluation that is not sent yet."""
+    return (
+        evaluation.decision == Decision.PUSH
+        and evaluation.teamtailor_status in PENDING_PUSH_STATUSES
+    )
+
+
+class _TabRepository(Generic[ModelT]):
     """
-    Repository for candidate data stored in Sheets.
+    Base for repositories backed by a single tab.
 
-    TODO: Implement candidate CRUD operations
-    TODO: Add filtering and pagination
+    Records are loaded lazily in one read (or from the snapshot cache when
+    given) and kept in sheet order together with their sheet row numbers;
+    subclasses index them by position. Changes are staged and written by
+    ``flush``, which coalesces dirty rows into the fewest contiguous ranges
+    and sends them in one ``batchUpdate`` plus one append for new rows.
     """
 
-    def __init__(self, client: SheetsClient) -> None:
+    sheet_name: str
+    model: type[ModelT]
+
+    def __init__(
+        self,
+        client: SheetsClient,
+        cache: Optional[SheetSnapshotCache] = None,
+    ) -> None:
         self.client = client
+        self.cache = cache
+        self._columns = {name: i for i, name in enumerate(header_for(self.model))}
+        self._records: Optional[list[ModelT]] = None
+        self._row_numbers: list[Optional[int]] = []
+        # Position -> fields to write; None means the whole row.
+        self._dirty: dict[int, Optional[frozenset[str]]] = {}
+        self._new: list[int] = []
+
+    def _load(self) -> list[ModelT]:
+        if self._records is None:
+            if self.cache is not None:
+                snapshot = self.cache.get(self.sheet_name)
+                row_numbers = list(snapshot.row_numbers)
+                records = list(snapshot.records)
+            else:
+                rows = self.client.read_range(self.sheet_name)
+                row_numbers, records = numbered_rows_to_models(self.model, rows)
+            self._records = records
+            self._row_numbers = list(row_numbers)
+            self._dirty = {}
+            self._new = []
+            self._reset_indexes()
+            for position, record in enumerate(records):
+                self._index(record, position)
+        return self._records
+
+    def reload(self) -> None:
+        """Forget loaded records so the next access reads the tab again."""
+        self._records = None
+
+    def get_all(self) -> list[ModelT]:
+        """Retrieve all records from the tab."""
+        return list(self._load())
+
+    def project(self, fields: Sequence[str], partial: bool = False) -> list[Any]:
+        """
+        Read only some columns of the tab.
+
+        Columns are located by the header order derived from ``model_fields``
+        and fetched in one ``batchGet``, adjacent columns sharing a range,
+        so wide tabs are not transferred or parsed in full. Loaded records
+        and the snapshot cache are neither used nor updated.
+
+        Example:
+            for row in evaluations.project(["candidate_id", "teamtailor_status"]):
+                print(row.candidate_id, row.teamtailor_status, row.row_number)
+
+        Args:
+            fields: Field names to read, in the order they are returned.
+            partial: Return partial models with only ``fields`` set, parsed
+                to their field types, instead of tuples. Other fields keep
+                their defaults; ``model_fields_set`` tells which were read.
+
+        Returns:
+            One item per row with any projected cell filled: a named tuple
+            of the raw cell values (``None`` for empty cells) followed by
+            ``row_number``, or a partial model.
+        """
+        fields = tuple(fields)
+        unknown = set(fields) - self._columns.keys()
+        if unknown:
+            raise ValueError(f"Unknown fields for {self.sheet_name}: {unknown}")
+        if not fields:
+            raise ValueError("At least one field is required")
+
+        runs = coalesce_columns(self._columns[name] for name in fields)
+        ranges = [
+            column_range(self.sheet_name, first, last_column=last)
+            for first, last in runs
+        ]
+        blocks = self.client.batch_read(ranges)
+
+        # Column index -> (block, offset within the block's rows).
+        located = {}
+        for (first, last), block in zip(runs, blocks):
+            for column in range(first, last + 1):
+                located[column] = (block, column - first)
+        length = max((len(block) for block in blocks), default=0)
+
+        def cell(row: int, name: str) -> Any:
+            block, offset = located[self._columns[name]]
+            if row >= len(block) or offset >= len(block[row]):
+                return ""
+            return block[row][offset]
+
+        projection = _projection_type(self.sheet_name, fields)
+        results = []
+        for row in range(length):
+            values = [cell(row, name) for name in fields]
+            if not any(values):
+                continue
+            if partial:
+                results.append(partial_model(self.model, dict(zip(fields, values))))
+            else:
+                cells = [None if value == "" else value for value in values]
+                results.append(projection(*cells, row + 2))
+        return results
+
+    def fetch_by(self, field: str, keys: Iterable[str]) -> dict[str, ModelT]:
+        """
+        Read only the rows whose ``field`` holds one of ``keys``.
 
-    def get_all(self) -> list[Candidate]:
-        """Retrieve all candidates from the sheet."""
+        The ``field`` column is projected to find the rows, which are then
+        read through a ``SheetsBatch``, adjacent rows sharing a range, so
+        scattered rows cost one ``batchGet`` per ``max_ranges`` ranges.
+        Meant for picking a few records out of a large tab; loaded records
+        and the snapshot cache are neither used nor updated.
+
+        Example:
+            found = candidates.fetch_by("candidate_id", {"c1", "c7"})
+
+        Args:
+            field: Field to match, e.g. ``"candidate_id"``.
+            keys: Cell values to look for.
+
+        Returns:
+            Key -> record, for the keys found; the first row wins when a key
+            appears more than once.
+        """
+        keys = set(keys)
+        if not keys:
+            return {}
+        wanted = {}
+        for row in self.project([field]):
+            key = getattr(row, field)
+            if key in keys:
+                wanted[row.row_number] = key
+        if not wanted:
+            return {}
+
+        last_col = len(self._columns) - 1
+        blocks = coalesce_rows({row: (0, last_col) for row in wanted})
+        ranges = [
+            a1_range(self.sheet_name, b.first_row, b.last_row, 0, last_col)
+            for b in blocks
+        ]
+        with self.client.batch() as batch:
+            reads = [batch.read(range_name) for range_name in ranges]
+        rows = []
+        expected = []
+        for block, read in zip(blocks, reads):
+            for row_number, row in zip(block.rows, read.values):
+                if any(row):
+                    rows.append(row)
+                    expected.append(wanted[row_number])
+
+        found: dict[str, ModelT] = {}
+        for key, record in zip(expected, get_row_codec(self.model).decode(rows)):
+            # Rows moved between the two reads no longer hold their key.
+            if getattr(record, field) == key:
+                found.setdefault(key, record)
+        return found
+
+    def read_columnar(self) -> ColumnarTable[ModelT]:
+        """
+        Read the whole tab into a compact columnar table.
+
+        Cells are encoded straight into columns without building a model
+        per row, which keeps large tabs (replays, push filtering) small in
+        memory. Loaded records and the snapshot cache are not touched.
+        """
+        return ColumnarTable.from_sheet_rows(
+            self.model, self.client.read_range(self.sheet_name)
+        )
+
+    def row_number_of(self, record: ModelT) -> Optional[int]:
+        """Sheet row of a stored record, or None if it is not written yet."""
+        self._load()
+        position = self._position_of(record)
+        return None if position is None else self._row_numbers[position]
+
+    def _reset_indexes(self) -> None:
+        raise NotImplementedError
+
+    def _index(self, record: ModelT, position: int) -> None:
         raise NotImplementedError
 
-    def get_by_id(self, candidate_id: str) -> Optional[Candidate]:
-        """Retrieve a candidate by ID."""
+    def _unindex(self, record: ModelT, position: int) -> None:
         raise NotImplementedError
 
-    def save(self, candidate: Candidate) -> None:
-        """Save or update a candidate."""
+    def _position_of(self, record: ModelT) -> Optional[int]:
         raise NotImplementedError
 
+    def _find(self, position: Optional[int]) -> Optional[ModelT]:
+        if position is None:
+            return None
+        return self._load()[position]
+
+    @property
+    def has_pending_changes(self) -> bool:
+        """Whether staged changes are waiting for ``flush``."""
+        return bool(self._dirty or self._new)
+
+    def stage(self, record: ModelT, fields: Optional[Iterable[str]] = None) -> None:
+        """
+        Insert or replace a record in memory without writing it yet.
+
+        Args:
+            record: The new state of the record.
+            fields: For an existing record, the fields that changed. Only
+                their columns are written, so concurrent recruiter edits to
+                other columns are not overwritten. Defaults to the whole row.
+        """
+        records = self._load()
+        position = self._position_of(record)
+        if position is None:
+            position = len(records)
+            records.append(record)
+            self._row_numbers.append(None)
+            self._index(record, position)
+            self._new.append(position)
+            return
+
+        self._unindex(records[position], position)
+        records[position] = record
+        self._index(record, position)
+        if position in self._new:
+            return
+        if fields is None:
+            self._dirty[position] = None
+        else:
+            unknown = set(fields) - self._columns.keys()
+            if unknown:
+                raise ValueError(f"Unknown fields for {self.sheet_name}: {unknown}")
+            if position not in self._dirty:
+                self._dirty[position] = frozenset(fields)
+            elif self._dirty[position] is not None:
+                self._dirty[position] = self._dirty[position] | frozenset(fields)
+
+    def flush(self) -> int:
+        """
+        Write all staged changes.
+
+        Returns:
+            The number of ranges written, appends included.
+        """
+        records = self._load()
+        ranges = 0
+
+        if self._dirty:
+            last_col = len(self._columns) - 1
+            # Column run -> sheet row -> position. Changed fields that are
+            # not adjacent get a run each, so the columns between them,
+            # possibly edited by a recruiter meanwhile, are left alone.
+            groups: dict[tuple[int, int], dict[int, int]] = {}
+            for position, fields in self._dirty.items():
+                if fields is None:
+                    runs = [(0, last_col)]
+                else:
+                    runs = coalesce_columns(self._columns[name] for name in fields)
+                for run in runs:
+                    groups.setdefault(run, {})[self._row_numbers[position]] = position
+
+            blocks = []
+            for run, positions_by_row in groups.items():
+                for block in coalesce_rows(dict.fromkeys(positions_by_row, run)):
+                    blocks.append((block, positions_by_row))
+            blocks.sort(key=lambda item: (item[0].first_row, item[0].first_col))
+
+            data = []
+            cells: dict[int, list[Any]] = {}
+            for block, positions_by_row in blocks:
+                values = []
+                for row in block.rows:
+                    position = positions_by_row[row]
+                    if position not in cells:
+                        cells[position] = model_to_row(records[position])
+                    values.append(cells[position][block.first_col : block.last_col + 1])
+                range_name = a1_range(
+                    self.sheet_name,
+                    block.first_row,
+                    block.last_row,
+                    block.first_col,
+                    block.last_col,
+                )
+                data.append((range_name, values))
+            self.client.batch_write(data)
+            ranges += len(data)
+            self._dirty = {}
+
+        if self._new:
+            new_positions = self._new
+            rows = models_to_rows([records[p] for p in new_positions])
+            updated_range = self.client.append_rows(self.sheet_name, rows)
+            ranges += 1
+            self._new = []
+            if updated_range:
+                first_row = first_row_of(updated_range)
+                for offset, position in enumerate(new_positions):
+                    self._row_numbers[position] = first_row + offset
+            else:
+                # Without the range the new rows landed in, their row numbers
+                # are unknown; read the tab again on next access rather than
+                # keep records that cannot be updated in place.
+                self.reload()
+
+        if ranges and self.cache is not None:
+            self.cache.invalidate(self.sheet_name)
+        return ranges
+
+    def save(self, record: ModelT) -> None:
+        """Save or update a record immediately."""
+        self.stage(record)
+        self.flush()
+
+    def save_many(self, records: Iterable[ModelT]) -> int:
+        """
+        Save or update several records with coalesced writes.
+
+        Returns:
+            The number of ranges written.
+        """
+        for record in records:
+            self.stage(record)
+        return self.flush()
+
+
+class CandidateRepository(_TabRepository[CandidateRaw]):
+    """
+    Repository for candidate data stored in Sheets.
+
+    Indexes ``candidate_id``, ``(source, source_candidate_id)`` and the
+    normalized email. When several rows share a key, every index resolves
+    it to the first of them, so a duplicate row never shadows the original
+    whichever key it is looked up by.
+
+    TODO: Add filtering and pagination
+    """
+
+    sheet_name = "candidates_raw"
+    model = CandidateRaw
+
+    def _reset_indexes(self) -> None:
+        self._by_id: dict[str, int] = {}
+        self._by_source: dict[tuple[str, str], int] = {}
+        self._by_email: dict[str, int] = {}
+
+    def _index(self, record: CandidateRaw, position: int) -> None:
+        self._by_id.setdefault(record.candidate_id, position)
+        source_key = (Source(record.source).value, record.source_candidate_id)
+        self._by_source.setdefault(source_key, position)
+        if record.email:
+            self._by_email.setdefault(normalize_email(record.email), position)
+
+    def _unindex(self, record: CandidateRaw, position: int) -> None:
+        source_key = (Source(record.source).value, record.source_candidate_id)
+        for index, key in (
+            (self._by_id, record.candidate_id),
+            (self._by_source, source_key),
+            (self._by_email, normalize_email(record.email)),
+        ):
+            if index.get(key) == position:
+                del index[key]
+
+    def get_by_id(self, candidate_id: str) -> Optional[CandidateRaw]:
+        """Retrieve the first candidate stored with an ID."""
+        self._load()
+        return self._find(self._by_id.get(candidate_id))
+
+    def get_by_source_id(
+        self, source: Source, source_candidate_id: str
+    ) -> Optional[CandidateRaw]:
+        """Retrieve the first candidate stored with a source platform ID."""
+        self._load()
+        key = (Source(source).value, source_candidate_id)
+        return self._find(self._by_source.get(key))
+
+    def get_by_email(self, email: str) -> Optional[CandidateRaw]:
+        """Retrieve the first candidate registered with an email address."""
+        self._load()
+        return self._find(self._by_email.get(normalize_email(email)))
+
+    def exists(self, candidate_id: str) -> bool:
+        """Whether a candidate ID is present in the tab."""
+        self._load()
+        return candidate_id in self._by_id
+
+    def find_duplicate(self, candidate: CandidateRaw) -> Optional[CandidateRaw]:
+        """
+        Find an existing candidate that represents the same person.
+
+        Matches on source ID first, then on email.
+
+        Args:
+            candidate: Incoming candidate, typically fresh from ingestion.
+
+        Returns:
+            The already stored candidate, or None if the candidate is new.
+        """
+        duplicate = self.get_by_source_id(
+            candidate.source, candidate.source_candidate_id
+        )
+        if duplicate is None and candidate.email:
+            duplicate = self.get_by_email(candidate.email)
+        return duplicate
+
+    def _position_of(self, record: CandidateRaw) -> Optional[int]:
+        return self._by_id.get(record.candidate_id)
+
+
+class EvaluationRepository(_TabRepository[CandidateEvaluation]):
+    """
+    Repository for candidate evaluations stored in Sheets.
+
+    Indexes ``evaluation_id``, ``(candidate_id, job_post_id, prompt_version)``,
+    the evaluations of each candidate and the evaluations pending a push.
+    """
+
+    sheet_name = "candidates_evaluations"
+    model = CandidateEvaluation
+
+    def _reset_indexes(self) -> None:
+        self._by_id: dict[str, int] = {}
+        self._by_key: dict[EvaluationKey, int] = {}
+        self._by_candidate: dict[str, list[int]] = {}
+        self._pending: set[int] = set()
+
+    def _index(self, record: CandidateEvaluation, position: int) -> None:
+        self._by_id[record.evaluation_id] = position
+        if is_pending_push(record):
+            self._pending.add(position)
+        # Later rows win so the key maps to the most recent evaluation.
+        key = (record.candidate_id, record.job_post_id, record.prompt_version)
+        self._by_key[key] = position
+        insort(self._by_candidate.setdefault(record.candidate_id, []), position)
+
+    def _unindex(self, record: CandidateEvaluation, position: int) -> None:
+        key = (record.candidate_id, record.job_post_id, record.prompt_version)
+        if self._by_id.get(record.evaluation_id) == position:
+            del self._by_id[record.evaluation_id]
+        if self._by_key.get(key) == position:
+            del self._by_key[key]
+        positions = self._by_candidate.get(record.candidate_id, [])
+        if position in positions:
+            positions.remove(position)
+        self._pending.discard(position)
+
+    def get_by_id(self, evaluation_id: str) -> Optional[CandidateEvaluation]:
+        """Retrieve an evaluation by ID."""
+        self._load()
+        return self._find(self._by_id.get(evaluation_id))
+
+    def get_by_key(
+        self, candidate_id: str, job_post_id: str, prompt_version: str
+    ) -> Optional[CandidateEvaluation]:
+        """Retrieve the latest evaluation of a candidate for a job and prompt."""
+        self._load()
+        key = (candidate_id, job_post_id, prompt_version)
+        return self._find(self._by_key.get(key))
+
+    def has_evaluation(
+        self, candidate_id: str, job_post_id: str, prompt_version: str
+    ) -> bool:
+        """Whether a candidate was already evaluated for a job and prompt."""
+        self._load()
+        return (candidate_id, job_post_id, prompt_version) in self._by_key
+
+    def get_for_candidate(self, candidate_id: str) -> list[CandidateEvaluation]:
+        """Retrieve all evaluations of a candidate, oldest first."""
+        records = self._load()
+        return [records[i] for i in self._by_candidate.get(candidate_id, [])]
+
+    def get_pending_push(self) -> list[CandidateEvaluation]:
+        """
+        Retrieve approved evaluations not yet sent to TeamTailor.
+
+        Served from an index kept up to date by ``stage``, so the cost
+        depends on the number of pending evaluations only. See
+        ``PendingPushView`` to avoid loading the whole tab.
+        """
+        records = self._load()
+        return [records[i] for i in sorted(self._pending)]
+
+    def find_orphans(
+        self, candidates: CandidateRepository
+    ) -> list[CandidateEvaluation]:
+        """
+        Find evaluations whose ``candidate_id`` is not in ``candidates_raw``.
+
+        Args:
+            candidates: Repository holding the referenced candidates.
+
+        Returns:
+            Evaluations violating the foreign key.
+        """
+        records = self._load()
+        return [
+            records[position]
+            for candidate_id, positions in self._by_candidate.items()
+            if not candidates.exists(candidate_id)
+            for position in positions
+        ]
+
+    def _position_of(self, record: CandidateEvaluation) -> Optional[int]:
+        return self._by_id.get(record.evaluation_id)
+
 
 class PromptRepository:
     """
@@ -52,3 +601,37 @@ class PromptRepository:
     def get_all_prompts(self) -> dict[str, str]:
         """Get all configured prompts."""
         raise NotImplementedError
+
+
+class SyncStateRepository(_TabRepository[SyncState]):
+    """
+    Repository for ingestion cursors stored in the ``sync_state`` tab.
+
+    Implements the ``SyncStateStore`` protocol; a cursor update rewrites
+    only that job's row.
+    """
+
+    sheet_name = "sync_state"
+    model = SyncState
+
+    def _reset_indexes(self) -> None:
+        self._by_job: dict[str, int] = {}
+
+    def _index(self, record: SyncState, position: int) -> None:
+        self._by_job[record.job_post_id] = position
+
+    def _unindex(self, record: SyncState, position: int) -> None:
+        if self._by_job.get(record.job_post_id) == position:
+            del self._by_job[record.job_post_id]
+
+    def _position_of(self, record: SyncState) -> Optional[int]:
+        return self._by_job.get(record.job_post_id)
+
+    def get(self, job_post_id: str) -> Optional[SyncState]:
+        """Return the cursor of a job post, if it was ever ingested."""
+        self._load()
+        return self._find(self._by_job.get(job_post_id))
+
+    def set(self, state: SyncState) -> None:
+        """Store a job post's cursor."""
+        self.save(state)
@@ -0,0 +1,114 @@
+"""
+Conversion between Sheets rows and schema models.
+
+Sheets returns every cell as a string and drops trailing empty cells,
+so rows are padded against the header and empty strings become ``None``
+before validation. Whole tabs go through the bulk ``RowCodec`` of
+``shared.schemas``.
+"""
+
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from shared.schemas import format_cell, get_row_codec
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def header_for(model: type[BaseModel]) -> list[str]:
+    """Column names of a tab, in ``model_fields`` order."""
+    return list(model.model_fields.keys())
+
+
+def partial_model(model: type[ModelT], fields: dict[str, Any]) -> ModelT:
+    """
+    Build a model holding only some fields, from their cell values.
+
+    Each value is parsed to its field's type but the model as a whole is
+    not validated, so fields left out are simply unset (or at their
+    defaults). Meant for projected reads of trusted rows.
+
+    Args:
+        model: The schema model of the tab.
+        fields: Field name -> cell value; empty cells become the field's
+            default (``None`` for required fields).
+
+    Returns:
+        A partially populated model instance.
+    """
+    return get_row_codec(model).decode_partial(fields)
+
+
+def row_to_model(model: type[ModelT], header: list[str], row: list[Any]) -> ModelT:
+    """
+    Validate a single sheet row into a model instance.
+
+    Args:
+        model: The schema model of the tab.
+        header: Column names as they appear in the sheet's header row.
+        row: Cell values of the row.
+
+    Returns:
+        The validated model.
+    """
+    data = {}
+    for column, value in zip(header, row):
+        if column in model.model_fields and value != "":
+            data[column] = value
+    return model.model_validate(data)
+
+
+def rows_to_models(
+    model: type[ModelT], rows: list[list[Any]], strict: bool = False
+) -> list[ModelT]:
+    """
+    Decode the rows of a whole tab, header row included.
+
+    Args:
+        model: The schema model of the tab.
+        rows: All rows of the tab; the first one is the header.
+        strict: Fully validate every row instead of only parsing cells.
+
+    Returns:
+        One model per non-empty data row.
+    """
+    return numbered_rows_to_models(model, rows, strict)[1]
+
+
+def numbered_rows_to_models(
+    model: type[ModelT], rows: list[list[Any]], strict: bool = False
+) -> tuple[list[int], list[ModelT]]:
+    """
+    Like ``rows_to_models`` but also return the sheet row of each record.
+
+    Args:
+        model: The schema model of the tab.
+        rows: All rows of the tab, starting at sheet row 1 (the header).
+        strict: Fully validate every row instead of only parsing cells.
+
+    Returns:
+        Parallel lists of 1-based sheet row numbers and models.
+    """
+    if not rows:
+        return [], []
+    row_numbers = []
+    data = []
+    for row_number, row in enumerate(rows[1:], start=2):
+        if any(row):
+            row_numbers.append(row_number)
+            data.append(row)
+    records = get_row_codec(model).decode(data, header=rows[0], strict=strict)
+    return row_numbers, records
+
+
+def model_to_row(record: BaseModel) -> list[Any]:
+    """Serialize a model into a row following its ``model_fields`` order."""
+    return get_row_codec(type(record)).encode_one(record)
+
+
+def models_to_rows(records: list[BaseModel]) -> list[list[Any]]:
+    """Serialize models of one tab into rows."""
+    if not records:
+        return []
+    return get_row_codec(type(records[0])).encode(records)
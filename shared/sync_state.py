@@ -0,0 +1,110 @@
+"""
+Ingestion cursor storage.
+
+Ingestion keeps, per job post, the newest source record it has stored so
+the next run only fetches what came after it. Cursors live either in the
+``sync_state`` tab (``SyncStateRepository``) or in a local JSON file, which
+is handy for local runs and tests.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Optional, Protocol
+
+from shared.schemas import SyncState
+
+
+class SyncStateStore(Protocol):
+    """Storage backend for ingestion cursors."""
+
+    def get(self, job_post_id: str) -> Optional[SyncState]:
+        """Return the cursor of a job post, if any."""
+        ...
+
+    def set(self, state: SyncState) -> None:
+        """Persist a job post's cursor."""
+        ...
+
+
+def cursor_key(created_at: datetime, record_id: str) -> tuple[Any, ...]:
+    """
+    Sort key of a source record: creation time, then ID.
+
+    Numeric IDs compare as numbers, so ``"10"`` comes after ``"9"``; other
+    IDs compare as text and after every numeric one.
+    """
+    if record_id.isascii() and record_id.isdigit():
+        return (created_at, 0, int(record_id), "")
+    return (created_at, 1, 0, record_id)
+
+
+def is_after(state: Optional[SyncState], created_at: datetime, record_id: str) -> bool:
+    """
+    Whether a source record is newer than a cursor.
+
+    Records are ordered by ``cursor_key``: creation time, then ID for
+    identical times.
+
+    Args:
+        state: The job's cursor; None means nothing was ingested yet.
+        created_at: Creation time of the record.
+        record_id: Source ID of the record.
+
+    Returns:
+        True if the record has not been ingested yet.
+    """
+    if state is None:
+        return True
+    return cursor_key(created_at, record_id) > cursor_key(
+        state.cursor_created_at, state.cursor_id
+    )
+
+
+class FileSyncStateStore:
+    """
+    Cursor store backed by a local JSON file.
+
+    The whole file is rewritten through a temporary file and ``os.replace``,
+    so a crash never leaves a half-written cursor behind.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            path: JSON file holding the cursors; created on first write.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict[str, dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def get(self, job_post_id: str) -> Optional[SyncState]:
+        """Return the cursor of a job post, if any."""
+        with self._lock:
+            data = self._read().get(job_post_id)
+        return None if data is None else SyncState.model_validate(data)
+
+    def set(self, state: SyncState) -> None:
+        """Persist a job post's cursor atomically."""
+        with self._lock:
+            states = self._read()
+            states[state.job_post_id] = state.model_dump(mode="json")
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(states, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
@@ -0,0 +1,73 @@
+"""
+Stand-in for ``GeminiClient`` answering candidate evaluation prompts.
+
+Candidates are recognised by the ``candidate_id`` lines the prompt builder
+writes, so responses follow whatever candidates a prompt names.
+"""
+
+import re
+import threading
+
+from shared.llm.evaluator import BATCH_EVALUATION_SCHEMA
+
+
+def answer(candidate_id: str, score: int = 4) -> dict:
+    return {
+        "candidate_id": candidate_id,
+        "fit_label": "yes",
+        "fit_score": score,
+        "reasons": f"Reasons for {candidate_id}",
+    }
+
+
+class FakeGemini:
+    """
+    Answers batched and single prompts for the candidates they name.
+
+    Batched responses score 4, leave out ``dropped`` candidates, score
+    ``invalid`` ones out of range, and a batch naming a ``failing``
+    candidate raises. Single responses score 3, except for ``cand-broken``,
+    whose response lacks required fields.
+    """
+
+    def __init__(self, dropped=(), invalid=(), failing=()) -> None:
+        self.dropped = set(dropped)
+        self.invalid = set(invalid)
+        self.failing = set(failing)
+        self.batches: list[list[str]] = []
+        self.singles: list[str] = []
+        self.many_calls = 0
+        self._lock = threading.Lock()
+
+    def generate_structured(self, prompt: str, schema: dict) -> dict:
+        if schema is BATCH_EVALUATION_SCHEMA:
+            ids = re.findall(r"### candidate_id: (cand-\S+)", prompt)
+            with self._lock:
+                self.batches.append(ids)
+            if self.failing & set(ids):
+                raise RuntimeError("batch failed")
+            return {
+                "evaluations": [
+                    answer(c, 9 if c in self.invalid else 4)
+                    for c in ids
+                    if c not in self.dropped
+                ]
+                + ["not an item", answer("someone-else")]
+            }
+        candidate_id = re.search(r"candidate_id: (\S+)", prompt).group(1)
+        with self._lock:
+            self.singles.append(candidate_id)
+        if candidate_id == "cand-broken":
+            return {"fit_label": "maybe"}
+        return answer(candidate_id, 3)
+
+    def generate_structured_many(self, prompts, schema, return_exceptions=False):
+        with self._lock:
+            self.many_calls += 1
+        results = []
+        for prompt in prompts:
+            try:
+                results.append(self.generate_structured(prompt, schema))
+            except Exception as exc:
+                results.append(exc)
+        return results
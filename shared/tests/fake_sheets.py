@@ -0,0 +1,160 @@
+"""
+In-memory stand-in for the Sheets and Drive services used by ``SheetsClient``.
+
+Tabs are plain lists of rows. The fake implements the ``values`` calls the
+client makes (``get``, ``batchGet``, ``update``, ``batchUpdate``,
+``append``) with A1 ranges, records every call, and bumps the Drive file
+``version`` on each write so revision checks behave like the real API.
+"""
+
+import re
+from typing import Any, Optional
+
+from shared.sheets import SheetsClient
+
+_RANGE_RE = re.compile(r"^([^!]+)(?:!([A-Z]+)(\d*)(?::([A-Z]+)(\d*))?)?$")
+
+
+def column_index(letters: str) -> int:
+    """Zero-based index of A1 column letters."""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+class _Call:
+    def __init__(self, result: Any) -> None:
+        self._result = result
+
+    def execute(self) -> Any:
+        return self._result
+
+
+class FakeSpreadsheet:
+    """A spreadsheet held in memory, usable as both Sheets and Drive service."""
+
+    def __init__(self, tabs: Optional[dict[str, list[list[Any]]]] = None) -> None:
+        self.tabs = {
+            name: [list(row) for row in rows] for name, rows in (tabs or {}).items()
+        }
+        self.version = 1
+        self.calls: list[tuple[str, Any]] = []
+        # Set to False to mimic an append response without ``updatedRange``.
+        self.report_updated_range = True
+
+    def client(self, spreadsheet_id: str = "spreadsheet") -> SheetsClient:
+        """A ``SheetsClient`` talking to this fake."""
+        return SheetsClient(spreadsheet_id, service=self, drive_service=self)
+
+    def call_names(self) -> list[str]:
+        return [name for name, _ in self.calls]
+
+    # Sheets service -----------------------------------------------------
+
+    def spreadsheets(self) -> "FakeSpreadsheet":
+        return self
+
+    def values(self) -> "FakeSpreadsheet":
+        return self
+
+    def get(self, spreadsheetId: str = "", range: str = "", **kwargs: Any) -> _Call:
+        if "fileId" in kwargs:
+            # Drive ``files().get``.
+            self.calls.append(("files.get", kwargs["fileId"]))
+            return _Call({"version": str(self.version)})
+        self.calls.append(("get", range))
+        return _Call({"range": range, "values": self._read(range)})
+
+    def batchGet(self, spreadsheetId: str, ranges: list[str]) -> _Call:
+        self.calls.append(("batchGet", tuple(ranges)))
+        return _Call(
+            {"valueRanges": [{"range": r, "values": self._read(r)} for r in ranges]}
+        )
+
+    def update(
+        self, spreadsheetId: str, range: str, valueInputOption: str, body: dict
+    ) -> _Call:
+        self.calls.append(("update", range))
+        self._write(range, body["values"])
+        return _Call({})
+
+    def batchUpdate(self, spreadsheetId: str, body: dict) -> _Call:
+        self.calls.append(("batchUpdate", tuple(d["range"] for d in body["data"])))
+        for data in body["data"]:
+            self._write(data["range"], data["values"])
+        return _Call({})
+
+    def append(
+        self,
+        spreadsheetId: str,
+        range: str,
+        valueInputOption: str,
+        insertDataOption: str,
+        body: dict,
+    ) -> _Call:
+        self.calls.append(("append", range))
+        tab, *_ = self._parse(range)
+        rows = self.tabs.setdefault(tab, [])
+        while rows and not any(rows[-1]):
+            rows.pop()
+        first = len(rows) + 1
+        rows.extend(list(row) for row in body["values"])
+        self.version += 1
+        if not self.report_updated_range:
+            return _Call({"updates": {}})
+        last = len(rows)
+        return _Call({"updates": {"updatedRange": f"{tab}!A{first}:Z{last}"}})
+
+    # Drive service ------------------------------------------------------
+
+    def files(self) -> "FakeSpreadsheet":
+        return self
+
+    # A1 handling ----------------------------------------------------------
+
+    def _parse(self, range_name: str) -> tuple[Any, ...]:
+        """``(tab, first_row, last_row, first_col, last_col)``, 1-based rows."""
+        match = _RANGE_RE.match(range_name)
+        if match is None:
+            raise ValueError(f"Unsupported range: {range_name!r}")
+        tab, first_col, first_row, last_col, last_row = match.groups()
+        if first_col is None:
+            return tab, 1, None, 0, None
+        first = column_index(first_col)
+        last = column_index(last_col) if last_col else first
+        start = int(first_row) if first_row else 1
+        if last_col is None:
+            end = start if first_row else None
+        else:
+            end = int(last_row) if last_row else None
+        return tab, start, end, first, last
+
+    def _read(self, range_name: str) -> list[list[Any]]:
+        tab, first_row, last_row, first_col, last_col = self._parse(range_name)
+        rows = self.tabs.get(tab, [])
+        selected = rows[first_row - 1 : last_row]
+        if last_col is None:
+            values = [list(row) for row in selected]
+        else:
+            values = [list(row[first_col : last_col + 1]) for row in selected]
+        # Sheets drops trailing empty cells and rows.
+        for row in values:
+            while row and row[-1] in ("", None):
+                row.pop()
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def _write(self, range_name: str, values: list[list[Any]]) -> None:
+        tab, first_row, _, first_col, _ = self._parse(range_name)
+        rows = self.tabs.setdefault(tab, [])
+        for offset, row_values in enumerate(values):
+            index = first_row - 1 + offset
+            while len(rows) <= index:
+                rows.append([])
+            row = rows[index]
+            while len(row) < first_col + len(row_values):
+                row.append("")
+            row[first_col : first_col + len(row_values)] = row_values
+        self.version += 1
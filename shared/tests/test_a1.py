@@ -0,0 +1,60 @@
+"""Tests for the A1 range helpers."""
+
+import pytest
+
+from shared.sheets.a1 import (
+    RowBlock,
+    a1_range,
+    coalesce_columns,
+    coalesce_rows,
+    column_letter,
+    column_range,
+    first_row_of,
+)
+
+
+@pytest.mark.parametrize(
+    "index, letters", [(0, "A"), (11, "L"), (25, "Z"), (26, "AA"), (701, "ZZ")]
+)
+def test_column_letter(index, letters):
+    assert column_letter(index) == letters
+
+
+def test_column_letter_rejects_negative_index():
+    with pytest.raises(ValueError):
+        column_letter(-1)
+
+
+def test_ranges():
+    assert a1_range("candidates_raw", 5, 9, 0, 9) == "candidates_raw!A5:J9"
+    assert column_range("candidates_raw", 5) == "candidates_raw!F2:F"
+    assert column_range("tab", 0, first_row=1, last_column=2) == "tab!A1:C"
+
+
+def test_first_row_of():
+    assert first_row_of("candidates_evaluations!A12:L14") == 12
+    assert first_row_of("'my tab'!B3") == 3
+    with pytest.raises(ValueError):
+        first_row_of("candidates_raw")
+
+
+def test_coalesce_columns_merges_adjacent_runs():
+    assert coalesce_columns([9, 1, 0, 10, 5, 1]) == [(0, 1), (5, 5), (9, 10)]
+    assert coalesce_columns([]) == []
+
+
+def test_coalesce_rows_merges_neighbours_with_same_span():
+    spans = {2: (10, 10), 3: (10, 10), 4: (10, 10), 6: (10, 10), 7: (0, 11)}
+
+    assert coalesce_rows(spans) == [
+        RowBlock(2, 4, 10, 10),
+        RowBlock(6, 6, 10, 10),
+        RowBlock(7, 7, 0, 11),
+    ]
+
+
+def test_coalesce_rows_splits_adjacent_rows_with_different_spans():
+    blocks = coalesce_rows({5: (0, 3), 4: (0, 3), 6: (1, 3)})
+
+    assert blocks == [RowBlock(4, 5, 0, 3), RowBlock(6, 6, 1, 3)]
+    assert list(blocks[0].rows) == [4, 5]
@@ -0,0 +1,99 @@
+"""Tests for the shared credential provider's token refresh."""
+
+import threading
+import time
+from datetime import timedelta
+
+from shared.auth import CredentialProvider, _utcnow
+
+SCOPES = ("https://www.googleapis.com/auth/spreadsheets",)
+
+
+class FakeCredentials:
+    """Counts refreshes; each one issues a token valid for an hour."""
+
+    def __init__(self, token="token-0", expires_in=timedelta(hours=1)) -> None:
+        self.token = token
+        self.expiry = _utcnow() + expires_in if expires_in is not None else None
+        self.refreshes = 0
+        self.requests = []
+
+    def refresh(self, request) -> None:
+        # Slow enough for concurrent callers to pile up behind the lock.
+        time.sleep(0.01)
+        self.refreshes += 1
+        self.requests.append(request)
+        self.token = f"token-{self.refreshes}"
+        self.expiry = _utcnow() + timedelta(hours=1)
+
+
+def provider(creds: FakeCredentials, background: bool = False) -> CredentialProvider:
+    """A provider with ``creds`` already loaded for ``SCOPES``."""
+    provider = CredentialProvider(
+        refresh_margin_seconds=300, background_refresh=background
+    )
+    provider._scoped[tuple(sorted(SCOPES))] = creds
+    provider._refresh_locks[id(creds)] = threading.Lock()
+    provider._request = "transport"
+    return provider
+
+
+def test_valid_token_is_reused_without_refresh():
+    creds = FakeCredentials()
+    shared = provider(creds)
+
+    assert shared.credentials(SCOPES) is creds
+    assert shared.token(list(reversed(SCOPES))) == "token-0"
+    assert creds.refreshes == 0
+
+
+def test_token_within_the_margin_is_renewed_before_it_is_returned():
+    creds = FakeCredentials(expires_in=timedelta(minutes=4))
+
+    assert provider(creds).token(SCOPES) == "token-1"
+    assert creds.requests == ["transport"]
+
+
+def test_missing_token_is_minted_and_tokens_without_expiry_are_kept():
+    creds = FakeCredentials(token=None, expires_in=None)
+    shared = provider(creds)
+
+    assert shared.token(SCOPES) == "token-1"
+    assert shared.token(SCOPES) == "token-1"
+    assert creds.refreshes == 1
+
+
+def test_concurrent_callers_share_one_refresh():
+    creds = FakeCredentials(expires_in=timedelta(seconds=30))
+    shared = provider(creds)
+    barrier = threading.Barrier(8)
+    tokens = []
+
+    def call() -> None:
+        barrier.wait()
+        tokens.append(shared.token(SCOPES))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert creds.refreshes == 1
+    assert tokens == ["token-1"] * 8
+
+
+def test_background_thread_renews_tokens_entering_the_margin():
+    creds = FakeCredentials(expires_in=timedelta(seconds=60))
+    shared = provider(creds, background=True)
+
+    shared._start_background()
+    deadline = time.monotonic() + 5
+    while creds.refreshes == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert creds.refreshes == 1
+    assert shared._thread.daemon
+    # The renewed token is not due again, so the thread goes back to sleep.
+    time.sleep(0.05)
+    assert creds.refreshes == 1
@@ -0,0 +1,66 @@
+"""Tests for batched Sheets reads and writes."""
+
+import pytest
+
+from shared.sheets.batch import SheetsBatch
+from shared.tests.fake_sheets import FakeSpreadsheet
+
+
+def spreadsheet() -> FakeSpreadsheet:
+    return FakeSpreadsheet({"tab": [["a", "b"], ["1", "2"], ["3", "4"]]})
+
+
+def test_batch_groups_operations_into_one_call_each():
+    sheet = spreadsheet()
+
+    with sheet.client().batch() as batch:
+        first = batch.read("tab!A2:B2")
+        second = batch.read("tab!B3")
+        batch.write("tab!A2", [["x"]])
+        batch.write("tab!B3", [["y"]])
+        batch.append("tab", [["5", "6"]])
+        batch.append("tab", [["7", "8"]])
+        assert not first.done
+
+    assert sheet.call_names() == ["batchUpdate", "append", "batchGet"]
+    # Writes go first, so reads in the same batch see them.
+    assert first.values == [["x", "2"]]
+    assert second.values == [["y"]]
+    assert sheet.tabs["tab"][3:] == [["5", "6"], ["7", "8"]]
+    assert batch.results[0].api_calls == 3
+    assert batch.results[0].appended_rows == {"tab": 2}
+
+
+def test_batch_flushes_when_max_ranges_is_reached():
+    sheet = spreadsheet()
+    batch = sheet.client().batch(max_ranges=2)
+
+    batch.read("tab!A1")
+    assert sheet.calls == []
+    pending = batch.read("tab!A2")
+
+    assert sheet.calls == [("batchGet", ("tab!A1", "tab!A2"))]
+    assert pending.values == [["1"]]
+    assert len(batch) == 0
+
+
+def test_batch_drops_queued_writes_when_the_block_raises():
+    sheet = spreadsheet()
+
+    with pytest.raises(RuntimeError):
+        with sheet.client().batch() as batch:
+            batch.write("tab!A2", [["x"]])
+            raise RuntimeError("boom")
+
+    assert sheet.calls == []
+    assert sheet.tabs["tab"][1] == ["1", "2"]
+
+
+def test_unflushed_read_has_no_values():
+    batch = spreadsheet().client().batch()
+    pending = batch.read("tab!A1")
+
+    with pytest.raises(RuntimeError):
+        pending.values
+    with pytest.raises(ValueError):
+        SheetsBatch(batch.client, max_ranges=0)
@@ -0,0 +1,112 @@
+"""Tests for the columnar tables of sheet records."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from shared.columnar import ColumnarTable
+from shared.schemas import CandidateEvaluation, Decision, FitLabel, TeamtailorStatus
+from shared.sheets.rows import header_for, model_to_row
+
+
+def evaluation(number: int, **fields) -> CandidateEvaluation:
+    values = {
+        "evaluation_id": f"eval-{number}",
+        "candidate_id": f"cand-{number}",
+        "job_post_id": "job-1",
+        "prompt_version": "v1",
+        "evaluated_at": datetime(2024, 5, 2, 9, number, tzinfo=timezone.utc),
+        "fit_label": FitLabel.YES,
+        "fit_score": 4,
+        "reasons": "Relevant experience",
+    }
+    values.update(fields)
+    return CandidateEvaluation(**values)
+
+
+RECORDS = [
+    evaluation(1, decision=Decision.PUSH),
+    evaluation(2, fit_score=2, decision=Decision.PUSH),
+    evaluation(3, fit_score=5, red_flags="Gap"),
+    evaluation(
+        4,
+        decision=Decision.PUSH,
+        teamtailor_status=TeamtailorStatus.SENT,
+        evaluated_at=datetime(2024, 5, 2, 9, 4),
+    ),
+    evaluation(5, fit_score=5, decision=Decision.PUSH, prompt_hash="abc"),
+]
+
+
+def sheet_rows() -> list[list]:
+    return [header_for(CandidateEvaluation)] + [
+        model_to_row(record) for record in RECORDS
+    ]
+
+
+def test_sheet_rows_round_trip_to_equal_models():
+    table = ColumnarTable.from_sheet_rows(CandidateEvaluation, sheet_rows())
+
+    assert len(table) == len(RECORDS)
+    assert list(table.row_numbers) == [2, 3, 4, 5, 6]
+    assert table.materialize() == RECORDS
+    # Naive datetimes stay naive.
+    assert table.row(3).evaluated_at.tzinfo is None
+
+
+def test_empty_rows_are_skipped():
+    rows = sheet_rows()
+    rows.insert(2, ["", ""])
+
+    table = ColumnarTable.from_sheet_rows(CandidateEvaluation, rows)
+
+    assert len(table) == len(RECORDS)
+    assert list(table.row_numbers) == [2, 4, 5, 6, 7]
+
+
+def test_masks_select_the_push_backlog():
+    table = ColumnarTable.from_models(RECORDS)
+
+    mask = (
+        (table["fit_score"] >= 4)
+        & (table["decision"] == Decision.PUSH)
+        & table["teamtailor_status"].isin([TeamtailorStatus.NOT_SENT])
+    )
+
+    assert mask.indices() == [0, 4]
+    assert [e.evaluation_id for e in table.materialize(mask)] == ["eval-1", "eval-5"]
+    assert (~mask).count() == 3
+    assert ((table["fit_score"] == 2) | table["red_flags"].isnull()).count() == 4
+    # Enum values compare like their members.
+    assert (table["decision"] == "push").indices() == [0, 1, 3, 4]
+
+
+def test_datetime_comparisons_mix_naive_and_aware_values():
+    table = ColumnarTable.from_models(RECORDS)
+    since = datetime(2024, 5, 2, 9, 3, tzinfo=timezone.utc)
+
+    assert (table["evaluated_at"] >= since).indices() == [2, 3, 4]
+    assert (table["evaluated_at"] < datetime(2024, 5, 2, 9, 2)).indices() == [0]
+
+
+def test_take_and_filter_keep_row_numbers():
+    table = ColumnarTable.from_sheet_rows(CandidateEvaluation, sheet_rows())
+
+    selected = table.filter(table["fit_score"] == 5)
+
+    assert list(selected.row_numbers) == [4, 6]
+    assert selected.materialize() == [RECORDS[2], RECORDS[4]]
+    assert table.take([4, 0]).materialize() == [RECORDS[4], RECORDS[0]]
+
+
+def test_invalid_comparisons_raise():
+    table = ColumnarTable.from_models(RECORDS)
+
+    with pytest.raises(TypeError):
+        table["decision"] >= Decision.PUSH
+    with pytest.raises(ValueError):
+        table["decision"] == "maybe later"
+    with pytest.raises(KeyError):
+        table["missing"]
+    with pytest.raises(ValueError):
+        table.materialize(ColumnarTable.from_models(RECORDS[:2])["fit_score"] == 4)
@@ -0,0 +1,68 @@
+"""Tests for the candidate dedup index."""
+
+from datetime import datetime, timezone
+
+from shared.schemas import CandidateRaw, Source
+from shared.sheets.dedup import CandidateDedupIndex
+from shared.sheets.rows import header_for, model_to_row
+from shared.tests.fake_sheets import FakeSpreadsheet
+
+
+def candidate(source_id: str, email: str) -> CandidateRaw:
+    return CandidateRaw(
+        candidate_id=f"cand-{source_id}",
+        source=Source.GETONBOARD,
+        source_candidate_id=source_id,
+        created_at=datetime(2024, 5, 1, 10, 0, tzinfo=timezone.utc),
+        full_name="Ada Lovelace",
+        email=email,
+        raw_profile_url=f"https://example.com/{source_id}",
+    )
+
+
+def load(*stored: CandidateRaw) -> tuple[CandidateDedupIndex, FakeSpreadsheet]:
+    rows = [header_for(CandidateRaw)] + [model_to_row(c) for c in stored]
+    sheet = FakeSpreadsheet({"candidates_raw": rows})
+    return CandidateDedupIndex.load(sheet.client()), sheet
+
+
+def test_load_reads_only_key_columns():
+    index, sheet = load(candidate("1", "ada@example.com"), candidate("2", ""))
+
+    assert len(index) == 3
+    assert sheet.calls == [
+        (
+            "batchGet",
+            ("candidates_raw!B2:B", "candidates_raw!C2:C", "candidates_raw!F2:F"),
+        )
+    ]
+
+
+def test_contains_matches_source_id_or_normalized_email():
+    index, _ = load(candidate("1", "ada@example.com"))
+
+    assert index.contains(candidate("1", "other@example.com"))
+    assert index.contains(candidate("9", "  ADA@Example.com "))
+    assert not index.contains(candidate("9", "grace@example.com"))
+
+
+def test_empty_email_never_matches():
+    index, _ = load(candidate("1", ""))
+
+    assert not index.contains(candidate("2", ""))
+
+
+def test_split_new_skips_stored_and_in_batch_duplicates():
+    index, _ = load(candidate("1", "ada@example.com"))
+    incoming = [
+        candidate("1", "ada@example.com"),
+        candidate("2", "grace@example.com"),
+        candidate("3", "Grace@example.com"),
+        candidate("4", "alan@example.com"),
+    ]
+
+    new, duplicates = index.split_new(incoming)
+
+    assert [c.source_candidate_id for c in new] == ["2", "4"]
+    assert duplicates == 2
+    assert index.contains(candidate("5", "alan@example.com"))
@@ -0,0 +1,67 @@
+"""Tests for batched candidate evaluation and its fallback."""
+
+from datetime import datetime, timezone
+
+from pydantic import ValidationError
+
+from shared.llm.evaluator import CandidateEvaluator
+from shared.llm.prompt_builder import PromptBuilder
+from shared.schemas import CandidateEvaluation, CandidateRaw, FitLabel, Source
+from shared.tests.fake_gemini import FakeGemini
+
+TEMPLATE = "Job {{job_post_id}}.\nCandidate:\n{{candidate}}"
+
+
+def candidate(number: int) -> CandidateRaw:
+    return CandidateRaw(
+        candidate_id=f"cand-{number}",
+        source=Source.GETONBOARD,
+        source_candidate_id=str(number),
+        created_at=datetime(2024, 5, 1, tzinfo=timezone.utc),
+        full_name="Ada Lovelace",
+        email="ada@example.com",
+        raw_profile_url=f"https://example.com/{number}",
+    )
+
+
+def evaluator(gemini: FakeGemini) -> CandidateEvaluator:
+    builder = PromptBuilder(TEMPLATE, "v1", token_budget=10_000)
+    return CandidateEvaluator(gemini, builder, "job-1")
+
+
+def test_batched_items_are_used_and_gaps_fall_back_to_single_requests():
+    gemini = FakeGemini(dropped={"cand-2"}, invalid={"cand-3"}, failing={"cand-5"})
+    candidates = [candidate(n) for n in range(1, 7)]
+
+    outcomes = evaluator(gemini).evaluate_batched(candidates, batch_size=3)
+
+    assert gemini.batches == [
+        ["cand-1", "cand-2", "cand-3"],
+        ["cand-4", "cand-5", "cand-6"],
+    ]
+    assert gemini.singles == ["cand-2", "cand-3", "cand-4", "cand-5", "cand-6"]
+    assert [o.candidate_id for o in outcomes] == [c.candidate_id for c in candidates]
+    # Batched scores are 4, single-request ones 3.
+    assert [o.fit_score for o in outcomes] == [4, 3, 3, 3, 3, 3]
+    assert {(o.job_post_id, o.prompt_version) for o in outcomes} == {("job-1", "v1")}
+    assert outcomes[0].fit_label is FitLabel.YES
+
+
+def test_failed_single_requests_are_returned_in_place():
+    gemini = FakeGemini(dropped={"cand-broken"})
+    broken = candidate(1).model_copy(update={"candidate_id": "cand-broken"})
+
+    outcomes = evaluator(gemini).evaluate_batched([candidate(2), broken], 2)
+
+    assert isinstance(outcomes[0], CandidateEvaluation)
+    assert isinstance(outcomes[1], ValidationError)
+
+
+def test_evaluate_batch_makes_one_request_without_fallback():
+    gemini = FakeGemini(dropped={"cand-2"})
+
+    found = evaluator(gemini).evaluate_batch([candidate(1), candidate(2)])
+
+    assert sorted(found) == ["cand-1"]
+    assert gemini.batches == [["cand-1", "cand-2"]]
+    assert gemini.singles == []
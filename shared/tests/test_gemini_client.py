@@ -0,0 +1,79 @@
+"""Tests for the Gemini client's retries and concurrent batch API."""
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from shared.llm.gemini_client import GeminiClient
+from shared.llm.rate_limit import AdaptiveRateLimiter
+
+
+class ResourceExhausted(Exception):
+    """Named like the ``google.api_core`` error raised on 429."""
+
+
+class FakeModel:
+    """Answers with the prompt echoed as JSON; throttles chosen prompts once."""
+
+    def __init__(self, throttle: tuple[str, ...] = (), fail: tuple[str, ...] = ()):
+        self.throttle = set(throttle)
+        self.fail = set(fail)
+        self.calls: list[str] = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str, generation_config: dict) -> object:
+        with self._lock:
+            self.calls.append(prompt)
+            if prompt in self.throttle:
+                self.throttle.discard(prompt)
+                raise ResourceExhausted("429 RESOURCE_EXHAUSTED")
+        if prompt in self.fail:
+            raise ValueError(f"bad prompt {prompt}")
+        return SimpleNamespace(text=json.dumps({"prompt": prompt}), usage_metadata=None)
+
+
+def client(model: FakeModel, **kwargs) -> GeminiClient:
+    limiter = AdaptiveRateLimiter(
+        6000, burst=10, backoff_seconds=0.0, sleep=lambda seconds: None
+    )
+    gemini = GeminiClient("fake", max_concurrency=4, rate_limiter=limiter, **kwargs)
+    gemini._model = model
+    return gemini
+
+
+def test_throttled_request_is_retried():
+    model = FakeModel(throttle=("a",))
+
+    assert client(model).generate_structured("a", {}) == {"prompt": "a"}
+    assert model.calls == ["a", "a"]
+
+
+def test_retries_are_bounded():
+    class AlwaysThrottled(FakeModel):
+        def generate_content(self, prompt, generation_config):
+            self.calls.append(prompt)
+            raise ResourceExhausted("429")
+
+    model = AlwaysThrottled()
+
+    with pytest.raises(ResourceExhausted):
+        client(model, max_retries=2).generate("a")
+    assert len(model.calls) == 3
+
+
+def test_generate_structured_many_keeps_prompt_order():
+    prompts = [str(i) for i in range(20)]
+    model = FakeModel(throttle=("3", "7"), fail=("11",))
+
+    results = client(model).generate_structured_many(
+        prompts, {}, return_exceptions=True
+    )
+
+    assert isinstance(results[11], ValueError)
+    assert [r["prompt"] for i, r in enumerate(results) if i != 11] == [
+        p for p in prompts if p != "11"
+    ]
+    with pytest.raises(ValueError):
+        client(FakeModel(fail=("1",))).generate_structured_many(["0", "1"], {})
@@ -0,0 +1,133 @@
+"""Tests for the process-wide Google API services."""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from shared import google_api
+from shared.metrics import collect
+
+
+class FakeHttpRequest:
+    """The part of ``googleapiclient.http.HttpRequest`` the subclass uses."""
+
+    def __init__(self, http, postproc, uri, method="GET", body=None, **kwargs):
+        self.http = http
+        self.postproc = postproc
+        self.uri = uri
+        self.body = body
+
+    def execute(self):
+        response, content = self.http.request(self.uri, body=self.body)
+        return self.postproc(response, content)
+
+
+class FakeAuthorizedHttp:
+    def __init__(self, credentials, http):
+        self.credentials = credentials
+        self.timeout = http.timeout
+        self.thread = threading.get_ident()
+
+    def request(self, uri, body=None):
+        return {"status": "200"}, b'{"thread": %d}' % self.thread
+
+
+@pytest.fixture
+def googleapiclient(monkeypatch):
+    """Fake ``googleapiclient`` modules recording the services built."""
+    built = []
+
+    def build_from_document(document, http, requestBuilder):
+        service = SimpleNamespace(document=document, http=http, request=requestBuilder)
+        built.append(service)
+        return service
+
+    modules = {
+        "googleapiclient": ModuleType("googleapiclient"),
+        "googleapiclient.discovery": SimpleNamespace(
+            build=None, build_from_document=build_from_document
+        ),
+        "googleapiclient.discovery_cache": SimpleNamespace(
+            get_static_doc=lambda api, version: f"{api}.{version}"
+        ),
+        "googleapiclient.http": SimpleNamespace(
+            HttpRequest=FakeHttpRequest,
+            build_http=lambda: SimpleNamespace(timeout=60),
+        ),
+        "google_auth_httplib2": SimpleNamespace(AuthorizedHttp=FakeAuthorizedHttp),
+    }
+    for name, module in modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.setattr(google_api, "_services", {})
+    monkeypatch.setattr(google_api, "_documents", {})
+    monkeypatch.setattr(google_api, "_request_class", None)
+    renewals = []
+    monkeypatch.setattr(
+        google_api, "get_credentials", lambda scopes: renewals.append(scopes) or "adc"
+    )
+    return SimpleNamespace(built=built, renewals=renewals)
+
+
+def test_one_service_per_process_across_request_pools(googleapiclient):
+    services = []
+    for _ in range(3):
+        # A new pool per request, as the handlers start one.
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            services += pool.map(
+                lambda _: google_api.get_service("sheets", "v4"), range(8)
+            )
+
+    assert len(googleapiclient.built) == 1
+    assert {id(service) for service in services} == {id(googleapiclient.built[0])}
+    assert googleapiclient.built[0].document == "sheets.v4"
+    # Every reuse still gives the credentials a chance to renew.
+    assert len(googleapiclient.renewals) == len(services)
+
+
+def test_explicit_credentials_get_their_own_service(googleapiclient):
+    default = google_api.get_service("sheets", "v4")
+    explicit = google_api.get_service("sheets", "v4", credentials="user")
+
+    assert explicit is not default
+    assert explicit.http.credentials == "user"
+    assert google_api.get_service("sheets", "v4", credentials="user") is explicit
+
+
+def test_each_thread_sends_through_its_own_connection(googleapiclient):
+    http = google_api.get_service("drive", "v3").http
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        barrier = threading.Barrier(2)
+
+        def send(_):
+            barrier.wait()
+            return http.request("https://www.googleapis.com/drive/v3/files")
+
+        responses = list(pool.map(send, range(2)))
+
+    threads = {content for _, content in responses}
+    assert len(threads) == 2
+    assert http.request("x")[1] == http.request("y")[1]
+    assert http.timeout == 60
+
+
+def test_requests_are_counted_per_api(googleapiclient):
+    service = google_api.get_service("sheets", "v4")
+    request = service.request(
+        service.http,
+        lambda response, content: content,
+        "https://sheets.googleapis.com/v4/spreadsheets/x/values:batchGet",
+        body=b"{}",
+    )
+
+    with collect() as metrics:
+        request.execute()
+
+    summary = metrics.summary()
+    assert summary["counters"]["sheets.calls"] == 1
+    assert summary["counters"]["sheets.bytes_sent"] == 2
+    assert summary["counters"]["sheets.bytes_received"] > 0
+    assert summary["spans"]["sheets.request"]["count"] == 1
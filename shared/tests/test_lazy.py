@@ -0,0 +1,65 @@
+"""Tests for lazy package exports."""
+
+import ast
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / "lazypkg"
+    root.mkdir()
+    (root / "__init__.py").write_text(
+        textwrap.dedent(
+            """
+            from shared.lazy import lazy_exports
+
+            __getattr__, __dir__ = lazy_exports(
+                __name__, {"Thing": "lazypkg.things", "sub": "lazypkg.sub"}
+            )
+            """
+        )
+    )
+    (root / "things.py").write_text("class Thing:\n    pass\n")
+    (root / "sub.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazypkg"
+    for name in ("lazypkg", "lazypkg.things", "lazypkg.sub"):
+        sys.modules.pop(name, None)
+
+
+def test_names_are_imported_on_first_access(package):
+    import lazypkg
+
+    assert "lazypkg.things" not in sys.modules
+    assert "Thing" in dir(lazypkg)
+
+    thing = lazypkg.Thing
+
+    assert thing is sys.modules["lazypkg.things"].Thing
+    # Cached on the package, so __getattr__ is not consulted again.
+    assert vars(lazypkg)["Thing"] is thing
+    assert lazypkg.sub.VALUE == 1
+    with pytest.raises(AttributeError):
+        lazypkg.Missing
+
+
+def test_importing_shared_packages_loads_no_submodules():
+    script = (
+        "import sys, shared, shared.sheets, shared.llm\n"
+        "print(sorted(m for m in sys.modules if m.startswith('shared.')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parents[2],
+    )
+
+    loaded = ast.literal_eval(result.stdout)
+    assert loaded == ["shared.lazy", "shared.llm", "shared.sheets"]
@@ -0,0 +1,104 @@
+"""Tests for the queued JSON logging and correlation IDs."""
+
+import atexit
+import io
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from shared import logging as shared_logging
+from shared.logging import (
+    ContextThreadPoolExecutor,
+    JsonFormatter,
+    correlation_context,
+    correlation_id_from_headers,
+    flush,
+    get_correlation_id,
+    get_logger,
+)
+
+
+@pytest.fixture
+def log(monkeypatch, request):
+    """A logger on a fresh listener, and the lines it wrote."""
+    monkeypatch.setattr(shared_logging, "_handler", None)
+    monkeypatch.setattr(shared_logging, "_listener", None)
+    logger = get_logger(f"tests.{request.node.name}")
+    listener = shared_logging._listener
+    atexit.unregister(listener.stop)
+    output = io.StringIO()
+    shared_logging._handler.output.setStream(output)
+
+    def lines() -> list[dict]:
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    yield SimpleNamespace(logger=logger, lines=lines)
+    if listener.is_alive():
+        listener.stop()
+    logger.handlers.clear()
+
+
+def test_leaving_the_request_context_drains_the_queue(log, monkeypatch):
+    format_record = JsonFormatter.format
+
+    def slow_format(self, record):
+        time.sleep(0.002)
+        return format_record(self, record)
+
+    monkeypatch.setattr(JsonFormatter, "format", slow_format)
+
+    with correlation_context("request-1"):
+        for number in range(50):
+            log.logger.info("Candidate %s evaluated", number, extra={"number": number})
+
+    written = log.lines()
+    assert [entry["number"] for entry in written] == list(range(50))
+    assert written[7]["message"] == "Candidate 7 evaluated"
+    assert {entry["correlation_id"] for entry in written} == {"request-1"}
+    assert written[0]["logging.googleapis.com/labels"] == {
+        "correlation_id": "request-1"
+    }
+
+
+def test_records_are_written_synchronously_without_a_listener(log):
+    shared_logging._listener.stop()
+
+    log.logger.warning("After shutdown", extra={"job_post_id": "job-1"})
+
+    assert flush() is True
+    [entry] = log.lines()
+    assert entry["severity"] == "WARNING"
+    assert entry["job_post_id"] == "job-1"
+
+
+def test_errors_carry_exception_and_source_location(log):
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.logger.exception("Job failed")
+
+    assert flush()
+    [entry] = log.lines()
+    assert entry["severity"] == "ERROR"
+    assert "ValueError: boom" in entry["exception"]
+    assert entry["logging.googleapis.com/sourceLocation"]["function"] == (
+        "test_errors_carry_exception_and_source_location"
+    )
+
+
+def test_worker_threads_inherit_the_correlation_id():
+    with correlation_context("request-2"):
+        with ContextThreadPoolExecutor(max_workers=2) as pool:
+            ids = list(pool.map(lambda _: get_correlation_id(), range(4)))
+
+    assert ids == ["request-2"] * 4
+    assert get_correlation_id() is None
+
+
+def test_correlation_id_from_headers():
+    assert correlation_id_from_headers({"X-Request-ID": "abc"}) == "abc"
+    trace = {"X-Cloud-Trace-Context": "105445aa7843bc8bf206b1200/1;o=1"}
+    assert correlation_id_from_headers(trace) == "105445aa7843bc8bf206b1200"
+    assert len(correlation_id_from_headers({})) == 32
@@ -0,0 +1,95 @@
+"""Tests for per-invocation counters and spans."""
+
+import asyncio
+import threading
+
+import pytest
+
+from shared.logging import ContextThreadPoolExecutor
+from shared.metrics import collect, current, incr, span
+
+
+def test_calls_outside_a_collection_are_no_ops():
+    incr("sheets.calls")
+    with span("load"):
+        pass
+
+    assert current() is None
+
+
+def test_summary_has_counters_spans_and_hit_rates():
+    with collect() as metrics:
+        incr("sheets.calls")
+        incr("sheets.calls", 2)
+        incr("gemini.latency_s", 0.5)
+        incr("llm_cache.hits", 3)
+        incr("llm_cache.misses")
+        incr("sheets_cache.hits", 0)
+        for _ in range(2):
+            with span("evaluate"):
+                pass
+        with pytest.raises(RuntimeError):
+            with span("write_back"):
+                raise RuntimeError("append failed")
+
+    summary = metrics.summary()
+
+    assert summary["counters"] == {
+        "gemini.latency_s": 0.5,
+        "llm_cache.hits": 3,
+        "llm_cache.misses": 1,
+        "sheets.calls": 3,
+        "sheets_cache.hits": 0,
+    }
+    assert summary["spans"]["evaluate"]["count"] == 2
+    # A span that raised is still timed.
+    assert summary["spans"]["write_back"]["count"] == 1
+    assert set(summary["spans"]["evaluate"]) == {
+        "count",
+        "total_ms",
+        "avg_ms",
+        "max_ms",
+    }
+    assert summary["hit_rates"] == {"llm_cache": 0.75, "sheets_cache": None}
+    assert summary["elapsed_ms"] >= 0
+    assert current() is None
+
+
+def test_worker_threads_and_tasks_record_into_the_invocation():
+    async def task() -> None:
+        incr("gemini.calls")
+
+    async def run_tasks() -> None:
+        await asyncio.gather(*(task() for _ in range(3)))
+
+    with collect() as metrics:
+        with ContextThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: incr("teamtailor.calls"), range(8)))
+        asyncio.run(run_tasks())
+
+    counters = metrics.summary()["counters"]
+    assert counters == {"gemini.calls": 3, "teamtailor.calls": 8}
+
+
+def test_concurrent_invocations_do_not_mix():
+    summaries = {}
+    barrier = threading.Barrier(2)
+
+    def invocation(name: str, calls: int) -> None:
+        with collect() as metrics:
+            barrier.wait()
+            for _ in range(calls):
+                incr("sheets.calls")
+            barrier.wait()
+        summaries[name] = metrics.summary()["counters"]
+
+    threads = [
+        threading.Thread(target=invocation, args=("a", 2)),
+        threading.Thread(target=invocation, args=("b", 5)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert summaries == {"a": {"sheets.calls": 2}, "b": {"sheets.calls": 5}}
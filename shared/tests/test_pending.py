@@ -0,0 +1,139 @@
+"""Tests for the pending push view."""
+
+from datetime import datetime, timedelta, timezone
+
+from shared.schemas import (
+    CandidateEvaluation,
+    Decision,
+    FitLabel,
+    TeamtailorStatus,
+)
+from shared.sheets.pending import PendingPushView
+from shared.sheets.rows import header_for, model_to_row
+from shared.tests.fake_sheets import FakeSpreadsheet
+
+TAB = "candidates_evaluations"
+
+
+def evaluation(number: int, decision: Decision = Decision.PUSH) -> list:
+    record = CandidateEvaluation(
+        evaluation_id=f"eval-{number}",
+        candidate_id=f"cand-{number}",
+        job_post_id="job-1",
+        prompt_version="v1",
+        evaluated_at=datetime(2024, 5, 2, tzinfo=timezone.utc)
+        + timedelta(minutes=number),
+        fit_label=FitLabel.YES,
+        fit_score=4,
+        reasons="Solid background",
+        decision=decision,
+    )
+    return model_to_row(record)
+
+
+def spreadsheet() -> FakeSpreadsheet:
+    rows = [
+        header_for(CandidateEvaluation),
+        evaluation(1),
+        evaluation(2, Decision.HOLD),
+        evaluation(3),
+        evaluation(4),
+        evaluation(5),
+    ]
+    return FakeSpreadsheet({TAB: rows})
+
+
+def status_of(sheet: FakeSpreadsheet, row_number: int) -> str:
+    return sheet.tabs[TAB][row_number - 1][10]
+
+
+def test_refresh_lists_pending_evaluations_in_sheet_order():
+    sheet = spreadsheet()
+    view = PendingPushView(sheet.client("pending-refresh"))
+
+    pending = view.refresh()
+
+    assert [item.evaluation.evaluation_id for item in pending] == [
+        "eval-1",
+        "eval-3",
+        "eval-4",
+        "eval-5",
+    ]
+    assert [item.row_number for item in pending] == [2, 4, 5, 6]
+    # An unchanged revision reads nothing.
+    calls = len(sheet.calls)
+    view.refresh()
+    assert sheet.call_names()[calls:] == ["files.get"]
+
+
+def test_set_statuses_writes_adjacent_rows_in_one_range():
+    sheet = spreadsheet()
+    view = PendingPushView(sheet.client("pending-write"))
+    view.refresh()
+
+    written = view.set_statuses(
+        {
+            "eval-3": TeamtailorStatus.SENT,
+            "eval-4": TeamtailorStatus.FAILED,
+            "eval-1": TeamtailorStatus.SENT,
+            "eval-2": TeamtailorStatus.SENT,
+        }
+    )
+
+    assert written == 2
+    assert sheet.calls[-1] == ("batchUpdate", (f"{TAB}!K2:K2", f"{TAB}!K4:K5"))
+    assert [status_of(sheet, row) for row in (2, 3, 4, 5)] == [
+        "sent",
+        "not_sent",
+        "sent",
+        "failed",
+    ]
+    # Sent evaluations leave the view; failed ones stay to be retried.
+    remaining = {item.evaluation.evaluation_id: item for item in view._snapshot()}
+    assert sorted(remaining) == ["eval-4", "eval-5"]
+    assert remaining["eval-4"].evaluation.teamtailor_status is TeamtailorStatus.FAILED
+
+
+def test_set_statuses_follows_moved_rows_and_drops_deleted_ones():
+    sheet = spreadsheet()
+    view = PendingPushView(sheet.client("pending-moved"))
+    view.refresh()
+    # A recruiter swaps rows 4 and 5 and deletes the last evaluation.
+    rows = sheet.tabs[TAB]
+    rows[3], rows[4] = rows[4], rows[3]
+    del rows[5]
+
+    written = view.set_statuses(
+        {"eval-3": TeamtailorStatus.SENT, "eval-5": TeamtailorStatus.SENT}
+    )
+
+    assert written == 1
+    assert sheet.calls[-1] == ("batchUpdate", (f"{TAB}!K5:K5",))
+    assert rows[4][0] == "eval-3"
+    assert status_of(sheet, 5) == "sent"
+    assert status_of(sheet, 4) == "not_sent"
+    assert [item.evaluation.evaluation_id for item in view._snapshot()] == [
+        "eval-1",
+        "eval-4",
+    ]
+
+
+def test_scattered_rows_are_read_in_bounded_batch_gets():
+    decisions = [Decision.PUSH, Decision.HOLD]
+    rows = [header_for(CandidateEvaluation)]
+    rows += [evaluation(number, decisions[number % 2]) for number in range(250)]
+    sheet = FakeSpreadsheet({TAB: rows})
+    view = PendingPushView(sheet.client("pending-scattered"))
+
+    pending = view.refresh()
+    fetched = [args for name, args in sheet.calls if name == "batchGet"][1:]
+    calls = len(sheet.calls)
+    view.set_statuses(
+        {item.evaluation.evaluation_id: TeamtailorStatus.SENT for item in pending}
+    )
+    located = [args for name, args in sheet.calls[calls:] if name == "batchGet"]
+
+    assert len(pending) == 125
+    assert [len(ranges) for ranges in fetched] == [100, 25]
+    assert [len(ranges) for ranges in located] == [100, 25]
+    assert view._snapshot() == []
@@ -0,0 +1,93 @@
+"""Tests for the streaming pipeline helpers."""
+
+import time
+
+import pytest
+
+from shared.pipeline import BackgroundWriter, prefetch
+
+
+def test_prefetch_yields_items_in_order():
+    assert list(prefetch(iter(range(10)), depth=3)) == list(range(10))
+
+
+def test_prefetch_stays_at_most_depth_items_ahead():
+    produced = []
+
+    def pages():
+        for page in range(10):
+            produced.append(page)
+            yield page
+
+    items = prefetch(pages(), depth=2)
+    assert next(items) == 0
+    # Give the producer time to run as far ahead as it is allowed to.
+    time.sleep(0.2)
+
+    assert produced == [0, 1, 2]
+    items.close()
+
+
+def test_prefetch_reraises_producer_errors():
+    def pages():
+        yield 1
+        raise ConnectionError("page 2")
+
+    items = prefetch(pages())
+
+    assert next(items) == 1
+    with pytest.raises(ConnectionError):
+        next(items)
+
+
+def test_prefetch_stops_the_producer_when_the_consumer_stops():
+    produced = []
+
+    def pages():
+        for page in range(1000):
+            produced.append(page)
+            yield page
+
+    for page in prefetch(pages()):
+        if page == 2:
+            break
+    time.sleep(0.2)
+
+    assert len(produced) <= 4
+
+
+def test_background_writer_writes_in_submission_order():
+    written = []
+
+    with BackgroundWriter(written.append, depth=2) as writer:
+        for item in range(20):
+            writer.submit(item)
+
+    assert written == list(range(20))
+    assert writer.written == 20
+
+
+def test_background_writer_reraises_the_first_sink_error():
+    def sink(item: int) -> None:
+        if item == 1:
+            raise OSError("quota")
+
+    writer = BackgroundWriter(sink)
+    writer.submit(0)
+    writer.submit(1)
+
+    with pytest.raises(OSError):
+        for item in range(2, 10):
+            writer.submit(item)
+        writer.close()
+    assert writer.written == 1
+
+
+def test_background_writer_lets_the_block_error_win():
+    def sink(item: int) -> None:
+        raise OSError("quota")
+
+    with pytest.raises(KeyError):
+        with BackgroundWriter(sink) as writer:
+            writer.submit(0)
+            raise KeyError("transform")
@@ -0,0 +1,89 @@
+"""Tests for on-demand profiling of invocations."""
+
+import base64
+import json
+import pstats
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from shared.profiling import StackSampler, requested_profile, run_profiled
+
+
+def request(headers=None, args=None) -> SimpleNamespace:
+    return SimpleNamespace(headers=headers or {}, args=args or {})
+
+
+def handler(request) -> tuple[str, int]:
+    total = sum(i * i for i in range(20_000))
+    return json.dumps({"total": total}), 200
+
+
+@pytest.fixture
+def enabled(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROFILING_ENABLED", "true")
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_requested_profile_reads_header_or_query(enabled):
+    assert requested_profile(request({"X-Profile": "1"})) == "cprofile"
+    assert requested_profile(request({"X-Profile": " Sample "})) == "sample"
+    assert requested_profile(request(args={"profile": "cprofile"})) == "cprofile"
+    assert requested_profile(request({"X-Profile": "perf"})) is None
+    assert requested_profile(request()) is None
+
+
+def test_profiles_are_ignored_unless_enabled(monkeypatch):
+    monkeypatch.delenv("PROFILING_ENABLED", raising=False)
+
+    assert requested_profile(request({"X-Profile": "1"})) is None
+
+
+def test_cprofile_report_is_saved_and_inlined(enabled):
+    body, status = run_profiled(
+        "evaluate_candidate",
+        handler,
+        request({"X-Profile-Output": "inline"}),
+        "cprofile",
+    )
+
+    payload = json.loads(body)
+    report = payload["profile"]
+    assert status == 200
+    assert payload["total"] == sum(i * i for i in range(20_000))
+    assert report["path"].startswith(str(enabled))
+    assert report["path"].endswith(".pstats")
+    assert "handler" in report["summary"]
+    data = base64.b64decode(report["pstats_base64"])
+    with open(report["path"], "rb") as f:
+        assert f.read() == data
+    stats = pstats.Stats(report["path"])
+    assert any(name == "handler" for _, _, name in stats.stats)
+
+
+def test_sample_profile_sees_worker_threads(enabled):
+    def threaded(request) -> tuple[str, int]:
+        worker = threading.Thread(target=time.sleep, args=(0.1,), name="worker")
+        worker.start()
+        worker.join()
+        return "not json", 202
+
+    body, status = run_profiled("push_teamtailor", threaded, request(), "sample")
+
+    # Non-JSON bodies are returned as they are.
+    assert (body, status) == ("not json", 202)
+    [path] = enabled.glob("push_teamtailor-*.collapsed")
+    stacks = path.read_text().splitlines()
+    assert any(line.startswith("worker;") for line in stacks)
+
+
+def test_stack_sampler_counts_samples():
+    with StackSampler(interval_seconds=0.001) as sampler:
+        time.sleep(0.05)
+
+    assert sampler.samples > 0
+    counts = [line.rsplit(" ", 1)[1] for line in sampler.collapsed().split("\n")]
+    assert all(count.isdigit() for count in counts)
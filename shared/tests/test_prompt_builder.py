@@ -0,0 +1,113 @@
+"""Tests for prompt template compilation and rendering."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from shared.llm.prompt_builder import (
+    BATCH_INSTRUCTIONS,
+    CompiledTemplate,
+    PromptBuilder,
+    PromptTemplateError,
+    compile_template,
+)
+from shared.llm.tokens import estimate_tokens
+from shared.schemas import CandidateRaw, Source
+
+TEMPLATE = "Job {{ job_post_name }} ({{job_post_id}}).\nCandidate:\n{{ candidate }}"
+
+
+def candidate(number: int = 1) -> CandidateRaw:
+    return CandidateRaw(
+        candidate_id=f"cand-{number}",
+        source=Source.GETONBOARD,
+        source_candidate_id=str(number),
+        created_at=datetime(2024, 5, 1, 10, 0, tzinfo=timezone.utc),
+        full_name="Ada Lovelace",
+        email="ada@example.com",
+        raw_profile_url=f"https://example.com/{number}",
+    )
+
+
+def test_compiled_template_interleaves_literals_and_placeholders():
+    compiled = CompiledTemplate(TEMPLATE)
+
+    assert compiled.placeholders == ("job_post_name", "job_post_id", "candidate")
+    assert len(compiled.literals) == len(compiled.placeholders) + 1
+    assert (
+        compiled.render(
+            {"job_post_name": "Backend", "job_post_id": "j1", "candidate": "Ada"}
+        )
+        == "Job Backend (j1).\nCandidate:\nAda"
+    )
+
+
+def test_render_requires_every_placeholder():
+    with pytest.raises(KeyError):
+        CompiledTemplate(TEMPLATE).render({"candidate": "Ada"})
+
+
+@pytest.mark.parametrize(
+    "template",
+    ["{{ candidate }} {{ job_description }}", "Evaluate {{ job_post_id }}"],
+)
+def test_invalid_templates_are_rejected(template):
+    with pytest.raises(PromptTemplateError):
+        CompiledTemplate(template)
+
+
+def test_compile_template_is_memoized_per_version_and_content():
+    compiled = compile_template(TEMPLATE, "v1")
+
+    assert compile_template(TEMPLATE, "v1") is compiled
+    assert compile_template(TEMPLATE, "v2") is not compiled
+
+
+def test_build_includes_candidate_fields_in_priority_order():
+    builder = PromptBuilder(TEMPLATE, "v1", token_budget=10_000)
+
+    prompt = builder.build(candidate(), job_post_name="Backend", job_post_id="j1")
+
+    assert prompt.startswith("Job Backend (j1).\nCandidate:\ncandidate_id: cand-1\n")
+    assert prompt.index("full_name: Ada") < prompt.index("source: getonboard")
+
+
+def test_build_with_estimate_truncates_low_priority_fields_first():
+    builder = PromptBuilder(TEMPLATE, "v1", token_budget=60)
+    details = {"cv_text": "x" * 2000}
+
+    built = builder.build_with_estimate(
+        candidate(), details, job_post_name="Backend", job_post_id="j1"
+    )
+
+    assert built.truncated_fields[0] == "cv_text"
+    assert "candidate_id" not in built.truncated_fields
+    assert "candidate_id: cand-1" in built.text
+    assert built.estimated_tokens == estimate_tokens(built.text)
+    assert built.estimated_tokens <= 60
+
+
+def test_build_batch_gives_each_candidate_a_heading():
+    builder = PromptBuilder(TEMPLATE, "v1", token_budget=10_000)
+
+    built = builder.build_batch(
+        [candidate(1), candidate(2)], job_post_name="Backend", job_post_id="j1"
+    )
+
+    assert "### candidate_id: cand-1\ncandidate_id: cand-1" in built.text
+    assert "### candidate_id: cand-2\ncandidate_id: cand-2" in built.text
+    assert built.text.endswith(BATCH_INSTRUCTIONS)
+    assert built.truncated_fields == []
+
+
+def test_build_batch_splits_the_budget_between_candidates():
+    builder = PromptBuilder(TEMPLATE, "v1", token_budget=150)
+    details = {c: {"cv_text": "word " * 400} for c in ("cand-1", "cand-2")}
+
+    built = builder.build_batch(
+        [candidate(1), candidate(2)], details, job_post_name="B", job_post_id="j"
+    )
+
+    assert built.truncated_fields[:1] == ["cand-1.cv_text"]
+    assert "cand-2.cv_text" in built.truncated_fields
+    assert built.estimated_tokens <= 150
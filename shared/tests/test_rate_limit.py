@@ -0,0 +1,99 @@
+"""Tests for the adaptive rate limiter."""
+
+import threading
+
+import pytest
+
+from shared.llm.rate_limit import AdaptiveRateLimiter, is_rate_limit_error
+
+
+class FakeClock:
+    """Manual clock whose ``sleep`` advances time instead of blocking."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def limiter(clock: FakeClock, **kwargs) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(
+        requests_per_minute=480, clock=clock, sleep=clock.sleep, **kwargs
+    )
+
+
+def test_concurrent_throttles_back_off_once():
+    clock = FakeClock()
+    rate_limiter = limiter(clock, burst=8, backoff_seconds=2.0)
+    sent = [rate_limiter.acquire() for _ in range(8)]
+    start = threading.Barrier(8)
+
+    def throttled(sent_at: float) -> None:
+        start.wait()
+        rate_limiter.on_throttled(sent_at=sent_at)
+
+    threads = [threading.Thread(target=throttled, args=(s,)) for s in sent]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert rate_limiter._paused_until - clock.now == pytest.approx(2.0)
+    assert rate_limiter.rate == rate_limiter.max_rate / 2
+
+
+def test_consecutive_throttles_double_up_to_the_cap():
+    clock = FakeClock()
+    rate_limiter = limiter(clock, backoff_seconds=2.0, max_backoff_seconds=10.0)
+    pauses = []
+    for _ in range(6):
+        sent_at = rate_limiter.acquire()
+        rate_limiter.on_throttled(sent_at=sent_at)
+        pauses.append(rate_limiter._paused_until - clock.now)
+
+    assert pauses == [2.0, 4.0, 8.0, 10.0, 10.0, 10.0]
+
+
+def test_retry_after_is_honoured_but_capped():
+    clock = FakeClock()
+    rate_limiter = limiter(clock, max_backoff_seconds=30.0)
+
+    rate_limiter.on_throttled(retry_after=12.0)
+    assert rate_limiter._paused_until - clock.now == 12.0
+
+    clock.now = rate_limiter._paused_until
+    rate_limiter.on_throttled(retry_after=600.0)
+    assert rate_limiter._paused_until - clock.now == 30.0
+
+
+def test_acquire_waits_out_the_pause_and_success_restores_the_rate():
+    clock = FakeClock()
+    rate_limiter = limiter(clock, backoff_seconds=5.0)
+    rate_limiter.on_throttled()
+
+    sent_at = rate_limiter.acquire()
+
+    assert sent_at >= 105.0
+    assert sum(clock.slept) >= 5.0
+    for _ in range(100):
+        rate_limiter.on_success()
+    assert rate_limiter.rate == rate_limiter.max_rate
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (type("ResourceExhausted", (Exception,), {})(), True),
+        (type("HttpError", (Exception,), {"code": 429})(), True),
+        (RuntimeError("429 RESOURCE_EXHAUSTED: quota"), True),
+        (RuntimeError("500 internal"), False),
+    ],
+)
+def test_is_rate_limit_error(exc, expected):
+    assert is_rate_limit_error(exc) is expected
@@ -0,0 +1,96 @@
+"""Tests for the re-evaluation planner."""
+
+from datetime import datetime, timezone
+
+from shared.llm import prompt_content_hash
+from shared.reevaluation import (
+    REASON_CONTENT,
+    REASON_UNHASHED,
+    REASON_VERSION,
+    latest_evaluations,
+    plan_reevaluation,
+)
+from shared.schemas import CandidateEvaluation, FitLabel, JobPost, Prompt
+
+PROMPTS = [
+    Prompt(job_post_id="job-1", prompt_version="v1", prompt_content="Old"),
+    Prompt(job_post_id="job-1", prompt_version="v2", prompt_content="Current"),
+]
+CURRENT_HASH = prompt_content_hash("Current")
+
+
+def job(job_post_id: str, version: str = "v2", active: bool = True) -> JobPost:
+    return JobPost(
+        job_post_id=job_post_id,
+        job_post_name="Backend Engineer",
+        active=active,
+        getonboard_url=f"https://example.com/{job_post_id}",
+        default_prompt_version=version,
+    )
+
+
+def evaluation(candidate_id: str, day: int, **fields) -> CandidateEvaluation:
+    values = {
+        "evaluation_id": f"eval-{candidate_id}-{day}",
+        "candidate_id": candidate_id,
+        "job_post_id": "job-1",
+        "prompt_version": "v2",
+        "prompt_hash": CURRENT_HASH,
+        "evaluated_at": datetime(2024, 5, day, tzinfo=timezone.utc),
+        "fit_label": FitLabel.MAYBE,
+        "fit_score": 3,
+        "reasons": "Some experience",
+    }
+    values.update(fields)
+    return CandidateEvaluation(**values)
+
+
+def test_latest_evaluation_per_pair_mixes_naive_and_aware_times():
+    naive = evaluation("cand-1", 3, evaluated_at=datetime(2024, 5, 3, 12))
+    evaluations = [
+        evaluation("cand-1", 2),
+        naive,
+        evaluation("cand-1", 1),
+        evaluation("cand-1", 1, job_post_id="job-2"),
+    ]
+
+    latest = latest_evaluations(evaluations)
+
+    assert latest[("cand-1", "job-1")] is naive
+    assert latest[("cand-1", "job-2")].evaluation_id == "eval-cand-1-1"
+
+
+def test_plan_lists_only_outdated_latest_evaluations():
+    evaluations = [
+        # Re-evaluated with the current prompt since: up to date.
+        evaluation("cand-1", 1, prompt_version="v1"),
+        evaluation("cand-1", 2),
+        evaluation("cand-2", 1, prompt_version="v1"),
+        evaluation("cand-3", 1, prompt_hash=prompt_content_hash("Draft")),
+        evaluation("cand-4", 1, prompt_hash=None),
+        # Jobs that are inactive or unknown are ignored.
+        evaluation("cand-5", 1, job_post_id="job-2", prompt_version="v0"),
+        evaluation("cand-6", 1, job_post_id="job-9", prompt_version="v0"),
+    ]
+    jobs = [job("job-1"), job("job-2", active=False), job("job-3", version="v9")]
+
+    plan = plan_reevaluation(jobs, PROMPTS, evaluations)
+
+    assert [(item.candidate_id, item.reason) for item in plan.items] == [
+        ("cand-2", REASON_VERSION),
+        ("cand-3", REASON_CONTENT),
+    ]
+    assert {item.prompt_version for item in plan.items} == {"v2"}
+    assert plan.up_to_date == 2
+    assert plan.missing_prompts == ["job-3"]
+    assert plan.counts() == {REASON_VERSION: 1, REASON_CONTENT: 1}
+
+
+def test_unhashed_rows_are_only_planned_on_request():
+    evaluations = [evaluation("cand-1", 1, prompt_hash=None)]
+
+    assert len(plan_reevaluation([job("job-1")], PROMPTS, evaluations)) == 0
+    plan = plan_reevaluation(
+        [job("job-1")], PROMPTS, evaluations, include_unhashed=True
+    )
+    assert [item.reason for item in plan.items] == [REASON_UNHASHED]
@@ -0,0 +1,212 @@
+"""Tests for the tab repositories' coalesced reads and writes."""
+
+from datetime import datetime, timedelta, timezone
+
+from shared.schemas import (
+    CandidateEvaluation,
+    CandidateRaw,
+    Decision,
+    FitLabel,
+    Source,
+    TeamtailorStatus,
+)
+from shared.sheets.repositories import CandidateRepository, EvaluationRepository
+from shared.sheets.rows import header_for, model_to_row
+from shared.tests.fake_sheets import FakeSpreadsheet
+
+TAB = "candidates_raw"
+
+
+def candidate(number: int, **fields: str) -> CandidateRaw:
+    created_at = datetime(2024, 5, 1, tzinfo=timezone.utc) + timedelta(minutes=number)
+    values = {
+        "candidate_id": f"cand-{number}",
+        "source": Source.GETONBOARD,
+        "source_candidate_id": str(number),
+        "created_at": created_at,
+        "full_name": f"Candidate {number}",
+        "email": f"candidate{number}@example.com",
+        "raw_profile_url": f"https://example.com/{number}",
+    }
+    values.update(fields)
+    return CandidateRaw(**values)
+
+
+def spreadsheet(count: int) -> FakeSpreadsheet:
+    rows = [header_for(CandidateRaw)]
+    rows += [model_to_row(candidate(number)) for number in range(1, count + 1)]
+    return FakeSpreadsheet({TAB: rows})
+
+
+def test_duplicate_rows_resolve_to_the_first_row_by_every_key():
+    sheet = spreadsheet(2)
+    # A re-imported copy of candidate 1 under another ID, and a row that
+    # repeats candidate 2's ID.
+    sheet.tabs[TAB].append(model_to_row(candidate(1, candidate_id="cand-9")))
+    sheet.tabs[TAB].append(
+        model_to_row(candidate(5, candidate_id="cand-2", email="x@example.com"))
+    )
+    repository = CandidateRepository(sheet.client())
+
+    first = repository.get_all()[0]
+    assert repository.get_by_source_id(Source.GETONBOARD, "1") == first
+    assert repository.get_by_email("Candidate1@Example.com ") == first
+    assert repository.get_by_id("cand-2").email == "candidate2@example.com"
+    assert repository.get_by_id("cand-9").candidate_id == "cand-9"
+    assert repository.find_duplicate(candidate(7, email="candidate1@example.com"))
+
+
+def test_staged_changes_keep_indexes_up_to_date():
+    repository = CandidateRepository(spreadsheet(2).client())
+    record = repository.get_by_id("cand-1")
+
+    repository.stage(record.model_copy(update={"email": "new@example.com"}))
+    repository.stage(candidate(3))
+
+    assert repository.get_by_email("candidate1@example.com") is None
+    assert repository.get_by_email("new@example.com").candidate_id == "cand-1"
+    assert repository.exists("cand-3")
+    assert repository.has_pending_changes
+
+
+def test_evaluation_indexes():
+    def evaluation(number: int, candidate_id: str, **fields) -> CandidateEvaluation:
+        values = {
+            "evaluation_id": f"eval-{number}",
+            "candidate_id": candidate_id,
+            "job_post_id": "job-1",
+            "prompt_version": "v1",
+            "evaluated_at": datetime(2024, 5, 2, 9, number, tzinfo=timezone.utc),
+            "fit_label": FitLabel.YES,
+            "fit_score": 4,
+            "reasons": "Solid background",
+        }
+        values.update(fields)
+        return CandidateEvaluation(**values)
+
+    rows = [header_for(CandidateEvaluation)] + [
+        model_to_row(evaluation(1, "cand-1")),
+        model_to_row(evaluation(2, "cand-1", decision=Decision.PUSH)),
+        model_to_row(evaluation(3, "cand-404", decision=Decision.PUSH)),
+    ]
+    sheet = spreadsheet(1)
+    sheet.tabs["candidates_evaluations"] = rows
+    evaluations = EvaluationRepository(sheet.client())
+
+    # Later rows win for the (candidate, job, prompt) key: the latest run.
+    assert evaluations.get_by_key("cand-1", "job-1", "v1").evaluation_id == "eval-2"
+    assert [e.evaluation_id for e in evaluations.get_for_candidate("cand-1")] == [
+        "eval-1",
+        "eval-2",
+    ]
+    assert [e.evaluation_id for e in evaluations.get_pending_push()] == [
+        "eval-2",
+        "eval-3",
+    ]
+    orphans = evaluations.find_orphans(CandidateRepository(sheet.client()))
+    assert [e.evaluation_id for e in orphans] == ["eval-3"]
+
+    sent = evaluations.get_by_id("eval-2").model_copy(
+        update={"teamtailor_status": TeamtailorStatus.SENT}
+    )
+    evaluations.stage(sent, fields=["teamtailor_status"])
+    assert [e.evaluation_id for e in evaluations.get_pending_push()] == ["eval-3"]
+
+
+def test_flush_writes_separate_fields_as_separate_ranges():
+    sheet = spreadsheet(4)
+    repository = CandidateRepository(sheet.client())
+    for record in repository.get_all()[1:3]:
+        changed = record.model_copy(
+            update={"email": "new@example.com", "cv_url": "https://cv"}
+        )
+        repository.stage(changed, fields=["email", "cv_url"])
+    # A recruiter edit between the two changed columns must survive.
+    sheet.tabs[TAB][2][7] = "https://linkedin.com/in/x"
+
+    assert repository.flush() == 2
+    assert sheet.calls[-1] == ("batchUpdate", (f"{TAB}!F3:F4", f"{TAB}!I3:I4"))
+    assert sheet.tabs[TAB][2][5] == "new@example.com"
+    assert sheet.tabs[TAB][3][8] == "https://cv"
+    assert sheet.tabs[TAB][2][7] == "https://linkedin.com/in/x"
+    assert sheet.tabs[TAB][4][5] == "candidate4@example.com"
+
+
+def test_flush_writes_whole_rows_without_fields():
+    sheet = spreadsheet(3)
+    repository = CandidateRepository(sheet.client())
+    record = repository.get_by_id("cand-2")
+    repository.stage(record.model_copy(update={"full_name": "Renamed"}))
+
+    assert repository.flush() == 1
+    assert sheet.calls[-1] == ("batchUpdate", (f"{TAB}!A3:J3",))
+    assert sheet.tabs[TAB][2][4] == "Renamed"
+
+
+def test_flush_reloads_when_append_range_is_unknown():
+    sheet = spreadsheet(2)
+    sheet.report_updated_range = False
+    repository = CandidateRepository(sheet.client())
+    repository.save(candidate(3))
+
+    # The appended row is read back from the tab, so a later change to it
+    # is written in place instead of being appended again.
+    record = repository.get_by_id("cand-3")
+    repository.stage(record.model_copy(update={"phone": "+56 9"}), fields=["phone"])
+    repository.flush()
+
+    assert sheet.calls[-1] == ("batchUpdate", (f"{TAB}!G4:G4",))
+    assert len(sheet.tabs[TAB]) == 4
+    assert sheet.tabs[TAB][3][6] == "+56 9"
+
+
+def test_flush_records_row_numbers_of_appended_rows():
+    sheet = spreadsheet(2)
+    repository = CandidateRepository(sheet.client())
+    repository.save_many([candidate(3), candidate(4)])
+
+    assert repository.row_number_of(candidate(4)) == 5
+    assert sheet.call_names().count("get") == 1
+
+
+def test_fetch_by_reads_only_matching_rows():
+    sheet = spreadsheet(6)
+    repository = CandidateRepository(sheet.client())
+
+    found = repository.fetch_by("candidate_id", ["cand-2", "cand-3", "cand-5", "x"])
+
+    assert sorted(found) == ["cand-2", "cand-3", "cand-5"]
+    assert found["cand-5"].email == "candidate5@example.com"
+    assert sheet.calls == [
+        ("batchGet", (f"{TAB}!A2:A",)),
+        ("batchGet", (f"{TAB}!A3:J4", f"{TAB}!A6:J6")),
+    ]
+    assert repository.fetch_by("candidate_id", []) == {}
+
+
+def test_fetch_by_splits_scattered_rows_into_bounded_batch_gets():
+    sheet = spreadsheet(250)
+    repository = CandidateRepository(sheet.client())
+    wanted = [f"cand-{number}" for number in range(1, 251, 2)]
+
+    found = repository.fetch_by("candidate_id", wanted)
+
+    assert sorted(found) == sorted(wanted)
+    batch_gets = [args for name, args in sheet.calls if name == "batchGet"]
+    assert [len(ranges) for ranges in batch_gets] == [1, 100, 25]
+
+
+def test_project_reads_only_the_requested_columns():
+    sheet = spreadsheet(3)
+    sheet.tabs[TAB][2][6] = "+56 9"
+    repository = CandidateRepository(sheet.client())
+
+    rows = repository.project(["email", "phone", "candidate_id"])
+
+    assert sheet.calls == [("batchGet", (f"{TAB}!A2:A", f"{TAB}!F2:G"))]
+    assert rows[1] == ("candidate2@example.com", "+56 9", "cand-2", 3)
+    assert rows[0].phone is None
+    partial = repository.project(["email"], partial=True)
+    assert partial[2].email == "candidate3@example.com"
+    assert partial[2].model_fields_set == {"email"}
+
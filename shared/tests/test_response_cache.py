@@ -0,0 +1,89 @@
+"""Tests for the LLM response cache."""
+
+import sqlite3
+
+from shared.llm.response_cache import ResponseCache, SQLiteResponseStore, cache_key
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_key_depends_on_every_input():
+    key = cache_key("gemini", 0.0, {"type": "object"}, "prompt")
+
+    assert key == cache_key("gemini", 0.0, {"type": "object"}, "prompt")
+    assert key != cache_key("gemini", 0.0, {"type": "object"}, "prompt!")
+    assert key != cache_key("gemini", 0.5, {"type": "object"}, "prompt")
+    assert key != cache_key("other", 0.0, {"type": "object"}, "prompt")
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(max_memory_bytes=30)
+    cache.put("a", {"v": "aaaa"})
+    cache.put("b", {"v": "bbbb"})
+    cache.get("a")
+    cache.put("c", {"v": "cccc"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": "aaaa"}
+    assert cache.get("c") == {"v": "cccc"}
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_store_backs_the_memory_tier(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    ResponseCache(SQLiteResponseStore(path)).put("k", {"fit": "yes"})
+
+    cache = ResponseCache(SQLiteResponseStore(path))
+
+    assert cache.get("k") == {"fit": "yes"}
+
+
+def test_store_evicts_oldest_entries_beyond_max_bytes(tmp_path):
+    clock = FakeClock()
+    store = SQLiteResponseStore(str(tmp_path / "c.sqlite"), max_bytes=25, clock=clock)
+    for key in "abcd":
+        clock.now += 1
+        store.put(key, key * 10)
+
+    assert store.size_bytes == 20
+    assert [store.get(key) for key in "abcd"] == [None, None, "c" * 10, "d" * 10]
+    store.put("huge", "x" * 26)
+    assert store.get("huge") is None
+    assert len(store) == 2
+
+
+def test_store_expires_entries_after_ttl(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / "c.sqlite")
+    store = SQLiteResponseStore(path, ttl_seconds=60, clock=clock)
+    store.put("old", "1")
+    clock.now += 30
+    store.put("new", "2")
+    clock.now += 45
+
+    assert store.get("old") is None
+    assert store.get("new") == "2"
+    store.close()
+
+    reopened = SQLiteResponseStore(path, ttl_seconds=60, clock=clock)
+    assert len(reopened) == 1
+    assert reopened.size_bytes == 1
+
+
+def test_store_upgrades_files_without_limits(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE responses (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("INSERT INTO responses VALUES ('k', 'value')")
+    conn.commit()
+    conn.close()
+
+    assert SQLiteResponseStore(path, ttl_seconds=None).get("k") == "value"
+    # Without a recorded age, old entries are the first to expire.
+    assert SQLiteResponseStore(path).get("k") is None
@@ -0,0 +1,186 @@
+"""Tests for the bulk row codec."""
+
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from shared.schemas import (
+    CandidateEvaluation,
+    CandidateRaw,
+    Decision,
+    FitLabel,
+    TeamtailorStatus,
+    get_row_codec,
+)
+
+CANDIDATE_HEADER = [
+    "candidate_id",
+    "source",
+    "source_candidate_id",
+    "created_at",
+    "full_name",
+    "email",
+    "phone",
+    "linkedin_url",
+    "cv_url",
+    "raw_profile_url",
+]
+
+
+def candidate_row(**cells: str) -> list[str]:
+    row = {
+        "candidate_id": "cand-1",
+        "source": "getonboard",
+        "source_candidate_id": "42",
+        "created_at": "2024-05-01T10:00:00+00:00",
+        "full_name": "Ada Lovelace",
+        "email": "ada@example.com",
+        "phone": "",
+        "linkedin_url": "",
+        "cv_url": "",
+        "raw_profile_url": "https://example.com/42",
+    }
+    row.update(cells)
+    return [row[name] for name in CANDIDATE_HEADER]
+
+
+def evaluation_row(**cells: str) -> list[str]:
+    codec = get_row_codec(CandidateEvaluation)
+    row = {
+        "evaluation_id": "eval-1",
+        "candidate_id": "cand-1",
+        "job_post_id": "job-1",
+        "prompt_version": "v1",
+        "evaluated_at": "2024-05-02T09:30:00+00:00",
+        "fit_label": "yes",
+        "fit_score": "4",
+        "reasons": "Solid background",
+        "red_flags": "",
+        "decision": "",
+        "teamtailor_status": "",
+        "prompt_hash": "",
+    }
+    row.update(cells)
+    return [row[name] for name in codec.fields]
+
+
+def test_decode_parses_cells_and_fills_defaults():
+    codec = get_row_codec(CandidateEvaluation)
+    (evaluation,) = codec.decode([evaluation_row()])
+
+    assert evaluation.fit_label is FitLabel.YES
+    assert evaluation.fit_score == 4
+    assert evaluation.evaluated_at == datetime(2024, 5, 2, 9, 30, tzinfo=timezone.utc)
+    assert evaluation.decision is Decision.HOLD
+    assert evaluation.teamtailor_status is TeamtailorStatus.NOT_SENT
+    assert evaluation.red_flags is None
+
+
+def test_decode_matches_strict_decode():
+    codec = get_row_codec(CandidateRaw)
+    rows = [candidate_row(), candidate_row(candidate_id="cand-2", phone="+56 9")]
+
+    fast = codec.decode(rows, header=CANDIDATE_HEADER)
+    strict = codec.decode(rows, header=CANDIDATE_HEADER, strict=True)
+
+    assert [r.model_dump() for r in fast] == [r.model_dump() for r in strict]
+
+
+def test_decode_follows_header_order_and_pads_short_rows():
+    codec = get_row_codec(CandidateRaw)
+    header = list(reversed(CANDIDATE_HEADER))
+    row = list(reversed(candidate_row()))
+    # Sheets drops trailing empty cells.
+    while row and row[-1] == "":
+        row.pop()
+
+    (candidate,) = codec.decode([row], header=header)
+
+    assert candidate.email == "ada@example.com"
+    assert candidate.phone is None
+
+
+def test_decode_rejects_empty_required_cell():
+    codec = get_row_codec(CandidateRaw)
+    rows = [candidate_row(), candidate_row(candidate_id="cand-2", email="")]
+
+    with pytest.raises(ValidationError, match="email"):
+        codec.decode(rows, header=CANDIDATE_HEADER)
+
+
+def test_decode_rejects_missing_required_column():
+    codec = get_row_codec(CandidateRaw)
+    header = [name for name in CANDIDATE_HEADER if name != "email"]
+    row = [
+        cell for name, cell in zip(CANDIDATE_HEADER, candidate_row()) if name != "email"
+    ]
+
+    with pytest.raises(ValidationError, match="email"):
+        codec.decode([row], header=header)
+
+
+def test_decode_rejects_out_of_range_score():
+    codec = get_row_codec(CandidateEvaluation)
+
+    with pytest.raises(ValidationError, match="fit_score"):
+        codec.decode([evaluation_row(), evaluation_row(fit_score="9")])
+
+
+def test_decode_rejects_unknown_enum_value():
+    codec = get_row_codec(CandidateEvaluation)
+
+    with pytest.raises(ValidationError):
+        codec.decode([evaluation_row(fit_label="perhaps")])
+
+
+def test_parse_cell_checks_required_and_constraints():
+    codec = get_row_codec(CandidateEvaluation)
+
+    assert codec.parse_cell("fit_score", "5") == 5
+    assert codec.parse_cell("red_flags", "") is None
+    with pytest.raises(ValidationError, match="fit_score"):
+        codec.parse_cell("fit_score", "0")
+    with pytest.raises(ValidationError, match="evaluation_id"):
+        codec.parse_cell("evaluation_id", "")
+
+
+def test_encode_round_trips():
+    codec = get_row_codec(CandidateEvaluation)
+    row = evaluation_row(decision="push", prompt_hash="abc123")
+
+    (evaluation,) = codec.decode([row])
+    (encoded,) = codec.encode([evaluation])
+
+    assert codec.decode([encoded])[0] == evaluation
+    assert codec.encode_one(evaluation) == encoded
+
+
+def test_decoded_models_behave_like_validated_ones():
+    codec = get_row_codec(CandidateEvaluation)
+
+    (evaluation,) = codec.decode([evaluation_row()])
+
+    assert evaluation.model_fields_set == set(codec.fields)
+    assert evaluation == CandidateEvaluation.model_validate(evaluation.model_dump())
+    copy = evaluation.model_copy(update={"decision": Decision.PUSH})
+    assert copy.decision is Decision.PUSH
+    assert evaluation.decision is Decision.HOLD
+
+
+def test_decode_partial_fills_defaults_for_empty_cells():
+    codec = get_row_codec(CandidateEvaluation)
+
+    partial = codec.decode_partial(
+        {"evaluation_id": "eval-1", "teamtailor_status": "", "fit_score": "3"}
+    )
+
+    assert partial.teamtailor_status is TeamtailorStatus.NOT_SENT
+    assert partial.fit_score == 3
+    assert partial.decision is Decision.HOLD
+    assert partial.model_fields_set == {
+        "evaluation_id",
+        "teamtailor_status",
+        "fit_score",
+    }
+    assert codec.decode_partial({"reasons": ""}).reasons is None
@@ -0,0 +1,47 @@
+"""Tests for ingestion cursors."""
+
+from datetime import datetime, timedelta, timezone
+
+from shared.schemas import Source, SyncState
+from shared.sync_state import FileSyncStateStore, cursor_key, is_after
+
+CREATED_AT = datetime(2024, 5, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def state(cursor_id: str = "9") -> SyncState:
+    return SyncState(
+        job_post_id="job-1",
+        source=Source.GETONBOARD,
+        cursor_created_at=CREATED_AT,
+        cursor_id=cursor_id,
+        updated_at=CREATED_AT,
+    )
+
+
+def test_cursor_key_orders_numeric_ids_as_numbers():
+    assert cursor_key(CREATED_AT, "10") > cursor_key(CREATED_AT, "9")
+    assert cursor_key(CREATED_AT, "abc") > cursor_key(CREATED_AT, "99")
+    assert cursor_key(CREATED_AT, "b") > cursor_key(CREATED_AT, "a")
+    earlier = CREATED_AT - timedelta(seconds=1)
+    assert cursor_key(CREATED_AT, "1") > cursor_key(earlier, "99")
+
+
+def test_is_after():
+    assert is_after(None, CREATED_AT, "1")
+    assert is_after(state("9"), CREATED_AT, "10")
+    assert is_after(state("9"), CREATED_AT + timedelta(seconds=1), "1")
+    assert not is_after(state("9"), CREATED_AT, "9")
+    assert not is_after(state("9"), CREATED_AT, "8")
+    assert not is_after(state("9"), CREATED_AT - timedelta(seconds=1), "100")
+
+
+def test_file_store_round_trip(tmp_path):
+    store = FileSyncStateStore(str(tmp_path / "sync_state.json"))
+
+    assert store.get("job-1") is None
+    store.set(state("9"))
+    store.set(state("12"))
+
+    assert store.get("job-1") == state("12")
+    assert FileSyncStateStore(store.path).get("job-1") == state("12")
+    assert [p.name for p in tmp_path.iterdir()] == ["sync_state.json"]
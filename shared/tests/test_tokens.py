@@ -0,0 +1,28 @@
+"""Tests for token estimation and truncation."""
+
+from shared.llm.tokens import TRUNCATION_MARKER, estimate_tokens, truncate_to_tokens
+
+
+def test_estimate_tokens_rounds_up():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_text_within_budget_is_unchanged():
+    assert truncate_to_tokens("short text", 10) == "short text"
+
+
+def test_truncation_cuts_at_a_word_boundary_and_marks_the_cut():
+    text = "lorem ipsum dolor sit amet " * 10
+
+    truncated = truncate_to_tokens(text, 10)
+
+    assert truncated.endswith(TRUNCATION_MARKER)
+    assert estimate_tokens(truncated) <= 10
+    assert text.startswith(truncated[: -len(TRUNCATION_MARKER)])
+    assert not truncated[: -len(TRUNCATION_MARKER)].endswith(" ")
+
+
+def test_budget_too_small_for_the_marker_drops_the_text():
+    assert truncate_to_tokens("x" * 100, 1) == ""